@@ -0,0 +1,3 @@
+# SPDX-FileCopyrightText: 2023-present LentoLen <len.vnn@gmail.com>
+#
+# SPDX-License-Identifier: MIT
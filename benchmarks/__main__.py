@@ -0,0 +1,119 @@
+"""
+Run the benchmark suite.
+
+    python -m benchmarks                           # print a table
+    python -m benchmarks --json results.json       # also write machine-readable results
+    python -m benchmarks --compare baseline.json   # fail if a case got slower than the baseline
+
+Exits with status 1 if --compare finds a case that is slower than the baseline by more
+than the tolerance.
+"""
+
+import argparse
+import contextlib
+import json
+import platform
+import sys
+
+from benchmarks import suite
+from colortools import palettes
+from colortools.__about__ import __version__
+
+
+def _parser():
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Benchmark colortools.")
+    parser.add_argument("--json", metavar="PATH", help="write the results as JSON, - for stdout")
+    parser.add_argument("--filter", default="", help="only run cases whose name contains this text")
+    parser.add_argument("--samples", type=int, default=suite.SAMPLES, help="argument tuples per case")
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds per measurement")
+    parser.add_argument("--compare", metavar="PATH", help="JSON results of an earlier run to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.1, help="allowed slowdown for --compare, 0.1 = 10%%")
+    return parser
+
+
+def run(name_filter="", samples=suite.SAMPLES, min_time=0.2, report=None) -> dict:
+    """
+    Run the suite.
+
+    Args:
+        name_filter (str): Only run cases whose name contains this text.
+        samples (int): Argument tuples per case.
+        min_time (float): Seconds per measurement.
+        report (function): Called with each result as it is measured.
+
+    Returns:
+        dict: Environment information and a list of results.
+    """
+    results = []
+
+    def add(result):
+        results.append(result)
+        if report is not None:
+            report(result)
+
+    for standard in palettes.STANDARDS:
+        name = f"palette_load[{standard}]"
+        if name_filter in name:
+            seconds = suite.measure_palette_load(standard)
+            add({"name": name, "group": "palette", "calls_per_second": 1 / seconds, "seconds_per_call": seconds})
+
+    for name, group, function, arguments in suite.cases(samples):
+        if name_filter in name:
+            rate = suite.measure(function, arguments, min_time)
+            add({"name": name, "group": group, "calls_per_second": rate, "seconds_per_call": 1 / rate})
+
+    return {
+        "colortools": __version__,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+
+def compare(results, baseline, tolerance) -> list:
+    """
+    Find the cases that got slower than in a baseline run.
+
+    Returns:
+        list: (name, baseline calls per second, current calls per second) tuples.
+    """
+    before = {result["name"]: result["calls_per_second"] for result in baseline["results"]}
+    slower = []
+    for result in results["results"]:
+        rate = before.get(result["name"])
+        if rate is not None and result["calls_per_second"] < rate * (1 - tolerance):
+            slower.append((result["name"], rate, result["calls_per_second"]))
+    return slower
+
+
+def main(argv=None) -> int:
+    args = _parser().parse_args(argv)
+    table = sys.stderr if args.json == "-" else sys.stdout
+
+    def report(result):
+        print(f"{result['name']:<44}{result['calls_per_second']:>16,.0f} calls/s", file=table)
+
+    # keep stdout for the JSON document, whatever the measured functions print
+    with contextlib.redirect_stdout(table):
+        results = run(args.filter, args.samples, args.min_time, report)
+
+    if args.json == "-":
+        json.dump(results, sys.stdout, indent=2)
+        print()
+    elif args.json:
+        with open(args.json, "w") as file:
+            json.dump(results, file, indent=2)
+
+    if args.compare:
+        with open(args.compare) as file:
+            slower = compare(results, json.load(file), args.tolerance)
+        for name, before, after in slower:
+            print(f"slower: {name} {before:,.0f} -> {after:,.0f} calls/s ({after / before - 1:+.0%})", file=sys.stderr)
+        return 1 if slower else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,54 @@
+"""
+Compare the validated converters in colortools.color_utils with colortools.fast.
+
+Run from the repository root with:
+
+    python -m benchmarks.bench_fast
+"""
+
+import random
+import timeit
+
+from colortools import color_utils, fast
+
+NUMBER = 20000
+
+CASES = [
+    ("rgb_to_hex", "rgb"),
+    ("hex_to_rgb", "hex"),
+    ("rgb_to_hsl", "rgb"),
+    ("rgb_to_hsv", "rgb"),
+    ("rgb_to_cmyk", "rgb"),
+    ("rgb_to_xyz", "rgb"),
+    ("rgb_to_lab", "rgb"),
+    ("ciede2000_rgb", "rgb pair"),
+    ("cie76_rgb", "rgb pair"),
+]
+
+
+def _samples(count):
+    rng = random.Random(0)
+    rgbs = [(rng.randrange(256), rng.randrange(256), rng.randrange(256)) for _ in range(count)]
+    return {
+        "rgb": [((rgb,), rgb) for rgb in rgbs],
+        "hex": [((color_utils.rgb_to_hex(rgb),), (color_utils.rgb_to_hex(rgb),)) for rgb in rgbs],
+        "rgb pair": [((rgb, rgbs[i - 1]), rgb + rgbs[i - 1]) for i, rgb in enumerate(rgbs)],
+    }
+
+
+def _calls_per_second(function, arguments):
+    seconds = min(timeit.repeat(lambda: [function(*args) for args in arguments], number=1, repeat=3))
+    return len(arguments) / seconds
+
+
+def main():
+    samples = _samples(NUMBER)
+    print(f"{'function':<16}{'validated/s':>14}{'fast/s':>14}{'speedup':>10}")
+    for name, kind in CASES:
+        validated = _calls_per_second(getattr(color_utils, name), [args for args, _ in samples[kind]])
+        unvalidated = _calls_per_second(getattr(fast, name), [args for _, args in samples[kind]])
+        print(f"{name:<16}{validated:>14,.0f}{unvalidated:>14,.0f}{unvalidated / validated:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
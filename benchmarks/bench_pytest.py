@@ -0,0 +1,30 @@
+"""
+The benchmark suite as pytest-benchmark tests. Skipped if the plugin is not installed.
+
+    pytest benchmarks/bench_pytest.py --benchmark-json results.json
+"""
+
+import pytest
+
+from benchmarks import suite
+from colortools import palettes
+
+pytest.importorskip("pytest_benchmark")
+
+CASES = suite.cases()
+
+
+def _call_all(function, arguments):
+    for args in arguments:
+        function(*args)
+
+
+@pytest.mark.parametrize(("function", "arguments"), [case[2:] for case in CASES], ids=[case[0] for case in CASES])
+def test_case(benchmark, function, arguments):
+    benchmark.extra_info["calls"] = len(arguments)
+    benchmark(_call_all, function, arguments)
+
+
+@pytest.mark.parametrize("standard", palettes.STANDARDS)
+def test_palette_load(benchmark, standard):
+    benchmark.pedantic(palettes.get_palette, (standard,), setup=lambda: palettes.invalidate(standard), rounds=3)
@@ -0,0 +1,117 @@
+"""
+Benchmark cases for every public conversion, the Delta E functions and the colorname lookups.
+
+Each case is a (name, group, function, arguments) tuple. The function is called once per
+argument tuple and the result is reported in calls per second. Run the suite with
+
+    python -m benchmarks
+
+or with pytest-benchmark, see benchmarks/bench_pytest.py.
+"""
+
+import random
+import time
+
+from colortools import color_utils, palettes
+
+SAMPLES = 200
+
+DELTA_E = ("ciede2000", "cie94", "cie76")
+
+
+def _colors(count, seed=0):
+    rng = random.Random(seed)
+    rgbs = [(rng.randrange(256), rng.randrange(256), rng.randrange(256)) for _ in range(count)]
+    return {
+        "rgb": rgbs,
+        "rgba": [color_utils.rgb_to_rgba(rgb) for rgb in rgbs],
+        "hex": [color_utils.rgb_to_hex(rgb) for rgb in rgbs],
+        "hsl": [color_utils.rgb_to_hsl(rgb) for rgb in rgbs],
+        "hsv": [color_utils.rgb_to_hsv(rgb) for rgb in rgbs],
+        "cmyk": [color_utils.rgb_to_cmyk(rgb) for rgb in rgbs],
+        "xyz": [color_utils.rgb_to_xyz(rgb) for rgb in rgbs],
+        "lab": [color_utils.rgb_to_lab(rgb) for rgb in rgbs],
+    }
+
+
+def conversions():
+    """
+    Get the names of the public conversion functions in color_utils, except the colorname lookups.
+    """
+    return [
+        name
+        for name in sorted(dir(color_utils))
+        if "_to_" in name and not name.startswith("_") and "colorname" not in name and not name.endswith("_many")
+    ]
+
+
+def cases(samples=SAMPLES, standards=palettes.STANDARDS):
+    """
+    Build the benchmark cases.
+
+    Args:
+        samples (int): Number of argument tuples per case.
+        standards (iterable): Naming standards to benchmark hex_to_colorname with.
+
+    Returns:
+        list: (name, group, function, arguments) tuples.
+    """
+    colors = _colors(samples)
+    result = []
+
+    for name in conversions():
+        source = name.split("_to_")[0]
+        result.append((name, "conversion", getattr(color_utils, name), [(value,) for value in colors[source]]))
+
+    labs = colors["lab"]
+    rgbs = colors["rgb"]
+    for name in DELTA_E:
+        lab_pairs = [(lab, labs[i - 1]) for i, lab in enumerate(labs)]
+        rgb_pairs = [(rgb, rgbs[i - 1]) for i, rgb in enumerate(rgbs)]
+        result.append((name, "delta_e", getattr(color_utils, name), lab_pairs))
+        result.append((f"{name}_rgb", "delta_e", getattr(color_utils, f"{name}_rgb"), rgb_pairs))
+    within = [(lab, labs[i - 1], 2.3) for i, lab in enumerate(labs)]
+    result.append(("ciede2000_within", "delta_e", color_utils.ciede2000_within, within))
+
+    hexes = colors["hex"]
+    for standard in standards:
+        size = len(palettes.get_palette(standard))
+        arguments = [(hex_code, standard) for hex_code in hexes]
+        result.append((f"hex_to_colorname[{standard}:{size}]", "colorname", color_utils.hex_to_colorname, arguments))
+    return result
+
+
+def measure(function, arguments, min_time=0.2, repeat=3) -> float:
+    """
+    Measure the calls per second of function over arguments.
+
+    The arguments are called in rounds until min_time seconds have passed. The best of repeat runs is reported.
+
+    Returns:
+        float: Calls per second.
+    """
+    best = 0.0
+    for _ in range(repeat):
+        calls = 0
+        elapsed = 0.0
+        while elapsed < min_time:
+            start = time.perf_counter()
+            for args in arguments:
+                function(*args)
+            elapsed += time.perf_counter() - start
+            calls += len(arguments)
+        best = max(best, calls / elapsed)
+    return best
+
+
+def measure_palette_load(standard, repeat=3) -> float:
+    """
+    Measure the seconds it takes to load a naming standard into memory, best of repeat.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        palettes.invalidate(standard)
+        start = time.perf_counter()
+        palettes.get_palette(standard)
+        best = min(best, time.perf_counter() - start)
+    return best
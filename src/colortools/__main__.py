@@ -0,0 +1,8 @@
+# SPDX-FileCopyrightText: 2023-present LentoLen <len.vnn@gmail.com>
+#
+# SPDX-License-Identifier: MIT
+import sys
+
+from colortools.cli import main
+
+sys.exit(main())
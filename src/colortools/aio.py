@@ -0,0 +1,199 @@
+"""
+asyncio variants of the colorname lookups for async services.
+
+The lookups run on a bounded executor instead of the event loop. Concurrent calls with
+the same arguments are coalesced: while a lookup is in flight, further identical calls
+await its result instead of starting another computation. Load the naming standards
+once when the service starts, so no request pays for it:
+
+    from colortools import aio
+
+    async def startup():
+        await aio.async_preload("html", "meodai")
+
+    async def handler(hex_code):
+        return await aio.async_hex_to_colorname(hex_code, "meodai")
+"""
+
+import asyncio
+import operator
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from colortools import color_utils, palettes
+
+DEFAULT_MAX_WORKERS = 4
+
+_executor = None
+_owned = False
+_max_workers = DEFAULT_MAX_WORKERS
+_lock = threading.Lock()
+_inflight: dict = {}
+
+
+def configure(max_workers=None, executor=None):
+    """
+    Set the executor the lookups run on.
+
+    Args:
+        max_workers (int): Size of the default thread pool. Defaults to DEFAULT_MAX_WORKERS.
+        executor: A concurrent.futures thread pool executor to use instead. It is not shut down by colortools.
+            Process pools are not supported: the lookups would load the palettes in every worker process, and
+            async_preload would load them in a worker instead of for all lookups.
+    """
+    global _executor, _owned, _max_workers
+
+    with _lock:
+        old = _executor if _owned else None
+        _executor = executor
+        _owned = False
+        _max_workers = max_workers or DEFAULT_MAX_WORKERS
+    if old is not None:
+        old.shutdown(wait=False)
+
+
+def shutdown(*, wait=True):
+    """
+    Shut down the default thread pool. A new one is started on the next lookup.
+    """
+    global _executor, _owned
+
+    with _lock:
+        old = _executor if _owned else None
+        _executor = None
+        _owned = False
+    if old is not None:
+        old.shutdown(wait=wait)
+
+
+def _get_executor():
+    global _executor, _owned
+
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(_max_workers, thread_name_prefix="colortools")
+            _owned = True
+        return _executor
+
+
+async def _run(function, *args):
+    """
+    Run function(*args) on the executor, sharing the computation with identical calls in flight.
+    """
+    loop = asyncio.get_running_loop()
+    key = (loop, function, args)
+    future = _inflight.get(key)
+    if future is None:
+        future = loop.run_in_executor(_get_executor(), function, *args)
+        _inflight[key] = future
+        future.add_done_callback(lambda _: _inflight.pop(key, None))
+    # a cancelled caller must not cancel the computation the other callers wait for
+    return await asyncio.shield(future)
+
+
+def _rgb_key(rgb):
+    """
+    Turn an entry of rgbs into a hashable tuple, the way color_utils.rgb_to_colorname_many reads it.
+    """
+    if type(rgb) is tuple:
+        return rgb
+    try:
+        return tuple(map(operator.index, rgb))
+    except TypeError:
+        msg = "RGB values should be integers in the range [0, 255]."
+        raise ValueError(msg) from None
+
+
+def in_flight() -> int:
+    """
+    Get the number of distinct lookups currently running.
+    """
+    return len(_inflight)
+
+
+async def async_preload(*naming_standards) -> list:
+    """
+    Load naming standards on the executor, e.g. at service start. See palettes.preload.
+
+    Args:
+        *naming_standards (str): Standards to load. Loads all standards if none are given.
+
+    Returns:
+        list: The loaded palettes.
+    """
+    return await _run(palettes.preload, *naming_standards)
+
+
+async def async_hex_to_colorname(hex_color, naming_standard="html"):
+    """
+    Find the closest matching color name for a hex color, see color_utils.hex_to_colorname.
+
+    Args:
+        hex_color (str): Hex color code.
+        naming_standard (str): html, html-ger, x11, color-meanings.com, meodai.
+
+    Returns:
+        str: Closest matching color name.
+    """
+    return await _run(color_utils.hex_to_colorname, hex_color, naming_standard)
+
+
+async def async_rgb_to_colorname(rgb, naming_standard="html"):
+    """
+    Find the closest matching color name for an rgb color, see color_utils.rgb_to_colorname.
+
+    Args:
+        rgb (tuple): rgb(a) tuple or Color.
+        naming_standard (str): html, html-ger, x11, color-meanings.com, meodai.
+
+    Returns:
+        str: Closest matching color name.
+
+    Raises:
+        ValueError: For the inputs color_utils.rgb_to_colorname rejects.
+    """
+    # validate before building the coalescing key, so the same inputs are accepted as by rgb_to_colorname
+    color_utils._validate_rgb(rgb)
+    return await _run(color_utils.rgb_to_colorname, tuple(rgb), naming_standard)
+
+
+async def async_colorname_to_hex(colorname, naming_standard="html"):
+    """
+    Get the hex code of a colorname, see color_utils.colorname_to_hex.
+
+    Returns:
+        str: matching hex code or None.
+    """
+    return await _run(color_utils.colorname_to_hex, colorname, naming_standard)
+
+
+async def async_colorname_to_rgb(colorname, naming_standard="html"):
+    """
+    Get the rgb tuple of a colorname, see color_utils.colorname_to_rgb.
+
+    Returns:
+        tuple: matching rgb tuple or None.
+    """
+    return await _run(color_utils.colorname_to_rgb, colorname, naming_standard)
+
+
+async def async_hex_to_colorname_many(hex_colors, naming_standard="html") -> list:
+    """
+    Find the closest matching color names for many hex colors in one executor job, see
+    color_utils.hex_to_colorname_many.
+
+    Returns:
+        list: Closest matching color names in input order.
+    """
+    return await _run(color_utils.hex_to_colorname_many, tuple(hex_colors), naming_standard)
+
+
+async def async_rgb_to_colorname_many(rgbs, naming_standard="html") -> list:
+    """
+    Find the closest matching color names for many rgb colors in one executor job, see
+    color_utils.rgb_to_colorname_many.
+
+    Returns:
+        list: Closest matching color names in input order.
+    """
+    return await _run(color_utils.rgb_to_colorname_many, tuple(map(_rgb_key, rgbs)), naming_standard)
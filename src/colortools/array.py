@@ -0,0 +1,543 @@
+"""
+Vectorized color conversions and color differences for NumPy arrays.
+
+The conversion functions mirror the converters in colortools.color_utils but take whole
+arrays of colors, e.g. (N, 3) lists of pixels or (H, W, 3) images, with the color channels
+in the last axis. They apply the same formulas in the same order, so every element matches
+the result of the scalar function.
+
+The Delta E functions compare one color against many (*_to_all) or every color of one set
+against every color of another (*_matrix). They work through the input in chunks, so the
+temporary memory stays bounded no matter how large both sides are.
+
+NumPy is an optional dependency: pip install colortools-lentolen[array]
+"""
+
+try:
+    import numpy as np
+except ImportError:  # no cov
+    msg = "colortools.array requires NumPy, install it with: pip install colortools-lentolen[array]"
+    raise ImportError(msg) from None
+
+from colortools.color_utils import _SRGB_TO_LINEAR
+
+# gamma corrected value of every 8-bit channel value, shared with the scalar functions
+_GAMMA_TABLE = np.array([_SRGB_TO_LINEAR[i] for i in range(256)], dtype=np.float64)
+
+
+def _channels(values, count, name):
+    """
+    Convert the input to an array and check the size of the last axis.
+    """
+    values = np.asarray(values)
+    if values.ndim == 0 or values.shape[-1] not in count:
+        msg = f"{name} array must have {' or '.join(str(c) for c in count)} values in the last axis"
+        raise ValueError(msg)
+    return values
+
+
+def _rgb_channels(rgb):
+    """
+    Validate an RGB(A) array and return it with the alpha channel removed.
+    """
+    rgb = _channels(rgb, (3, 4), "RGB(A)")
+    if rgb.shape[-1] == 4:
+        rgb = rgb[..., :3]
+    if rgb.dtype != np.uint8 and rgb.size and (rgb.min() < 0 or rgb.max() > 255):
+        msg = "RGB values should be in the range [0, 255]."
+        raise ValueError(msg)
+    return rgb
+
+
+def _stack(*channels, dtype=None):
+    result = np.stack(channels, axis=-1)
+    return result if dtype is None else result.astype(dtype)
+
+
+def _round(values):
+    # np.rint rounds half to even like the builtin round
+    return np.rint(values).astype(np.int64)
+
+
+def _pow(values, exponent):
+    """
+    Raise every element to a power using the builtin float pow.
+
+    NumPy's SIMD power may differ from it in the last bit, which would break the
+    identity with the scalar functions, so every distinct value is computed once in Python.
+    """
+    unique, inverse = np.unique(values, return_inverse=True)
+    powered = np.array([value**exponent for value in unique.tolist()], dtype=np.float64)
+    return powered[inverse.reshape(values.shape)]
+
+
+def _linearize(rgb):
+    """
+    Normalize to [0, 1] and apply the sRGB gamma correction.
+    """
+    if rgb.dtype.kind in "ui":
+        return _GAMMA_TABLE[rgb]
+    value = rgb / 255.0
+    linear = value / 12.92
+    curved = value > 0.04045
+    linear[curved] = _pow((value[curved] + 0.055) / 1.055, 2.4)
+    return linear
+
+
+def rgb_to_xyz(rgb) -> np.ndarray:
+    """
+    Convert RGB color values to XYZ color space.
+
+    Args:
+        rgb (array): Array of shape (..., 3) or (..., 4) with values in the range [0, 255].
+
+    Returns:
+        ndarray: Float array of shape (..., 3) containing the XYZ values.
+    """
+    linear = _linearize(_rgb_channels(rgb))
+    r, g, b = linear[..., 0], linear[..., 1], linear[..., 2]
+
+    # Apply transformation matrix to convert RGB to XYZ
+    x = r * 0.4124564 + g * 0.3575761 + b * 0.1804375
+    y = r * 0.2126729 + g * 0.7151522 + b * 0.0721750
+    z = r * 0.0193339 + g * 0.1191920 + b * 0.9503041
+
+    return _stack(x * 100.0, y * 100.0, z * 100.0)
+
+
+def _lab_transformation(value):
+    transformed = (value * 903.3 + 16.0) / 116.0
+    cubic = value > 0.008856
+    transformed[cubic] = _pow(value[cubic], 1.0 / 3.0)
+    return transformed
+
+
+def xyz_to_lab(xyz) -> np.ndarray:
+    """
+    Convert XYZ color values to LAB color space.
+
+    Args:
+        xyz (array): Array of shape (..., 3) containing XYZ values.
+
+    Returns:
+        ndarray: Float array of shape (..., 3) containing the LAB values.
+    """
+    xyz = _channels(xyz, (3,), "XYZ")
+
+    # Reference white point for D65 illuminant
+    xn = _lab_transformation(xyz[..., 0] / 95.047)
+    yn = _lab_transformation(xyz[..., 1] / 100.000)
+    zn = _lab_transformation(xyz[..., 2] / 108.883)
+
+    l = np.maximum(0.0, 116.0 * yn - 16.0)
+    a = (xn - yn) * 500.0
+    b = (yn - zn) * 200.0
+
+    return _stack(l, a, b)
+
+
+def rgb_to_lab(rgb) -> np.ndarray:
+    """
+    Convert RGB color values to LAB color space.
+
+    Args:
+        rgb (array): Array of shape (..., 3) or (..., 4) with values in the range [0, 255].
+
+    Returns:
+        ndarray: Float array of shape (..., 3) containing the LAB values.
+    """
+    rgb = _rgb_channels(rgb)
+    if rgb.dtype.kind not in "ui":
+        return xyz_to_lab(rgb_to_xyz(rgb))
+
+    # images repeat colors a lot, convert every distinct color once
+    keys = (rgb[..., 0].astype(np.int64) << 16) | (rgb[..., 1].astype(np.int64) << 8) | rgb[..., 2]
+    unique, inverse = np.unique(keys, return_inverse=True)
+    colors = np.stack([unique >> 16, (unique >> 8) & 255, unique & 255], axis=-1)
+    return xyz_to_lab(rgb_to_xyz(colors))[inverse.reshape(keys.shape)]
+
+
+def rgb_to_hsl(rgb) -> np.ndarray:
+    """
+    Convert RGB values to HSL values.
+
+    Args:
+        rgb (array): Array of shape (..., 3) or (..., 4) with values in the range [0, 255].
+
+    Returns:
+        ndarray: Integer array of shape (..., 3) containing the HSL values.
+    """
+    rgb = _rgb_channels(rgb)
+    r, g, b = rgb[..., 0] / 255.0, rgb[..., 1] / 255.0, rgb[..., 2] / 255.0
+
+    max_val = np.maximum(np.maximum(r, g), b)
+    min_val = np.minimum(np.minimum(r, g), b)
+    diff = max_val - min_val
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # Calculate Hue, the first matching channel wins like in the scalar version
+        h = np.select(
+            [diff == 0, max_val == r, max_val == g],
+            [0.0, (60 * ((g - b) / diff) + 360) % 360, (60 * ((b - r) / diff) + 120) % 360],
+            (60 * ((r - g) / diff) + 240) % 360,
+        )
+
+        # Calculate Lightness
+        l = ((max_val + min_val) / 2) * 100
+
+        # Calculate Saturation
+        s = np.where(diff == 0, 0.0, (diff / (1 - np.abs(2 * l / 100 - 1))) * 100)
+
+    return _stack(_round(h), _round(s), _round(l))
+
+
+def hsl_to_rgb(hsl) -> np.ndarray:
+    """
+    Convert HSL values to RGB values.
+
+    Args:
+        hsl (array): Array of shape (..., 3) with hue in [0, 360], saturation and lightness in [0, 100].
+
+    Returns:
+        ndarray: uint8 array of shape (..., 3) containing the RGB values.
+
+    Raises:
+        ValueError: If any of the input values are outside the valid range.
+    """
+    hsl = _channels(hsl, (3,), "HSL")
+    h, s, l = hsl[..., 0], hsl[..., 1] / 100.0, hsl[..., 2] / 100.0
+
+    # Validate input values
+    if not np.all((h >= 0) & (h <= 360)):
+        msg = "Hue value must be in the range [0, 360]"
+        raise ValueError(msg)
+    if not np.all((s >= 0) & (s <= 1)):
+        msg = "Saturation value must be in the range [0, 1]"
+        raise ValueError(msg)
+    if not np.all((l >= 0) & (l <= 1)):
+        msg = "Lightness value must be in the range [0, 1]"
+        raise ValueError(msg)
+
+    # Convert hue to the range [0, 1]
+    h = h / 360.0
+
+    # Calculate chroma and intermediate values
+    c = (1 - np.abs(2 * l - 1)) * s
+    x = c * (1 - np.abs((h * 6) % 2 - 1))
+    m = l - c / 2
+    zero = np.zeros_like(c)
+
+    sectors = [h < 1 / 6, h < 2 / 6, h < 3 / 6, h < 4 / 6, h < 5 / 6]
+    r = np.select(sectors, [c, x, zero, zero, x], c)
+    g = np.select(sectors, [x, c, c, x, zero], zero)
+    b = np.select(sectors, [zero, zero, x, c, c], x)
+
+    # Convert RGB values to the range [0, 255], truncating like int()
+    return _stack(np.trunc((r + m) * 255), np.trunc((g + m) * 255), np.trunc((b + m) * 255), dtype=np.uint8)
+
+
+def rgb_to_hsv(rgb) -> np.ndarray:
+    """
+    Convert RGB values to HSV values.
+
+    Args:
+        rgb (array): Array of shape (..., 3) or (..., 4) with values in the range [0, 255].
+
+    Returns:
+        ndarray: Integer array of shape (..., 3) containing the HSV values.
+    """
+    rgb = _rgb_channels(rgb)
+    r, g, b = rgb[..., 0] / 255.0, rgb[..., 1] / 255.0, rgb[..., 2] / 255.0
+
+    max_value = np.maximum(np.maximum(r, g), b)
+    min_value = np.minimum(np.minimum(r, g), b)
+    delta = max_value - min_value
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        hue = np.select(
+            [delta == 0, max_value == r, max_value == g],
+            [0.0, ((g - b) / delta) % 6, ((b - r) / delta) + 2],
+            ((r - g) / delta) + 4,
+        )
+        hue = hue * 60
+        hue = np.where(hue < 0, hue + 360, hue)
+
+        saturation = np.where(max_value == 0, 0.0, (delta / max_value) * 100)
+
+    value = max_value * 100
+
+    return _stack(_round(hue), _round(saturation), _round(value))
+
+
+def hsv_to_rgb(hsv) -> np.ndarray:
+    """
+    Convert HSV values to RGB values.
+
+    Args:
+        hsv (array): Array of shape (..., 3) with hue in [0, 360], saturation and value in [0, 100].
+
+    Returns:
+        ndarray: uint8 array of shape (..., 3) containing the RGB values.
+
+    Raises:
+        ValueError: If any of the input values are outside the valid range.
+    """
+    hsv = _channels(hsv, (3,), "HSV")
+    hue, saturation, value = hsv[..., 0], hsv[..., 1], hsv[..., 2]
+
+    # Validate input values
+    if not np.all((hue >= 0) & (hue <= 360)):
+        msg = "Hue value must be in the range [0, 360]"
+        raise ValueError(msg)
+    if not np.all((saturation >= 0) & (saturation <= 100)):
+        msg = "Saturation value must be in the range [0, 100]"
+        raise ValueError(msg)
+    if not np.all((value >= 0) & (value <= 100)):
+        msg = "Lightness value must be in the range [0, 100]"
+        raise ValueError(msg)
+
+    hue = hue / 360.0
+    saturation = saturation / 100.0
+    value = value / 100.0
+
+    h_i = np.trunc(hue * 6)
+    f = hue * 6 - h_i
+    p = value * (1 - saturation)
+    q = value * (1 - f * saturation)
+    t = value * (1 - (1 - f) * saturation)
+
+    sectors = [saturation == 0.0, h_i == 0, h_i == 1, h_i == 2, h_i == 3, h_i == 4]
+    r = np.select(sectors, [value, value, q, p, p, t], value)
+    g = np.select(sectors, [value, t, value, value, q, p], p)
+    b = np.select(sectors, [value, p, p, t, value, value], q)
+
+    return _stack(np.trunc(r * 255), np.trunc(g * 255), np.trunc(b * 255), dtype=np.uint8)
+
+
+def rgb_to_cmyk(rgb) -> np.ndarray:
+    """
+    Convert RGB values to CMYK values.
+
+    Args:
+        rgb (array): Array of shape (..., 3) or (..., 4) with values in the range [0, 255].
+
+    Returns:
+        ndarray: Integer array of shape (..., 4) containing the CMYK values in the range [0, 100].
+    """
+    rgb = _rgb_channels(rgb)
+    r, g, b = rgb[..., 0] / 255.0, rgb[..., 1] / 255.0, rgb[..., 2] / 255.0
+
+    k = 1 - np.maximum(np.maximum(r, g), b)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        c = np.where((1 - k) != 0, (1 - r - k) / (1 - k), 0.0)
+        m = np.where((1 - k) != 0, (1 - g - k) / (1 - k), 0.0)
+        y = np.where((1 - k) != 0, (1 - b - k) / (1 - k), 0.0)
+
+    return _stack(_round(c * 100), _round(m * 100), _round(y * 100), _round(k * 100))
+
+
+def cmyk_to_rgb(cmyk) -> np.ndarray:
+    """
+    Convert CMYK values to RGB values.
+
+    Args:
+        cmyk (array): Array of shape (..., 4) with values in the range [0, 100].
+
+    Returns:
+        ndarray: uint8 array of shape (..., 3) containing the RGB values.
+    """
+    cmyk = _channels(cmyk, (4,), "CMYK")
+    if not np.all((cmyk >= 0) & (cmyk <= 100)):
+        msg = "CMYK values must be within the range of 0 to 100"
+        raise ValueError(msg)
+
+    c = cmyk[..., 0] / 100.0
+    m = cmyk[..., 1] / 100.0
+    y = cmyk[..., 2] / 100.0
+    k = cmyk[..., 3] / 100.0
+
+    r = np.rint((1 - c) * (1 - k) * 255)
+    g = np.rint((1 - m) * (1 - k) * 255)
+    b = np.rint((1 - y) * (1 - k) * 255)
+
+    return _stack(r, g, b, dtype=np.uint8)
+
+
+# color difference
+
+# number of color pairs compared at once by the Delta E functions
+DEFAULT_CHUNK_SIZE = 1 << 18
+
+
+def _lab_columns(labs):
+    """
+    Split an (N, 3) LAB array into its L, a, b columns plus chroma and hue angle in degrees.
+    """
+    labs = _channels(labs, (3,), "LAB").reshape(-1, 3).astype(np.float64, copy=False)
+    l, a, b = labs[:, 0], labs[:, 1], labs[:, 2]
+    return l, a, b, np.sqrt(a**2 + b**2), np.degrees(np.arctan2(b, a)) % 360
+
+
+def _ciede2000(lab1, lab2):
+    l1, _, _, c1, h1 = lab1
+    l2, _, _, c2, h2 = lab2
+
+    delta_l = l2 - l1
+    c_mean = (c1 + c2) / 2
+    delta_c = c2 - c1
+
+    # Calculate hue difference
+    delta_h = h2 - h1
+    delta_h = np.where(np.abs(h1 - h2) <= 180, delta_h, np.where(h2 <= h1, delta_h + 360, delta_h - 360))
+    delta_h = 2 * np.sqrt(c1 * c2) * np.sin(np.radians(delta_h) / 2)
+
+    # Calculate weighting factors
+    sc = 1 + 0.045 * c_mean
+    cos_h = np.cos(np.radians(delta_h - 30))
+    sh = 1 + 0.015 * c_mean * (1 - 0.17 * cos_h) / (1 - 0.56 * cos_h)
+
+    return np.sqrt(delta_l**2 + (delta_c / sc) ** 2 + (delta_h / sh) ** 2)
+
+
+def _cie76(lab1, lab2):
+    return np.sqrt((lab1[0] - lab2[0]) ** 2 + (lab1[1] - lab2[1]) ** 2 + (lab1[2] - lab2[2]) ** 2)
+
+
+def _cie94(lab1, lab2):
+    l1, a1, b1, c1, _ = lab1
+    l2, a2, b2, c2, _ = lab2
+
+    delta_l = l1 - l2
+    delta_c = c1 - c2
+    delta_h = np.sqrt(np.maximum(0, (a1 - a2) ** 2 + (b1 - b2) ** 2 - delta_c**2))
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        chromatic = c1 * c2 != 0
+        sl = np.where(chromatic, 1 + 0.045 * delta_l / c1, 1)
+        kc = np.where(chromatic, 1 + 0.015 * delta_c / c1, 1)
+        kh = np.where(chromatic, 1 + 0.015 * delta_h / c1, 1)
+        return np.sqrt((delta_l / sl) ** 2 + (delta_c / kc) ** 2 + (delta_h / kh) ** 2)
+
+
+def _to_all(kernel, lab, labs, chunk_size):
+    first = tuple(column[:, None] for column in _lab_columns(lab))
+    others = _lab_columns(labs)
+    result = np.empty(len(others[0]), dtype=np.float64)
+    for start in range(0, len(result), chunk_size):
+        chunk = tuple(column[None, start : start + chunk_size] for column in others)
+        result[start : start + chunk_size] = kernel(first, chunk)[0]
+    return result
+
+
+def _matrix(kernel, labs_a, labs_b, chunk_size, out):
+    rows = _lab_columns(labs_a)
+    columns = _lab_columns(labs_b)
+    shape = (len(rows[0]), len(columns[0]))
+    if out is None:
+        out = np.empty(shape, dtype=np.float64)
+    elif out.shape != shape:
+        msg = f"out must have shape {shape}"
+        raise ValueError(msg)
+
+    # compare a block of rows against all columns, or a block of columns if a single row is already too much
+    row_step = max(1, chunk_size // max(shape[1], 1))
+    column_step = min(shape[1], chunk_size) or 1
+    for row in range(0, shape[0], row_step):
+        block = tuple(column[row : row + row_step, None] for column in rows)
+        for start in range(0, shape[1], column_step):
+            chunk = tuple(column[None, start : start + column_step] for column in columns)
+            out[row : row + row_step, start : start + column_step] = kernel(block, chunk)
+    return out
+
+
+def ciede2000_to_all(lab, labs, chunk_size=DEFAULT_CHUNK_SIZE) -> np.ndarray:
+    """
+    Calculate the CIEDE2000 color difference between one LAB color and many LAB colors.
+
+    Args:
+        lab (array): LAB color (L, a, b).
+        labs (array): Array of shape (N, 3) containing LAB colors.
+        chunk_size (int): Number of color pairs compared at once.
+
+    Returns:
+        ndarray: Float array of shape (N,) containing the color differences.
+    """
+    return _to_all(_ciede2000, lab, labs, chunk_size)
+
+
+def ciede2000_matrix(labs_a, labs_b, chunk_size=DEFAULT_CHUNK_SIZE, out=None) -> np.ndarray:
+    """
+    Calculate the CIEDE2000 color difference between every pair of two sets of LAB colors.
+
+    Args:
+        labs_a (array): Array of shape (N, 3) containing LAB colors.
+        labs_b (array): Array of shape (M, 3) containing LAB colors.
+        chunk_size (int): Number of color pairs compared at once.
+        out (ndarray): Optional (N, M) float array to write into, e.g. a np.memmap for very large matrices.
+
+    Returns:
+        ndarray: Float array of shape (N, M), element [i, j] is the difference between labs_a[i] and labs_b[j].
+    """
+    return _matrix(_ciede2000, labs_a, labs_b, chunk_size, out)
+
+
+def cie76_to_all(lab, labs, chunk_size=DEFAULT_CHUNK_SIZE) -> np.ndarray:
+    """
+    Calculate the CIE76 color difference between one LAB color and many LAB colors.
+
+    Args:
+        lab (array): LAB color (L, a, b).
+        labs (array): Array of shape (N, 3) containing LAB colors.
+        chunk_size (int): Number of color pairs compared at once.
+
+    Returns:
+        ndarray: Float array of shape (N,) containing the color differences.
+    """
+    return _to_all(_cie76, lab, labs, chunk_size)
+
+
+def cie76_matrix(labs_a, labs_b, chunk_size=DEFAULT_CHUNK_SIZE, out=None) -> np.ndarray:
+    """
+    Calculate the CIE76 color difference between every pair of two sets of LAB colors.
+
+    Args:
+        labs_a (array): Array of shape (N, 3) containing LAB colors.
+        labs_b (array): Array of shape (M, 3) containing LAB colors.
+        chunk_size (int): Number of color pairs compared at once.
+        out (ndarray): Optional (N, M) float array to write into, e.g. a np.memmap for very large matrices.
+
+    Returns:
+        ndarray: Float array of shape (N, M), element [i, j] is the difference between labs_a[i] and labs_b[j].
+    """
+    return _matrix(_cie76, labs_a, labs_b, chunk_size, out)
+
+
+def cie94_to_all(lab, labs, chunk_size=DEFAULT_CHUNK_SIZE) -> np.ndarray:
+    """
+    Calculate the CIE94 color difference between one LAB color and many LAB colors.
+
+    Args:
+        lab (array): LAB color (L, a, b), used as the reference color.
+        labs (array): Array of shape (N, 3) containing LAB colors.
+        chunk_size (int): Number of color pairs compared at once.
+
+    Returns:
+        ndarray: Float array of shape (N,) containing the color differences.
+    """
+    return _to_all(_cie94, lab, labs, chunk_size)
+
+
+def cie94_matrix(labs_a, labs_b, chunk_size=DEFAULT_CHUNK_SIZE, out=None) -> np.ndarray:
+    """
+    Calculate the CIE94 color difference between every pair of two sets of LAB colors.
+
+    Args:
+        labs_a (array): Array of shape (N, 3) containing LAB colors, used as the reference colors.
+        labs_b (array): Array of shape (M, 3) containing LAB colors.
+        chunk_size (int): Number of color pairs compared at once.
+        out (ndarray): Optional (N, M) float array to write into, e.g. a np.memmap for very large matrices.
+
+    Returns:
+        ndarray: Float array of shape (N, M), element [i, j] is the difference between labs_a[i] and labs_b[j].
+    """
+    return _matrix(_cie94, labs_a, labs_b, chunk_size, out)
@@ -0,0 +1,266 @@
+"""
+Bulk conversions over raw pixel buffers, without NumPy.
+
+The functions read interleaved rgb pixels from any object supporting the buffer
+protocol (bytes, bytearray, memoryview, array.array, mmap, ...) without building
+lists of tuples first. stride is the number of bytes from one pixel to the next, 3 for rgb
+and 4 for rgba or other padded layouts; the first three bytes of each pixel are used.
+
+Results are written flat, a fixed number of values per pixel, into out: any writable
+buffer with a native single character format such as array.array("d") or a memoryview
+of a bytearray cast to "d". If out is None a new array.array is returned. Pixels are
+processed in chunks and every distinct color is converted once per chunk, so memory
+stays bounded and flat image areas cost one conversion.
+
+The values are the same as the ones of the functions in colortools.color_utils.
+
+hexes_to_rgb and rgbs_to_hex convert between hex codes and packed rgb pixels. They
+validate and convert a whole chunk of codes with a few calls of bytes.fromhex,
+bytes.hex and precompiled regular expressions instead of a Python loop per character.
+"""
+
+import re
+from array import array
+
+from colortools import fast
+
+CHUNK_SIZE = 1 << 16
+
+# a chunk of codes in the common "#rrggbb" form, concatenated
+_HASHED_CODES = re.compile(r"(?:#[0-9A-Fa-f]{6})*")
+# any code accepted by color_utils.hex_to_rgb, the rgb digits in the groups
+_CODE = re.compile(r"#?(?:([0-9A-Fa-f]{3})[0-9A-Fa-f]?|([0-9A-Fa-f]{6})(?:[0-9A-Fa-f]{2})?)")
+_HEX_PAIRS = re.compile(r".{6}", re.DOTALL)
+
+
+def pixel_count(pixels, stride=3) -> int:
+    """
+    Get the number of pixels in a buffer.
+
+    Args:
+        pixels: Interleaved pixel data supporting the buffer protocol.
+        stride (int): Bytes from one pixel to the next, at least 3.
+
+    Returns:
+        int: Number of complete pixels.
+    """
+    if stride < 3:
+        msg = "stride must be at least 3"
+        raise ValueError(msg)
+    with memoryview(pixels) as view:
+        size = view.nbytes
+    return 0 if size < 3 else (size - 3) // stride + 1
+
+
+class _Packed(dict):
+    """
+    Packed kernel results by rgb tuple, computed on first access.
+    """
+
+    def __init__(self, kernel, typecode):
+        super().__init__()
+        self._kernel = kernel
+        self._typecode = typecode
+
+    def __missing__(self, rgb):
+        packed = self[rgb] = array(self._typecode, self._kernel(*rgb)).tobytes()
+        return packed
+
+
+def _target(out, size):
+    """
+    Get a flat, writable byte view of out that holds at least size values, and its format.
+    """
+    with memoryview(out) as view:
+        if view.readonly:
+            msg = "out must be a writable buffer"
+            raise ValueError(msg)
+        typecode = view.format
+        target = view.cast("B")
+    if len(target) < size * array(typecode).itemsize:
+        target.release()
+        msg = f"out must hold at least {size} values"
+        raise ValueError(msg)
+    return target, typecode
+
+
+def _convert(kernel, width, pixels, out, stride, typecode):
+    count = pixel_count(pixels, stride)
+    if out is None:
+        out = array(typecode, bytes(array(typecode).itemsize * count * width))
+
+    target, typecode = _target(out, count * width)
+    size = array(typecode).itemsize * width
+    with memoryview(pixels) as source, source.cast("B") as view, target:
+        for start in range(0, count, CHUNK_SIZE):
+            stop = min(count, start + CHUNK_SIZE)
+            first = start * stride
+            last = stop * stride
+            colors = zip(view[first:last:stride], view[first + 1 : last : stride], view[first + 2 : last : stride])
+            target[start * size : stop * size] = b"".join(map(_Packed(kernel, typecode).__getitem__, colors))
+    return out
+
+
+def rgb_to_hsl(pixels, out=None, stride=3):
+    """
+    Convert the rgb pixels of a buffer to hsl values.
+
+    Args:
+        pixels: Interleaved pixel data supporting the buffer protocol.
+        out: Writable buffer for 3 values per pixel. Defaults to a new array.array("H").
+        stride (int): Bytes from one pixel to the next, 3 for rgb and 4 for rgba.
+
+    Returns:
+        out, holding h, s, l for every pixel.
+
+    Raises:
+        ValueError: If stride is below 3 or out is read-only or too small.
+    """
+    return _convert(fast.rgb_to_hsl, 3, pixels, out, stride, "H")
+
+
+def rgb_to_hsv(pixels, out=None, stride=3):
+    """
+    Convert the rgb pixels of a buffer to hsv values.
+
+    Args:
+        pixels: Interleaved pixel data supporting the buffer protocol.
+        out: Writable buffer for 3 values per pixel. Defaults to a new array.array("H").
+        stride (int): Bytes from one pixel to the next, 3 for rgb and 4 for rgba.
+
+    Returns:
+        out, holding h, s, v for every pixel.
+
+    Raises:
+        ValueError: If stride is below 3 or out is read-only or too small.
+    """
+    return _convert(fast.rgb_to_hsv, 3, pixels, out, stride, "H")
+
+
+def rgb_to_cmyk(pixels, out=None, stride=3):
+    """
+    Convert the rgb pixels of a buffer to cmyk values.
+
+    Args:
+        pixels: Interleaved pixel data supporting the buffer protocol.
+        out: Writable buffer for 4 values per pixel. Defaults to a new array.array("B").
+        stride (int): Bytes from one pixel to the next, 3 for rgb and 4 for rgba.
+
+    Returns:
+        out, holding c, m, y, k for every pixel.
+
+    Raises:
+        ValueError: If stride is below 3 or out is read-only or too small.
+    """
+    return _convert(fast.rgb_to_cmyk, 4, pixels, out, stride, "B")
+
+
+def rgb_to_xyz(pixels, out=None, stride=3):
+    """
+    Convert the rgb pixels of a buffer to xyz values.
+
+    Args:
+        pixels: Interleaved pixel data supporting the buffer protocol.
+        out: Writable buffer for 3 values per pixel. Defaults to a new array.array("d"). Use a "f" buffer to halve the
+            memory at float32 precision.
+        stride (int): Bytes from one pixel to the next, 3 for rgb and 4 for rgba.
+
+    Returns:
+        out, holding x, y, z for every pixel.
+
+    Raises:
+        ValueError: If stride is below 3 or out is read-only or too small.
+    """
+    return _convert(fast.rgb_to_xyz, 3, pixels, out, stride, "d")
+
+
+def rgb_to_lab(pixels, out=None, stride=3):
+    """
+    Convert the rgb pixels of a buffer to lab values.
+
+    Args:
+        pixels: Interleaved pixel data supporting the buffer protocol.
+        out: Writable buffer for 3 values per pixel. Defaults to a new array.array("d"). Use a "f" buffer to halve the
+            memory at float32 precision.
+        stride (int): Bytes from one pixel to the next, 3 for rgb and 4 for rgba.
+
+    Returns:
+        out, holding l, a, b for every pixel.
+
+    Raises:
+        ValueError: If stride is below 3 or out is read-only or too small.
+    """
+    return _convert(fast.rgb_to_lab, 3, pixels, out, stride, "d")
+
+
+def _rgb_digits(hex_code):
+    """
+    Get the six rgb digits of a hex code, with the validation of color_utils.hex_to_rgb.
+    """
+    match = _CODE.fullmatch(hex_code)
+    if match is None:
+        msg = "Input is not a valid hexadecimal RGB(A) code"
+        raise ValueError(msg)
+    short, digits = match.groups()
+    return digits if short is None else short[0] * 2 + short[1] * 2 + short[2] * 2
+
+
+def hexes_to_rgb(hex_codes) -> bytearray:
+    """
+    Convert many hex color codes to packed rgb pixels.
+
+    Codes are accepted exactly like color_utils.hex_to_rgb accepts them: 3, 4, 6 or 8 hex digits with an optional
+    leading "#". The alpha digits are validated and dropped.
+
+    Args:
+        hex_codes (iterable): Hex color codes.
+
+    Returns:
+        bytearray: r, g, b for every code, usable as pixels for the other functions of this module.
+
+    Raises:
+        ValueError: If a hex code is invalid.
+    """
+    codes = hex_codes if isinstance(hex_codes, (list, tuple)) else list(hex_codes)
+    out = bytearray()
+    for start in range(0, len(codes), CHUNK_SIZE):
+        chunk = codes[start : start + CHUNK_SIZE]
+        joined = "".join(chunk)
+        if len(joined) == 7 * len(chunk) and set(map(len, chunk)) == {7} and _HASHED_CODES.fullmatch(joined):
+            out += bytes.fromhex(joined.replace("#", ""))
+        else:
+            out += bytes.fromhex("".join(map(_rgb_digits, chunk)))
+    return out
+
+
+def rgbs_to_hex(pixels, stride=3) -> list:
+    """
+    Convert the rgb pixels of a buffer to hex color codes, the same as color_utils.rgb_to_hex returns.
+
+    Args:
+        pixels: Interleaved pixel data supporting the buffer protocol.
+        stride (int): Bytes from one pixel to the next, 3 for rgb and 4 for rgba.
+
+    Returns:
+        list: A "#rrggbb" code for every pixel.
+
+    Raises:
+        ValueError: If stride is below 3.
+    """
+    count = pixel_count(pixels, stride)
+    result: list = []
+    with memoryview(pixels) as source, source.cast("B") as view:
+        for start in range(0, count, CHUNK_SIZE):
+            stop = min(count, start + CHUNK_SIZE)
+            if stride == 3:
+                digits = view[3 * start : 3 * stop].hex()
+            else:
+                packed = bytearray(3 * (stop - start))
+                first = start * stride
+                last = stop * stride
+                packed[0::3] = view[first:last:stride]
+                packed[1::3] = view[first + 1 : last : stride]
+                packed[2::3] = view[first + 2 : last : stride]
+                digits = packed.hex()
+            result += map("#".__add__, _HEX_PAIRS.findall(digits))
+    return result
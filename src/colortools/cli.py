@@ -0,0 +1,74 @@
+"""
+Command line interface, installed as the colortools command.
+"""
+
+import argparse
+import sys
+
+from colortools import stream
+from colortools.palettes import STANDARDS
+
+
+def _convert(args):
+    report = None if args.quiet else stream.Throughput(interval=args.interval)
+    count = stream.convert_file(
+        args.input,
+        args.output,
+        args.conversion,
+        src_format=args.input_format,
+        dst_format=args.output_format,
+        column=args.column,
+        output_column=args.output_column,
+        naming_standard=args.naming_standard,
+        chunk_size=args.chunk_size,
+        errors=args.errors,
+        report=report,
+    )
+    if report is not None:
+        report.finish()
+    return count
+
+
+def _parser():
+    parser = argparse.ArgumentParser(prog="colortools", description="Color conversions for large datasets.")
+    commands = parser.add_subparsers(dest="command")
+    commands.required = True
+
+    convert = commands.add_parser(
+        "convert",
+        help="convert a column of a CSV or JSON lines file",
+        description="Convert a column of a CSV or JSON lines file, streaming it in constant memory.",
+    )
+    convert.add_argument("conversion", choices=stream.CONVERSIONS, metavar="conversion", help="e.g. hex_to_colorname")
+    convert.add_argument("input", nargs="?", default="-", help="input file, - for stdin (default)")
+    convert.add_argument("output", nargs="?", default="-", help="output file, - for stdout (default)")
+    convert.add_argument("--input-format", choices=stream.FORMATS, help="default: from the input file suffix")
+    convert.add_argument("--output-format", choices=stream.FORMATS, help="default: from the output file suffix")
+    convert.add_argument("--column", help="input column, default: the source model, e.g. hex")
+    convert.add_argument("--output-column", help="output column, default: the target model, e.g. colorname")
+    convert.add_argument("--naming-standard", default="html", choices=STANDARDS)
+    convert.add_argument("--chunk-size", type=int, default=10000)
+    convert.add_argument("--errors", choices=stream.ERRORS, default="raise", help="handling of invalid colors")
+    convert.add_argument("--interval", type=float, default=1.0, help="seconds between throughput reports")
+    convert.add_argument("--quiet", action="store_true", help="do not report throughput on stderr")
+    convert.set_defaults(run=_convert)
+    return parser
+
+
+def main(argv=None) -> int:
+    """
+    Run the command line interface.
+
+    Args:
+        argv (list): Arguments without the program name. Defaults to sys.argv[1:].
+
+    Returns:
+        int: Exit status.
+    """
+    args = _parser().parse_args(argv)
+    try:
+        args.run(args)
+    except ValueError as error:
+        print(f"colortools: error: {error}", file=sys.stderr)  # noqa: T201
+        return 1
+    return 0
@@ -0,0 +1,163 @@
+"""
+Streaming near-duplicate clustering of colors by CIEDE2000.
+
+Clusterer assigns every color to the oldest cluster representative within a Delta E
+threshold, or makes it the representative of a new cluster (leader clustering). The
+representatives are kept in a LAB grid (see colortools.nearest.LabGrid), so a color
+is only compared with the representatives in the cells around it, and those are
+mostly decided by the bounds of ciede2000_within before the full formula runs.
+
+Only the representatives are kept in memory, never the clustered colors, so inputs of
+any length can be streamed. Their number is bounded by the threshold: the sRGB gamut
+holds only so many colors that are pairwise further apart than it.
+
+    from colortools.cluster import Clusterer, deduplicate
+
+    unique = list(deduplicate(hex_codes, threshold=2.3))
+
+    clusterer = Clusterer(threshold=2.3)
+    for cluster_id, is_new in clusterer.cluster(rgbs):
+        ...
+    clusterer.representatives[cluster_id]
+
+The result depends on the input order, like any leader clustering: the first color
+of a cluster is its representative. Since representatives are never replaced, a color
+always joins the same cluster, so recently seen colors are answered from a cache.
+"""
+
+import math
+
+from colortools.color_utils import _ciede2000_within, _validate_rgb, hex_to_rgb, rgb_to_lab
+from colortools.nearest import LabGrid, _bound_limit
+
+
+class Clusterer:
+    """
+    Incremental clustering of colors within a CIEDE2000 threshold.
+
+    Attributes:
+        representatives (list): The first color of every cluster, by cluster id, as given to add.
+        labs (list): LAB tuples of the representatives.
+        sizes (list): Number of colors assigned to every cluster.
+
+    Args:
+        threshold (float): Colors with a difference of at most this value to a representative join its cluster.
+        cell_size (float): Edge length of the grid cells. Defaults to three times the threshold.
+        cache_size (int): Number of recently seen colors whose cluster is remembered, 0 to disable.
+    """
+
+    def __init__(self, threshold=2.3, cell_size=None, cache_size=65536):
+        if threshold < 0:
+            msg = "threshold must not be negative"
+            raise ValueError(msg)
+        self.threshold = threshold
+        self.representatives = []
+        self.labs = []
+        self.sizes = []
+        self._grid = LabGrid(self.labs, cell_size or max(3.0 * threshold, 1.0))
+        self._cache = {}
+        self._cache_size = cache_size
+
+    def __len__(self):
+        return len(self.representatives)
+
+    def _candidates(self, lab, c1):
+        """
+        Get the representatives that can be within the threshold of lab, see LabGrid.nearest for the box.
+        """
+        limit = _bound_limit(self.threshold)
+        if 0.0225 * limit >= 1:
+            return range(len(self.labs))
+        return self._grid._box(lab, limit, limit * (1 + 0.045 * c1) / (1 - 0.0225 * limit))
+
+    def find(self, lab):
+        """
+        Find the oldest representative within the threshold of a LAB tuple.
+
+        The difference is measured as ciede2000(lab, representative lab).
+
+        Returns:
+            int: The cluster id, or None if no representative is close enough.
+        """
+        labs = self.labs
+        threshold = self.threshold
+        c1 = math.sqrt(lab[1] ** 2 + lab[2] ** 2)
+        best = None
+        for i in self._candidates(lab, c1):
+            if (best is None or i < best) and _ciede2000_within(lab, c1, labs[i], threshold):
+                best = i
+        return best
+
+    def add(self, color) -> tuple:
+        """
+        Assign a color to a cluster.
+
+        Args:
+            color: rgb(a) tuple, Color or hex code.
+
+        Returns:
+            tuple: (cluster id, whether the color started a new cluster).
+
+        Raises:
+            ValueError: If the color is invalid.
+        """
+        try:
+            cluster_id = self._cache.get(color)
+        except TypeError:
+            # unhashable, rejected by the validation below
+            cluster_id = None
+        if cluster_id is not None:
+            self.sizes[cluster_id] += 1
+            return cluster_id, False
+
+        if isinstance(color, str):
+            lab = rgb_to_lab(hex_to_rgb(color))
+        else:
+            _validate_rgb(color)
+            lab = rgb_to_lab(color)
+        cluster_id = self.find(lab)
+        is_new = cluster_id is None
+        if is_new:
+            cluster_id = len(self.labs)
+            self.representatives.append(color)
+            self.labs.append(lab)
+            self.sizes.append(0)
+            self._grid.add(cluster_id)
+        self.sizes[cluster_id] += 1
+
+        if self._cache_size:
+            if len(self._cache) >= self._cache_size:
+                self._cache.clear()
+            self._cache[color] = cluster_id
+        return cluster_id, is_new
+
+    def cluster(self, colors):
+        """
+        Assign many colors to clusters.
+
+        Args:
+            colors (iterable): rgb(a) tuples, Colors or hex codes.
+
+        Yields:
+            tuple: (cluster id, whether the color started a new cluster) for every color, in input order.
+        """
+        add = self.add
+        for color in colors:
+            yield add(color)
+
+
+def deduplicate(colors, threshold=2.3):
+    """
+    Drop colors that are within a CIEDE2000 threshold of an earlier color that was kept.
+
+    Args:
+        colors (iterable): rgb(a) tuples, Colors or hex codes.
+        threshold (float): The largest difference that counts as a duplicate.
+
+    Yields:
+        The colors that were kept, in input order.
+    """
+    add = Clusterer(threshold).add
+    for color in colors:
+        if add(color)[1]:
+            yield color
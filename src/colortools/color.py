@@ -0,0 +1,292 @@
+"""
+Color value types that keep their derived forms.
+
+The functions in colortools.color_utils take and return plain tuples, so code that
+compares the same colors again and again converts them to lab every time. A Color
+holds an 8-bit rgb color and computes its xyz, lab and hsl forms on first use only:
+
+    from colortools.color import Color
+
+    red = Color.from_hex("#ff0000")
+    red.lab                            # computed once, cached afterwards
+    red.delta_e(other)                 # uses the cached lab values of both colors
+
+Color can be passed wherever color_utils expects an rgb tuple. rgb_to_xyz, rgb_to_lab
+and the Delta E functions of color_utils take Colors too and use their cached values.
+
+ColorArray stores many colors column by column: one array.array("B") per rgb channel,
+plus one array.array("f") per lab channel once lab values are needed. That is 3 bytes
+per color, 15 with lab values, instead of a tuple and three int objects per color.
+The float32 lab columns differ from the exact conversion by about 1e-6. The scalar
+color_utils functions do not take a ColorArray; convert it as a whole with the
+functions of colortools.buffers on colors.pixels(), and compare it with delta_e,
+which uses colortools.array when NumPy is installed.
+"""
+
+from array import array
+from itertools import repeat
+
+
+def _metric(metric):
+    """
+    Get the color_utils Delta E function of a metric name.
+    """
+    if metric not in ("ciede2000", "cie76", "cie94"):
+        msg = "metric must be one of ciede2000, cie76, cie94"
+        raise ValueError(msg)
+    return getattr(color_utils, metric)
+
+
+class Color:
+    """
+    An 8-bit rgb color with cached xyz, lab and hsl values.
+
+    Iterating or indexing a Color gives its r, g and b values, like an rgb tuple.
+
+    Args:
+        r (int): Red value in the range [0, 255].
+        g (int): Green value in the range [0, 255].
+        b (int): Blue value in the range [0, 255].
+
+    Raises:
+        ValueError: If a value is not an integer in the range [0, 255].
+    """
+
+    __slots__ = ("r", "g", "b", "_xyz", "_lab", "_hsl")
+
+    def __init__(self, r, g, b):
+        color_utils._validate_rgb((r, g, b))
+        self.r = r
+        self.g = g
+        self.b = b
+        self._xyz = None
+        self._lab = None
+        self._hsl = None
+
+    @classmethod
+    def from_rgb(cls, rgb) -> "Color":
+        """
+        Create a color from an rgb(a) tuple. The alpha value is dropped.
+        """
+        color_utils._validate_rgb(rgb)
+        return cls(rgb[0], rgb[1], rgb[2])
+
+    @classmethod
+    def from_hex(cls, hex_code) -> "Color":
+        """
+        Create a color from a hex code, see color_utils.hex_to_rgb.
+        """
+        return cls(*color_utils.hex_to_rgb(hex_code))
+
+    @property
+    def rgb(self) -> tuple:
+        return (self.r, self.g, self.b)
+
+    @property
+    def hex(self) -> str:
+        return color_utils.rgb_to_hex((self.r, self.g, self.b))
+
+    @property
+    def xyz(self) -> tuple:
+        if self._xyz is None:
+            self._xyz = color_utils.rgb_to_xyz((self.r, self.g, self.b))
+        return self._xyz
+
+    @property
+    def lab(self) -> tuple:
+        if self._lab is None:
+            self._lab = color_utils.xyz_to_lab(self.xyz)
+        return self._lab
+
+    @property
+    def hsl(self) -> tuple:
+        if self._hsl is None:
+            self._hsl = color_utils.rgb_to_hsl((self.r, self.g, self.b))
+        return self._hsl
+
+    def delta_e(self, other, metric="ciede2000") -> float:
+        """
+        Calculate the color difference to another color.
+
+        Args:
+            other (Color or tuple): Color or lab tuple to compare with.
+            metric (str): ciede2000, cie76 or cie94.
+
+        Returns:
+            float: The difference, the same as color_utils.ciede2000(self.lab, other.lab) for ciede2000.
+
+        Raises:
+            ValueError: If the metric is not supported.
+        """
+        return _metric(metric)(self.lab, other.lab if type(other) is Color else other)
+
+    def __iter__(self):
+        yield self.r
+        yield self.g
+        yield self.b
+
+    def __len__(self):
+        return 3
+
+    def __getitem__(self, index):
+        return (self.r, self.g, self.b)[index]
+
+    def __eq__(self, other):
+        if type(other) is not Color:
+            return NotImplemented
+        return (self.r, self.g, self.b) == (other.r, other.g, other.b)
+
+    def __hash__(self):
+        return hash((self.r, self.g, self.b))
+
+    def __repr__(self):
+        return f"Color({self.r}, {self.g}, {self.b})"
+
+
+class ColorArray:
+    """
+    A compact sequence of 8-bit rgb colors, stored as one array per channel.
+
+    Args:
+        colors (iterable): rgb(a) tuples or Colors.
+
+    Raises:
+        ValueError: If a color is invalid.
+    """
+
+    def __init__(self, colors=()):
+        self.red = array("B")
+        self.green = array("B")
+        self.blue = array("B")
+        self._lab = None
+        self.extend(colors)
+
+    @classmethod
+    def from_pixels(cls, pixels, stride=3) -> "ColorArray":
+        """
+        Create an array from interleaved pixel data, see colortools.buffers.
+        """
+        count = buffers.pixel_count(pixels, stride)
+        colors = cls()
+        with memoryview(pixels) as source, source.cast("B") as view:
+            last = count * stride
+            colors.red.frombytes(view[0:last:stride].tobytes())
+            colors.green.frombytes(view[1:last:stride].tobytes())
+            colors.blue.frombytes(view[2:last:stride].tobytes())
+        return colors
+
+    @classmethod
+    def from_hexes(cls, hex_codes) -> "ColorArray":
+        """
+        Create an array from hex codes, with the validation of color_utils.hex_to_rgb.
+        """
+        return cls.from_pixels(buffers.hexes_to_rgb(hex_codes))
+
+    def append(self, color):
+        """
+        Add an rgb(a) tuple or Color.
+        """
+        if type(color) is not Color:
+            color_utils._validate_rgb(color)
+        self.red.append(color[0])
+        self.green.append(color[1])
+        self.blue.append(color[2])
+        self._lab = None
+
+    def extend(self, colors):
+        """
+        Add rgb(a) tuples or Colors.
+        """
+        for color in colors:
+            self.append(color)
+
+    def pixels(self) -> bytearray:
+        """
+        Get the colors as interleaved rgb pixels.
+        """
+        pixels = bytearray(3 * len(self.red))
+        pixels[0::3] = self.red
+        pixels[1::3] = self.green
+        pixels[2::3] = self.blue
+        return pixels
+
+    def hexes(self) -> list:
+        """
+        Get the hex codes of all colors.
+        """
+        return buffers.rgbs_to_hex(self.pixels())
+
+    def lab_columns(self) -> tuple:
+        """
+        Get the lab values of all colors, computed on first use.
+
+        Returns:
+            tuple: (L, a, b) array.array("f") columns.
+        """
+        if self._lab is None:
+            labs = buffers.rgb_to_lab(self.pixels(), array("f", bytes(12 * len(self.red))))
+            self._lab = (labs[0::3], labs[1::3], labs[2::3])
+        return self._lab
+
+    def delta_e(self, color, metric="ciede2000") -> array:
+        """
+        Calculate the color difference between a color and every color of the array.
+
+        With NumPy installed all colors are compared at once by colortools.array, otherwise one by one.
+
+        Args:
+            color (Color or tuple): Color or lab tuple to compare with.
+            metric (str): ciede2000, cie76 or cie94.
+
+        Returns:
+            array.array: Delta E of every color as array.array("d"), the same as the color_utils function applied to
+                color and each color's lab values, up to floating point rounding.
+
+        Raises:
+            ValueError: If the metric is not supported.
+        """
+        function = _metric(metric)
+        lab = color.lab if type(color) is Color else color
+        columns = self.lab_columns()
+        result = array("d")
+        try:
+            import numpy as np
+
+            from colortools import array as vectorized
+        except ImportError:
+            result.extend(map(function, repeat(lab, len(self)), zip(*columns)))
+            return result
+
+        labs = np.column_stack([np.frombuffer(column, dtype=np.float32) for column in columns])
+        result.frombytes(getattr(vectorized, f"{metric}_to_all")(lab, labs).tobytes())
+        return result
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Bytes used by the color values, including computed lab columns.
+        """
+        size = 3 * len(self.red)
+        return size if self._lab is None else size + 12 * len(self.red)
+
+    def __len__(self):
+        return len(self.red)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            colors = ColorArray()
+            colors.red = self.red[index]
+            colors.green = self.green[index]
+            colors.blue = self.blue[index]
+            return colors
+        return Color(self.red[index], self.green[index], self.blue[index])
+
+    def __iter__(self):
+        return map(Color, self.red, self.green, self.blue)
+
+    def __repr__(self):
+        return f"ColorArray({len(self)} colors)"
+
+
+# imported last: color_utils accepts Color and imports this module at its end
+from colortools import buffers, color_utils  # noqa: E402
@@ -1,6 +1,6 @@
-import csv
 import math
-from importlib.resources import files
+import operator
+from bisect import bisect
 
 # hex operations
 
@@ -41,8 +41,8 @@ def _validate_rgb(rgb):
     """
     validate the rgb(a) values
     """ 
-    # Check if the input is a tuple of length 3 or 4
-    if not isinstance(rgb, tuple) or (len(rgb) != 3 and len(rgb) != 4):
+    # Check if the input is a tuple of length 3 or 4 (or a Color)
+    if not isinstance(rgb, (tuple, Color)) or (len(rgb) != 3 and len(rgb) != 4):
         raise ValueError("Input should be a tuple of three or four integers representing RGB(A) values.")
     
     # Check if each RGB value is within the valid range [0, 255]
@@ -655,7 +655,6 @@ def hsv_to_rgb(hsv: tuple) -> tuple:
     - tuple: A tuple containing the RGB values as integers in the format (R, G, B).
     """
     hue, saturation, value = hsv
-    print(saturation)
     # Validate input values
     if not 0 <= hue <= 360:
         raise ValueError("Hue value must be in the range [0, 360]")
@@ -702,20 +701,22 @@ def rgb_to_xyz(rgb: tuple) -> tuple:
     Convert RGB color values to XYZ color space.
 
     Args:
-        rgb (tuple): RGB color values as a tuple (R, G, B) where each value is in the range [0, 255].
+        rgb (tuple): RGB color values as a tuple (R, G, B) where each value is in the range [0, 255], or a Color.
 
     Returns:
         tuple: XYZ color values as a tuple (X, Y, Z) where each value is a decimal number.
     """
-    # Normalize RGB values to the range [0, 1]
-    r = rgb[0] / 255.0
-    g = rgb[1] / 255.0
-    b = rgb[2] / 255.0
-
-    # Apply gamma correction to linearize RGB values
-    r = _apply_gamma_correction(r)
-    g = _apply_gamma_correction(g)
-    b = _apply_gamma_correction(b)
+    if type(rgb) is Color:
+        return rgb.xyz
+    # Look up the linearized 8-bit values, fall back to the gamma correction for anything else
+    try:
+        r = _SRGB_TO_LINEAR[rgb[0]]
+        g = _SRGB_TO_LINEAR[rgb[1]]
+        b = _SRGB_TO_LINEAR[rgb[2]]
+    except (KeyError, TypeError):
+        r = _apply_gamma_correction(rgb[0] / 255.0)
+        g = _apply_gamma_correction(rgb[1] / 255.0)
+        b = _apply_gamma_correction(rgb[2] / 255.0)
 
     # Apply transformation matrix to convert RGB to XYZ
     x = r * 0.4124564 + g * 0.3575761 + b * 0.1804375
@@ -745,7 +746,42 @@ def _apply_gamma_correction(value):
         value = ((value + 0.055) / 1.055) ** 2.4
     return value
 
+# linearized value of every 8-bit channel value
+_SRGB_TO_LINEAR = {i: _apply_gamma_correction(i / 255.0) for i in range(256)}
+
+# linear values halfway between two neighbouring 8-bit channel values, used to encode linear values again
+_LINEAR_THRESHOLDS = [_apply_gamma_correction((i + 0.5) / 255.0) for i in range(255)]
+
+def xyz_to_rgb(xyz: tuple) -> tuple:
+    """
+    Convert XYZ color values to RGB color values.
+
+    Args:
+        xyz (tuple): XYZ color values as a tuple (X, Y, Z) where each value is a decimal number.
+
+    Returns:
+        tuple: RGB values as a tuple of integers (R, G, B) in the range [0, 255]. Colors outside of the sRGB gamut are clipped.
+    """
+    x = xyz[0] / 100.0
+    y = xyz[1] / 100.0
+    z = xyz[2] / 100.0
+
+    # Apply the inverse transformation matrix to get linear RGB values
+    r = x * 3.2404542 + y * -1.5371385 + z * -0.4985314
+    g = x * -0.9692660 + y * 1.8760108 + z * 0.0415560
+    b = x * 0.0556434 + y * -0.2040259 + z * 1.0572252
+
+    # Encode to the nearest 8-bit value
+    return bisect(_LINEAR_THRESHOLDS, r), bisect(_LINEAR_THRESHOLDS, g), bisect(_LINEAR_THRESHOLDS, b)
+
+# optional rgb to lab cache, managed by colortools.labcache
+_lab_cache = None
+
 def rgb_to_lab(rgb: tuple) -> tuple:
+    if type(rgb) is Color:
+        return rgb.lab
+    if _lab_cache is not None:
+        return _lab_cache.lookup(rgb)
     xyz = rgb_to_xyz(rgb)
     lab = xyz_to_lab(xyz)
     return lab
@@ -796,6 +832,45 @@ def _apply_lab_transformation(value):
         value = (value * 903.3 + 16.0) / 116.0
     return value
 
+def lab_to_xyz(lab: tuple) -> tuple:
+    """
+    Convert LAB color values to XYZ color space.
+
+    Args:
+        lab (tuple): LAB color values as a tuple (L, a, b) where each value is a decimal number.
+
+    Returns:
+        tuple: XYZ color values as a tuple (X, Y, Z) where each value is a decimal number.
+    """
+    # Reference white point for D65 illuminant
+    Xn, Yn, Zn = 95.047, 100.000, 108.883
+
+    yn = (lab[0] + 16.0) / 116.0
+    xn = yn + lab[1] / 500.0
+    zn = yn - lab[2] / 200.0
+
+    # Undo the non-linear transformation
+    x = _revert_lab_transformation(xn) * Xn
+    y = _revert_lab_transformation(yn) * Yn
+    z = _revert_lab_transformation(zn) * Zn
+
+    return x, y, z
+
+def _revert_lab_transformation(value):
+    """
+    Inverse of _apply_lab_transformation.
+
+    Args:
+        value (float): Transformed color value.
+
+    Returns:
+        float: Color value.
+    """
+    cube = value ** 3
+    if cube > 0.008856:
+        return cube
+    return (value * 116.0 - 16.0) / 903.3
+
 
 # cie
 
@@ -804,12 +879,16 @@ def ciede2000(lab1, lab2):
     Calculate the CIEDE2000 color difference between two LAB tuples.
     
     Args:
-        lab1 (tuple): LAB tuple for the first color, in the format (L, a, b).
-        lab2 (tuple): LAB tuple for the second color, in the format (L, a, b).
+        lab1 (tuple): LAB tuple for the first color, in the format (L, a, b), or a Color.
+        lab2 (tuple): LAB tuple for the second color, in the format (L, a, b), or a Color.
         
     Returns:
         float: The CIEDE2000 color difference between the two colors.
     """
+    if type(lab1) is Color:
+        lab1 = lab1.lab
+    if type(lab2) is Color:
+        lab2 = lab2.lab
     L1, a1, b1 = lab1
     L2, a2, b2 = lab2
     
@@ -861,12 +940,16 @@ def cie76(lab1, lab2):
     Calculate the color difference (Delta E*76) between two CIELAB color tuples using the CIE76 formula.
     
     Args:
-        lab1 (tuple): The first CIELAB color tuple in the form (L, a, b).
-        lab2 (tuple): The second CIELAB color tuple in the form (L, a, b).
+        lab1 (tuple): The first CIELAB color tuple in the form (L, a, b), or a Color.
+        lab2 (tuple): The second CIELAB color tuple in the form (L, a, b), or a Color.
         
     Returns:
         float: The color difference (Delta E*76) between the two colors.
     """
+    if type(lab1) is Color:
+        lab1 = lab1.lab
+    if type(lab2) is Color:
+        lab2 = lab2.lab
     delta_L = lab1[0] - lab2[0]
     delta_a = lab1[1] - lab2[1]
     delta_b = lab1[2] - lab2[2]
@@ -880,12 +963,16 @@ def cie94(lab1, lab2):
     Calculates the CIE94 color difference between two CIELAB tuples.
 
     Args:
-        lab1 (tuple): A tuple containing the L, a, and b values of the first color in CIELAB format.
-        lab2 (tuple): A tuple containing the L, a, and b values of the second color in CIELAB format.
+        lab1 (tuple): A tuple containing the L, a, and b values of the first color in CIELAB format, or a Color.
+        lab2 (tuple): A tuple containing the L, a, and b values of the second color in CIELAB format, or a Color.
 
     Returns:
         float: The CIE94 color difference between the two colors.
     """
+    if type(lab1) is Color:
+        lab1 = lab1.lab
+    if type(lab2) is Color:
+        lab2 = lab2.lab
     l1, a1, b1 = lab1
     l2, a2, b2 = lab2
 
@@ -919,6 +1006,68 @@ def cie94(lab1, lab2):
     return math.sqrt((delta_l / (k_l * sl)) ** 2 + (delta_c / (k_c * kc)) ** 2 + (delta_h / (k_h * kh)) ** 2)
 
 
+# relative and absolute slack of the bounds in ciede2000_within, so rounding can never change an answer
+_WITHIN_EPSILON = 1e-9
+
+def _ciede2000_within(lab1, c1, lab2, threshold):
+    """
+    Compare with the bounds first, c1 is the chroma of lab1.
+
+    With SL = 1 and SC, SH >= 1 every term is at most its CIE76 counterpart, so delta E <= CIE76.
+    SH <= 1 + 0.04 * mean chroma < SC, so delta E >= sqrt(delta L^2 + delta ab^2 / SC^2).
+    """
+    outer = threshold * (1 + _WITHIN_EPSILON) + _WITHIN_EPSILON
+    delta_l = lab2[0] - lab1[0]
+    delta_l_sq = delta_l * delta_l
+    if delta_l_sq > outer * outer:
+        return False
+    delta_a = lab2[1] - lab1[1]
+    delta_b = lab2[2] - lab1[2]
+    delta_ab_sq = delta_a * delta_a + delta_b * delta_b
+    sc = 1 + 0.0225 * (c1 + math.sqrt(lab2[1] ** 2 + lab2[2] ** 2))
+    if delta_l_sq + delta_ab_sq / (sc * sc) > outer * outer:
+        return False
+    inner = threshold * (1 - _WITHIN_EPSILON) - _WITHIN_EPSILON
+    if inner > 0 and delta_l_sq + delta_ab_sq <= inner * inner:
+        return True
+    return ciede2000(lab1, lab2) <= threshold
+
+def ciede2000_within(lab1, lab2, threshold) -> bool:
+    """
+    Check whether the CIEDE2000 color difference between two LAB tuples is at most a threshold.
+
+    The answer is always the same as ciede2000(lab1, lab2) <= threshold, but pairs that are clearly apart or
+    clearly close are decided with a few multiplications, without the trigonometric functions.
+
+    Args:
+        lab1 (tuple): LAB tuple for the first color, in the format (L, a, b).
+        lab2 (tuple): LAB tuple for the second color, in the format (L, a, b).
+        threshold (float): The largest difference that counts as within.
+
+    Returns:
+        bool: Whether the colors are within the threshold.
+    """
+    if threshold < 0:
+        return False
+    return _ciede2000_within(lab1, math.sqrt(lab1[1] ** 2 + lab1[2] ** 2), lab2, threshold)
+
+def ciede2000_within_many(lab, labs, threshold) -> list:
+    """
+    Check for many LAB tuples whether their CIEDE2000 difference to one LAB tuple is at most a threshold.
+
+    Args:
+        lab (tuple): LAB tuple to compare with.
+        labs (iterable): LAB tuples.
+        threshold (float): The largest difference that counts as within.
+
+    Returns:
+        list: One bool per entry of labs, the same as ciede2000(lab, other) <= threshold.
+    """
+    if threshold < 0:
+        return [False for _ in labs]
+    c1 = math.sqrt(lab[1] ** 2 + lab[2] ** 2)
+    return [_ciede2000_within(lab, c1, other, threshold) for other in labs]
+
 def ciede2000_rgb(rgb1, rgb2):
     lab1 = rgb_to_lab(rgb1)
     lab2 = rgb_to_lab(rgb2)
@@ -948,31 +1097,56 @@ def hex_to_colorname(hex_color, naming_standard="html"):
     Returns:
         str: Closest matching color name.
     """
-    if naming_standard not in ["html", "html-ger", "x11", "color-meanings.com", "meodai"]:
-        raise ValueError("naming_standard input is not a valid option")
-    # Read data from CSV file
-    color_dict = {}
-    with open(files("colortools") / "data" / f"{naming_standard}.csv", mode='r') as file:
-        reader = csv.reader(file)
-        for row in reader:
-            color_name = row[0]
-            hex_code = row[1]
-            color_dict[color_name] = hex_code
-    
+    palette = palettes.get_palette(naming_standard)
+
     rgb_color = hex_to_rgb(hex_color)
-    closest_color = None
-    min_diff = 101
+    return _closest_colorname(palette, hex_color, rgb_color)
+
+def _closest_colorname(palette, hex_color, rgb_color, nearest_cache=None):
+    """
+    Look up the closest color name in a loaded palette.
+    An exact match of the hex code wins, otherwise the nearest color by CIEDE2000 is searched.
+    """
+    position = palette.find_hex(hex_color)
+    if position is None:
+        if nearest_cache is not None and rgb_color in nearest_cache:
+            position = nearest_cache[rgb_color]
+        else:
+            position, _ = palette.nearest(rgb_to_lab(rgb_color))
+            if nearest_cache is not None:
+                nearest_cache[rgb_color] = position
+        if position is None:
+            return None
+
+    return palette.names[position]
+
+def hex_to_colorname_many(hex_colors, naming_standard="html") -> list:
+    """
+    Find the closest matching color names for many hex colors at once.
+
+    The palette is loaded once and repeated colors are only looked up once.
+
+    Args:
+        hex_colors (iterable): Hex color codes.
+        naming_standard (str): html, html-ger, x11, color-meanings.com, meodai(color-name Github Project with over 30.000 colors).
+
+    Returns:
+        list: Closest matching color names in input order.
+    """
+    palette = palettes.get_palette(naming_standard)
 
-    for color_name, hex_code in color_dict.items():
-        if hex_color == hex_code:
-            return color_name
-        rgb_code = hex_to_rgb(hex_code)
-        diff = ciede2000_rgb(rgb_color, rgb_code)
-        if diff < min_diff:
-            min_diff = diff
-            closest_color = color_name
+    names: dict = {}
+    nearest_cache: dict = {}
+    result = []
+    for hex_color in hex_colors:
+        if hex_color in names:
+            result.append(names[hex_color])
+            continue
+        name = _closest_colorname(palette, hex_color, hex_to_rgb(hex_color), nearest_cache)
+        names[hex_color] = name
+        result.append(name)
 
-    return closest_color
+    return result
 
 def colorname_to_hex(colorname: str, naming_standard="html"):
     """
@@ -985,23 +1159,43 @@ def colorname_to_hex(colorname: str, naming_standard="html"):
     Returns:
         str: matching hex code or None.
     """
-    if naming_standard not in ["html", "html-ger", "x11", "color-meanings.com", "meodai"]:
-        raise ValueError("naming_standard input is not a valid option")
-    
-    # Read data from CSV file
-    color_dict = {}
-    with open(files("colortools") / "data" / f"{naming_standard}.csv", mode='r') as file:
-        reader = csv.reader(file)
-        for row in reader:
-            color_name = row[0]
-            hex_code = row[1]
-            color_dict[color_name] = hex_code
-    
-    for color_name, hex_code in color_dict.items():
-        if colorname.lower() == color_name.lower():
-            return hex_code
-        
-    return None
+    palette = palettes.get_palette(naming_standard)
+
+    position = palette.name_index.find(colorname)
+    if position is None:
+        return None
+    return palette.hexes[position]
+
+def colornames_starting_with(prefix: str, naming_standard="html", limit=10) -> list:
+    """
+    Get the color names that start with a prefix, e.g. for autocompletion. The comparison is case-insensitive.
+
+    Args:
+        prefix (string): start of the colorname.
+        naming_standard (str): html, html-ger, x11, color-meanings.com, meodai(color-name Github Project with over 30.000 colors).
+        limit (int): maximum number of names, None for all.
+
+    Returns:
+        list: matching color names in alphabetical order.
+    """
+    palette = palettes.get_palette(naming_standard)
+    return [palette.names[position] for position in palette.name_index.prefix(prefix, limit)]
+
+def similar_colornames(colorname: str, naming_standard="html", limit=10, min_score=0.3) -> list:
+    """
+    Get the color names that are spelled most similar to a colorname, e.g. to suggest corrections for typos.
+
+    Args:
+        colorname (string): colorname.
+        naming_standard (str): html, html-ger, x11, color-meanings.com, meodai(color-name Github Project with over 30.000 colors).
+        limit (int): maximum number of names.
+        min_score (float): minimum similarity in the range [0, 1] (Dice coefficient of the letter trigrams).
+
+    Returns:
+        list: matching color names, most similar first.
+    """
+    palette = palettes.get_palette(naming_standard)
+    return [palette.names[position] for position, _ in palette.name_index.fuzzy(colorname, limit, min_score)]
 
 def rgb_to_colorname(rgb: tuple, naming_standard="html"):
     """
@@ -1018,13 +1212,94 @@ def rgb_to_colorname(rgb: tuple, naming_standard="html"):
     _validate_rgb(rgb)
     if len(rgb) == 4:
         rgb = (rgb[0], rgb[1], rgb[2])
-        
+
+    # precomputed table, see colortools.lut
+    palette = palettes.get_palette(naming_standard)
+    if palette.lookup_table is not None:
+        position = palette.lookup_table.position(rgb)
+        return None if position is None else palette.names[position]
+
     hexc = rgb_to_hex(rgb)
 
     # conversion
     colorname = hex_to_colorname(hexc, naming_standard)
     return colorname
 
+def rgb_to_colorname_many(rgbs, naming_standard="html") -> list:
+    """
+    Find the closest matching color names for many rgb colors at once.
+
+    The palette is loaded once and repeated colors are only looked up once.
+
+    Args:
+        rgbs (iterable): rgb(a) tuples or any sequences of three or four integers, e.g. the rows of an (N, 3) array.
+        naming_standard (str): html, html-ger, x11, color-meanings.com, meodai(color-name Github Project with over 30.000 colors).
+
+    Returns:
+        list: Closest matching color names in input order.
+    """
+    palette = palettes.get_palette(naming_standard)
+
+    names: dict = {}
+    result = []
+    for rgb in rgbs:
+        if type(rgb) is not tuple:
+            try:
+                rgb = tuple(map(operator.index, rgb))
+            except TypeError:
+                raise ValueError("RGB values should be integers in the range [0, 255].") from None
+        if rgb in names:
+            result.append(names[rgb])
+            continue
+
+        # validate input
+        _validate_rgb(rgb)
+        rgb_color = (rgb[0], rgb[1], rgb[2])
+        if rgb_color in names:
+            name = names[rgb_color]
+        elif palette.lookup_table is not None:
+            position = palette.lookup_table.position(rgb_color)
+            name = None if position is None else palette.names[position]
+            names[rgb_color] = name
+        else:
+            name = _closest_colorname(palette, rgb_to_hex(rgb_color), rgb_color)
+            names[rgb_color] = name
+        names[rgb] = name
+        result.append(name)
+
+    return result
+
+def nearest_colornames(color, k=5, max_delta_e=None, metric="ciede2000", naming_standard="html") -> list:
+    """
+    Find the k closest color names for a color, e.g. to offer alternatives to the best match.
+
+    Args:
+        color (str or tuple): Hex color code, rgb(a) tuple or Color.
+        k (int): maximum number of names.
+        max_delta_e (float): only colors with a difference of at most this value are returned, None for no limit.
+        metric (str): ciede2000, cie76 or cie94.
+        naming_standard (str): html, html-ger, x11, color-meanings.com, meodai(color-name Github Project with over 30.000 colors).
+
+    Returns:
+        list: (name, hex code, delta E) tuples, closest first.
+    """
+    if metric not in ("ciede2000", "cie76", "cie94"):
+        msg = "metric must be one of ciede2000, cie76, cie94"
+        raise ValueError(msg)
+    if isinstance(color, str):
+        lab = rgb_to_lab(hex_to_rgb(color))
+    elif type(color) is Color:
+        lab = color.lab
+    else:
+        _validate_rgb(color)
+        lab = rgb_to_lab((color[0], color[1], color[2]))
+
+    palette = palettes.get_palette(naming_standard)
+    return [
+        (palette.names[position], palette.hexes[position], diff)
+        for position, diff in palette.k_nearest(lab, k, max_delta_e, metric)
+    ]
+
 def colorname_to_rgb(colorname: str, naming_standard="html"):
     """
     Get the rgb tuple of a colorname if it exists in the specified colorname system. Else returns None.  
@@ -1040,3 +1315,8 @@ def colorname_to_rgb(colorname: str, naming_standard="html"):
     if hexc is not None:
         return hex_to_rgb(hexc)
     return hexc
+
+
+# imported last: the palette registry itself depends on the converters above
+from colortools import palettes  # noqa: E402
+from colortools.color import Color  # noqa: E402
@@ -0,0 +1,394 @@
+"""
+Compiled, memory-mappable palette files.
+
+The CSV files in colortools/data stay the source of truth. compile_standards packs each
+of them into a binary .ctp file next to it (or into the directory named by the
+COLORTOOLS_PALETTE_DIR environment variable) with packed rgb values, the precomputed
+lab values and a string table for names and hex codes. The palette registry opens
+these files with mmap, so loading costs neither CSV parsing nor lab conversions and
+forked or separately started worker processes share the same pages.
+
+Each file records the size and CRC32 of the CSV it was built from. Files that no longer
+match their CSV are ignored until they are compiled again. The CRC32 is only computed
+when the CSV was modified after the compiled file, otherwise matching sizes are enough.
+
+Regenerate the files with:
+
+    python -m colortools.compiled [directory]
+
+File layout (little endian):
+
+    header   magic, entry count, string table sizes, source size and CRC32
+    labs     float64 L, a, b per entry
+    offsets  uint32 start offsets into the name and hex string tables, count + 1 each
+    rgbs     3 bytes per entry
+    names    utf-8 string table
+    hexes    ascii string table
+
+optionally followed by the nearest color index (see colortools.nearest.LabGrid):
+
+    header   index magic, cell size, cell count
+    cells    int32 L, a, b coordinates per cell
+    starts   uint32 start offsets into members, cell count + 1
+    members  uint32 entry positions grouped by cell
+    chromas  float64 chroma per entry
+"""
+
+import mmap
+import os
+import struct
+import sys
+import zlib
+from array import array
+from importlib.resources import files
+
+MAGIC = b"CTPAL001"
+INDEX_MAGIC = b"CTGRID01"
+SUFFIX = ".ctp"
+
+_HEADER = struct.Struct("<8sIIIIQ")
+_INDEX_HEADER = struct.Struct("<8sdI")
+
+
+class _LabView:
+    """
+    Sequence of lab tuples over a flat float64 buffer.
+    """
+
+    def __init__(self, values):
+        self._values = values
+
+    def __len__(self):
+        return len(self._values) // 3
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        offset = 3 * index
+        values = self._values
+        return (values[offset], values[offset + 1], values[offset + 2])
+
+    def __iter__(self):
+        values = iter(self._values)
+        return zip(values, values, values)
+
+
+class _RgbView(_LabView):
+    """
+    Sequence of rgb tuples over packed bytes.
+    """
+
+
+class _StringView:
+    """
+    Sequence of strings over a string table and its offsets.
+    """
+
+    def __init__(self, offsets, data, encoding):
+        self._offsets = offsets
+        self._data = data
+        self._encoding = encoding
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return str(self._data[self._offsets[index] : self._offsets[index + 1]], self._encoding)
+
+    def __iter__(self):
+        data = self._data
+        encoding = self._encoding
+        offsets = self._offsets
+        for start, end in zip(offsets, offsets[1:]):
+            yield str(data[start:end], encoding)
+
+
+def _little_endian(values):
+    if sys.byteorder != "little":
+        values.byteswap()
+    return values
+
+
+def _from_little_endian(typecode, data):
+    values = array(typecode)
+    values.frombytes(data)
+    return _little_endian(values)
+
+
+def _string_table(strings, encoding):
+    offsets = array("I", [0])
+    data = bytearray()
+    for string in strings:
+        data += string.encode(encoding)
+        offsets.append(len(data))
+    return offsets, bytes(data)
+
+
+def directory():
+    """
+    Get the directory holding the compiled files of the shipped naming standards.
+    """
+    return os.environ.get("COLORTOOLS_PALETTE_DIR") or str(files("colortools") / "data")
+
+
+def source_checksum(path):
+    """
+    Get (size, CRC32) of a source file, as recorded in compiled files.
+    """
+    with open(path, "rb") as file:
+        data = file.read()
+    return len(data), zlib.crc32(data)
+
+
+def _index_section(grid, count):
+    """
+    Pack the cells and chromas of a nearest color index.
+    """
+    coords = array("i")
+    starts = array("I", [0])
+    members = array("I")
+    for cell in sorted(grid.cells):
+        coords.extend(cell)
+        members.extend(sorted(grid.cells[cell]))
+        starts.append(len(members))
+    chromas = array("d", grid.chromas[:count])
+    return b"".join(
+        (
+            _INDEX_HEADER.pack(INDEX_MAGIC, grid.cell_size, len(starts) - 1),
+            _little_endian(coords).tobytes(),
+            _little_endian(starts).tobytes(),
+            _little_endian(members).tobytes(),
+            _little_endian(chromas).tobytes(),
+        )
+    )
+
+
+def write(palette, path, source=(0, 0), *, index=True):
+    """
+    Write a palette to a compiled file.
+
+    Args:
+        palette (Palette): The palette to write. Removed entries are left out.
+        path (str): Destination file. Written to a temporary file first and renamed when complete.
+        source (tuple): (size, CRC32) of the source file the palette was read from.
+        index (bool): Store the nearest color index, so it does not have to be built when the file is loaded.
+    """
+    from colortools.nearest import LabGrid
+
+    if len(palette) == len(palette.names):
+        names, hexes, rgbs, labs = palette.names, palette.hexes, palette.rgbs, palette.labs
+        grid = palette.index if index else None
+    else:
+        positions = list(palette.positions())
+        names = [palette.names[i] for i in positions]
+        hexes = [palette.hexes[i] for i in positions]
+        rgbs = [palette.rgbs[i] for i in positions]
+        labs = [palette.labs[i] for i in positions]
+        grid = LabGrid(labs) if index else None
+
+    count = len(names)
+    lab_values = _little_endian(array("d", [value for lab in labs for value in lab]))
+    rgb_values = bytes(value for rgb in rgbs for value in rgb[:3])
+    name_offsets, name_table = _string_table(names, "utf-8")
+    hex_offsets, hex_table = _string_table(hexes, "ascii")
+
+    temporary = f"{path}.tmp"
+    with open(temporary, "wb") as file:
+        file.write(_HEADER.pack(MAGIC, count, len(name_table), len(hex_table), source[0], source[1]))
+        file.write(lab_values.tobytes())
+        file.write(_little_endian(name_offsets).tobytes())
+        file.write(_little_endian(hex_offsets).tobytes())
+        file.write(rgb_values)
+        file.write(name_table)
+        file.write(hex_table)
+        if grid is not None:
+            file.write(_index_section(grid, count))
+    os.replace(temporary, path)
+
+
+def read_header(path):
+    """
+    Read the header of a compiled file.
+
+    Returns:
+        dict: count, names_size, hexes_size, source_size and source_crc32.
+
+    Raises:
+        ValueError: If the file is not a compiled palette.
+    """
+    with open(path, "rb") as file:
+        data = file.read(_HEADER.size)
+    if len(data) != _HEADER.size or data[:8] != MAGIC:
+        msg = f"{path} is not a compiled palette file"
+        raise ValueError(msg)
+    _, count, names_size, hexes_size, source_size, source_crc32 = _HEADER.unpack(data)
+    return {
+        "count": count,
+        "names_size": names_size,
+        "hexes_size": hexes_size,
+        "source_size": source_size,
+        "source_crc32": source_crc32,
+    }
+
+
+def load(path, name=None):
+    """
+    Open a compiled file as a palette backed by a read-only memory map.
+
+    Args:
+        path (str): The compiled file.
+        name (str): Name of the palette. Defaults to the file name without suffix.
+
+    Returns:
+        Palette: The palette. Its names, hexes, rgbs and labs are read from the mapped pages on access.
+
+    Raises:
+        ValueError: If the file is not a compiled palette or is truncated.
+    """
+    from colortools.palettes import Palette
+
+    header = read_header(path)
+    count = header["count"]
+    with open(path, "rb") as file:
+        mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    view = memoryview(mapped)
+
+    offset = _HEADER.size
+    sizes = (24 * count, 4 * (count + 1), 4 * (count + 1), 3 * count, header["names_size"], header["hexes_size"])
+    if len(view) < offset + sum(sizes):
+        msg = f"{path} is truncated or corrupt"
+        raise ValueError(msg)
+
+    sections = []
+    for size in sizes:
+        sections.append(view[offset : offset + size])
+        offset += size
+    labs, name_offsets, hex_offsets, rgbs, names, hexes = sections
+
+    if sys.byteorder == "little":
+        labs = labs.cast("d")
+        name_offsets = name_offsets.cast("I")
+        hex_offsets = hex_offsets.cast("I")
+    else:  # no cov
+        labs = _from_little_endian("d", labs)
+        name_offsets = _from_little_endian("I", name_offsets)
+        hex_offsets = _from_little_endian("I", hex_offsets)
+
+    labs = _LabView(labs)
+    grid = _read_index(view[offset:], labs, count, path) if offset < len(view) else None
+
+    if name is None:
+        name = os.path.basename(path)[: -len(SUFFIX)] if path.endswith(SUFFIX) else os.path.basename(path)
+    return Palette(
+        name,
+        _StringView(name_offsets, names, "utf-8"),
+        _StringView(hex_offsets, hexes, "ascii"),
+        _RgbView(rgbs),
+        labs,
+        index=grid,
+    )
+
+
+def _read_index(view, labs, count, path):
+    """
+    Rebuild the nearest color index stored after the palette sections.
+
+    The cells and chromas are read-only views of the mapped pages, Palette copies them before the first change.
+    """
+    from colortools.nearest import LabGrid
+
+    if len(view) < _INDEX_HEADER.size or view[:8] != INDEX_MAGIC:
+        msg = f"{path} is truncated or corrupt"
+        raise ValueError(msg)
+    _, cell_size, cell_count = _INDEX_HEADER.unpack(view[: _INDEX_HEADER.size])
+    offset = _INDEX_HEADER.size
+    sizes = (12 * cell_count, 4 * (cell_count + 1), 4 * count, 8 * count)
+    if len(view) != offset + sum(sizes):
+        msg = f"{path} is truncated or corrupt"
+        raise ValueError(msg)
+
+    sections = []
+    for typecode, size in zip("iIId", sizes):
+        if sys.byteorder == "little":
+            sections.append(view[offset : offset + size].cast(typecode))
+        else:  # no cov
+            sections.append(_from_little_endian(typecode, view[offset : offset + size]))
+        offset += size
+    coords, starts, members, chromas = sections
+
+    cells = {}
+    for i in range(cell_count):
+        cells[(coords[3 * i], coords[3 * i + 1], coords[3 * i + 2])] = members[starts[i] : starts[i + 1]]
+    return LabGrid.from_cells(labs, cell_size, chromas, cells)
+
+
+def standard_path(naming_standard):
+    """
+    Get the path of the compiled file of a shipped naming standard if it is up to date with its CSV.
+
+    Returns:
+        str: The path, or None if there is no compiled file or it is outdated.
+    """
+    path = os.path.join(directory(), naming_standard + SUFFIX)
+    try:
+        modified = os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+    header = read_header(path)
+    source = files("colortools") / "data" / f"{naming_standard}.csv"
+    source_stat = os.stat(source)
+    if header["source_size"] != source_stat.st_size:
+        return None
+    # a file compiled after the CSV was last modified is up to date, only read the CSV otherwise
+    if modified <= source_stat.st_mtime_ns and header["source_crc32"] != source_checksum(source)[1]:
+        return None
+    return path
+
+
+def load_standard(naming_standard):
+    """
+    Open the compiled file of a shipped naming standard if it is up to date with its CSV.
+
+    Returns:
+        Palette: The palette, or None if there is no compiled file or it is outdated.
+    """
+    path = standard_path(naming_standard)
+    if path is None:
+        return None
+    return load(path, naming_standard)
+
+
+def compile_standards(target=None) -> list:
+    """
+    Compile the CSV files of all shipped naming standards.
+
+    Args:
+        target (str): Directory to write the files to. Defaults to directory().
+
+    Returns:
+        list: Paths of the written files.
+    """
+    from colortools import palettes
+
+    target = target or directory()
+    os.makedirs(target, exist_ok=True)
+    written = []
+    for standard in palettes.STANDARDS:
+        csv_path = files("colortools") / "data" / f"{standard}.csv"
+        path = os.path.join(target, standard + SUFFIX)
+        write(palettes._read_csv(standard), path, source_checksum(csv_path))
+        written.append(path)
+    return written
+
+
+if __name__ == "__main__":
+    for written_path in compile_standards(sys.argv[1] if len(sys.argv) > 1 else None):
+        print(written_path)  # noqa: T201
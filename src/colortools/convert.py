@@ -0,0 +1,415 @@
+"""
+Conversion between any two color models through a graph of conversion steps.
+
+The functions in colortools.color_utils route every cross-model conversion through 8-bit
+rgb: hsl_to_lab is hsl_to_rgb followed by rgb_to_lab, so the hsl color is truncated to
+integers on the way. convert() looks up the shortest chain of steps between two models
+instead and composes it into a single kernel, which is cached per model pair. The
+srgb to xyz and srgb to lab steps are fused into one function each, so hsl, hsv and
+cmyk reach xyz and lab in two calls; longer chains call their steps in a loop.
+
+By default the kernels work on unrounded floats: hsl, hsv and cmyk go to gamma encoded
+rgb floats, then to linear rgb, xyz and lab without rounding in between. Results are
+floats, only hex codes are rounded to the nearest 8-bit value. Input values are
+checked against the same ranges as in color_utils. With quantize=True the kernels chain
+the functions of color_utils instead and return exactly what they return.
+"""
+
+from collections import deque
+
+from colortools import color_utils
+
+MODELS = ("rgb", "hex", "hsl", "hsv", "cmyk", "xyz", "lab")
+
+
+# unrounded conversion steps, "srgb" are gamma encoded and "linear" linear rgb floats in [0, 1]
+
+
+def _check_range(value, high, message):
+    if not 0 <= value <= high:
+        raise ValueError(message)
+
+
+def _rgb_to_srgb(rgb):
+    if len(rgb) not in (3, 4):
+        msg = "Input should be a tuple of three or four values representing RGB(A) values."
+        raise ValueError(msg)
+    for value in rgb[:3]:
+        _check_range(value, 255, "RGB values should be in the range [0, 255].")
+    return rgb[0] / 255.0, rgb[1] / 255.0, rgb[2] / 255.0
+
+
+def _srgb_to_rgb(srgb):
+    return srgb[0] * 255.0, srgb[1] * 255.0, srgb[2] * 255.0
+
+
+def _hex_to_srgb(hex_code):
+    return _rgb_to_srgb(color_utils.hex_to_rgb(hex_code))
+
+
+def _srgb_to_hex(srgb):
+    return color_utils.rgb_to_hex(tuple(min(255, max(0, round(value * 255.0))) for value in srgb))
+
+
+def _hsl_to_srgb(hsl):
+    h, s, l = hsl
+    _check_range(h, 360, "Hue value must be in the range [0, 360]")
+    _check_range(s, 100, "Saturation value must be in the range [0, 100]")
+    _check_range(l, 100, "Lightness value must be in the range [0, 100]")
+    h /= 360.0
+    s /= 100.0
+    l /= 100.0
+
+    c = (1 - abs(2 * l - 1)) * s
+    x = c * (1 - abs((h * 6) % 2 - 1))
+    m = l - c / 2
+
+    if h < 1 / 6:
+        return c + m, x + m, m
+    if h < 2 / 6:
+        return x + m, c + m, m
+    if h < 3 / 6:
+        return m, c + m, x + m
+    if h < 4 / 6:
+        return m, x + m, c + m
+    if h < 5 / 6:
+        return x + m, m, c + m
+    return c + m, m, x + m
+
+
+def _srgb_to_hsl(srgb):
+    r, g, b = srgb
+    max_val = max(r, g, b)
+    min_val = min(r, g, b)
+    diff = max_val - min_val
+    l = ((max_val + min_val) / 2) * 100
+
+    if diff == 0:
+        return 0.0, 0.0, l
+    if max_val == r:
+        h = (60 * ((g - b) / diff) + 360) % 360
+    elif max_val == g:
+        h = (60 * ((b - r) / diff) + 120) % 360
+    else:
+        h = (60 * ((r - g) / diff) + 240) % 360
+    return h, (diff / (1 - abs(2 * l / 100 - 1))) * 100, l
+
+
+def _hsv_to_srgb(hsv):
+    hue, saturation, value = hsv
+    _check_range(hue, 360, "Hue value must be in the range [0, 360]")
+    _check_range(saturation, 100, "Saturation value must be in the range [0, 100]")
+    _check_range(value, 100, "Value must be in the range [0, 100]")
+    hue /= 360.0
+    saturation /= 100.0
+    value /= 100.0
+
+    if saturation == 0.0:
+        return value, value, value
+
+    h_i = int(hue * 6)
+    f = hue * 6 - h_i
+    p = value * (1 - saturation)
+    q = value * (1 - f * saturation)
+    t = value * (1 - (1 - f) * saturation)
+
+    if h_i == 0:
+        return value, t, p
+    if h_i == 1:
+        return q, value, p
+    if h_i == 2:
+        return p, value, t
+    if h_i == 3:
+        return p, q, value
+    if h_i == 4:
+        return t, p, value
+    return value, p, q
+
+
+def _srgb_to_hsv(srgb):
+    r, g, b = srgb
+    max_value = max(r, g, b)
+    delta = max_value - min(r, g, b)
+
+    if delta == 0:
+        hue = 0.0
+    elif max_value == r:
+        hue = ((g - b) / delta) % 6
+    elif max_value == g:
+        hue = ((b - r) / delta) + 2
+    else:
+        hue = ((r - g) / delta) + 4
+    hue *= 60
+    if hue < 0:
+        hue += 360
+
+    return hue, 0.0 if max_value == 0 else (delta / max_value) * 100, max_value * 100
+
+
+def _cmyk_to_srgb(cmyk):
+    if len(cmyk) != 4:
+        msg = "CMYK tuple must contain exactly four values"
+        raise ValueError(msg)
+    for value in cmyk:
+        _check_range(value, 100, "CMYK values must be within the range of 0 to 100")
+    k = 1 - cmyk[3] / 100.0
+    return (1 - cmyk[0] / 100.0) * k, (1 - cmyk[1] / 100.0) * k, (1 - cmyk[2] / 100.0) * k
+
+
+def _srgb_to_cmyk(srgb):
+    r, g, b = srgb
+    k = 1 - max(r, g, b)
+    if (1 - k) == 0:
+        return 0.0, 0.0, 0.0, k * 100
+    return (1 - r - k) / (1 - k) * 100, (1 - g - k) / (1 - k) * 100, (1 - b - k) / (1 - k) * 100, k * 100
+
+
+def _srgb_to_linear(srgb):
+    gamma = color_utils._apply_gamma_correction
+    return gamma(srgb[0]), gamma(srgb[1]), gamma(srgb[2])
+
+
+def _encode_gamma(value):
+    if value <= 0.0031308:
+        return value * 12.92
+    return 1.055 * value ** (1 / 2.4) - 0.055
+
+
+def _linear_to_srgb(linear):
+    return _encode_gamma(linear[0]), _encode_gamma(linear[1]), _encode_gamma(linear[2])
+
+
+def _linear_to_xyz(linear):
+    r, g, b = linear
+    return (
+        (r * 0.4124564 + g * 0.3575761 + b * 0.1804375) * 100.0,
+        (r * 0.2126729 + g * 0.7151522 + b * 0.0721750) * 100.0,
+        (r * 0.0193339 + g * 0.1191920 + b * 0.9503041) * 100.0,
+    )
+
+
+def _srgb_to_xyz(srgb):
+    """
+    _srgb_to_linear and _linear_to_xyz in one step.
+    """
+    gamma = color_utils._apply_gamma_correction
+    r = gamma(srgb[0])
+    g = gamma(srgb[1])
+    b = gamma(srgb[2])
+    return (
+        (r * 0.4124564 + g * 0.3575761 + b * 0.1804375) * 100.0,
+        (r * 0.2126729 + g * 0.7151522 + b * 0.0721750) * 100.0,
+        (r * 0.0193339 + g * 0.1191920 + b * 0.9503041) * 100.0,
+    )
+
+
+def _srgb_to_lab(srgb):
+    """
+    _srgb_to_xyz and color_utils.xyz_to_lab in one step.
+    """
+    gamma = color_utils._apply_gamma_correction
+    transform = color_utils._apply_lab_transformation
+    r = gamma(srgb[0])
+    g = gamma(srgb[1])
+    b = gamma(srgb[2])
+    # xyz normalized by the D65 white point
+    xn = transform((r * 0.4124564 + g * 0.3575761 + b * 0.1804375) * 100.0 / 95.047)
+    yn = transform(r * 0.2126729 + g * 0.7151522 + b * 0.0721750)
+    zn = transform((r * 0.0193339 + g * 0.1191920 + b * 0.9503041) * 100.0 / 108.883)
+    return max(0.0, 116.0 * yn - 16.0), (xn - yn) * 500.0, (yn - zn) * 200.0
+
+
+def _invert(matrix):
+    """
+    Invert a 3x3 matrix given as a tuple of rows.
+    """
+    (a, b, c), (d, e, f), (g, h, i) = matrix
+    det = a * (e * i - f * h) - b * (d * i - f * g) + c * (d * h - e * g)
+    return (
+        ((e * i - f * h) / det, (c * h - b * i) / det, (b * f - c * e) / det),
+        ((f * g - d * i) / det, (a * i - c * g) / det, (c * d - a * f) / det),
+        ((d * h - e * g) / det, (b * g - a * h) / det, (a * e - b * d) / det),
+    )
+
+
+# exact inverse of the rgb to xyz matrix, so unrounded round trips come back to the same color
+_XYZ_TO_LINEAR = _invert(
+    (
+        (0.4124564, 0.3575761, 0.1804375),
+        (0.2126729, 0.7151522, 0.0721750),
+        (0.0193339, 0.1191920, 0.9503041),
+    )
+)
+
+
+def _xyz_to_linear(xyz):
+    x, y, z = xyz[0] / 100.0, xyz[1] / 100.0, xyz[2] / 100.0
+    (m11, m12, m13), (m21, m22, m23), (m31, m32, m33) = _XYZ_TO_LINEAR
+    return (
+        x * m11 + y * m12 + z * m13,
+        x * m21 + y * m22 + z * m23,
+        x * m31 + y * m32 + z * m33,
+    )
+
+
+_UNROUNDED = {
+    ("rgb", "srgb"): _rgb_to_srgb,
+    ("srgb", "rgb"): _srgb_to_rgb,
+    ("hex", "srgb"): _hex_to_srgb,
+    ("srgb", "hex"): _srgb_to_hex,
+    ("hsl", "srgb"): _hsl_to_srgb,
+    ("srgb", "hsl"): _srgb_to_hsl,
+    ("hsv", "srgb"): _hsv_to_srgb,
+    ("srgb", "hsv"): _srgb_to_hsv,
+    ("cmyk", "srgb"): _cmyk_to_srgb,
+    ("srgb", "cmyk"): _srgb_to_cmyk,
+    ("srgb", "linear"): _srgb_to_linear,
+    ("linear", "srgb"): _linear_to_srgb,
+    ("linear", "xyz"): _linear_to_xyz,
+    ("xyz", "linear"): _xyz_to_linear,
+    ("xyz", "lab"): color_utils.xyz_to_lab,
+    ("lab", "xyz"): color_utils.lab_to_xyz,
+}
+
+# the color_utils functions, every model goes through 8-bit rgb
+_QUANTIZED = {
+    ("hex", "rgb"): color_utils.hex_to_rgb,
+    ("rgb", "hex"): color_utils.rgb_to_hex,
+    ("hsl", "rgb"): color_utils.hsl_to_rgb,
+    ("rgb", "hsl"): color_utils.rgb_to_hsl,
+    ("hsv", "rgb"): color_utils.hsv_to_rgb,
+    ("rgb", "hsv"): color_utils.rgb_to_hsv,
+    ("cmyk", "rgb"): color_utils.cmyk_to_rgb,
+    ("rgb", "cmyk"): color_utils.rgb_to_cmyk,
+    ("rgb", "xyz"): color_utils.rgb_to_xyz,
+    ("xyz", "rgb"): color_utils.xyz_to_rgb,
+    ("rgb", "lab"): color_utils.rgb_to_lab,
+    ("xyz", "lab"): color_utils.xyz_to_lab,
+    ("lab", "xyz"): color_utils.lab_to_xyz,
+}
+
+# runs of unrounded steps replaced by a single fused function
+_FUSED = (
+    (("srgb", "linear", "xyz", "lab"), _srgb_to_lab),
+    (("srgb", "linear", "xyz"), _srgb_to_xyz),
+)
+
+_kernels: dict = {}
+
+
+def _validate_model(model):
+    if model not in MODELS:
+        msg = f"color model must be one of {', '.join(MODELS)}"
+        raise ValueError(msg)
+
+
+def conversion_path(src, dst, *, quantize=False) -> list:
+    """
+    Get the chain of color models a conversion passes through.
+
+    Args:
+        src (str): Source color model: rgb, hex, hsl, hsv, cmyk, xyz or lab.
+        dst (str): Target color model.
+        quantize (bool): Route through 8-bit rgb like the color_utils functions.
+
+    Returns:
+        list: The models from src to dst, including the internal "srgb" (gamma encoded) and "linear" rgb float steps.
+    """
+    _validate_model(src)
+    _validate_model(dst)
+    edges = _QUANTIZED if quantize else _UNROUNDED
+
+    # breadth first search for the shortest chain of steps
+    previous = {src: None}
+    queue = deque([src])
+    while queue:
+        node = queue.popleft()
+        if node == dst:
+            break
+        for start, end in edges:
+            if start == node and end not in previous:
+                previous[end] = node
+                queue.append(end)
+
+    path = [dst]
+    while previous[path[-1]] is not None:
+        path.append(previous[path[-1]])
+    return path[::-1]
+
+
+def get_converter(src, dst, *, quantize=False):
+    """
+    Get the composed conversion function between two color models, e.g. to call it in a loop.
+
+    Args:
+        src (str): Source color model: rgb, hex, hsl, hsv, cmyk, xyz or lab.
+        dst (str): Target color model.
+        quantize (bool): Route through 8-bit rgb like the color_utils functions.
+
+    Returns:
+        function: Takes a value of the source model and returns the value in the target model.
+    """
+    key = (src, dst, quantize)
+    kernel = _kernels.get(key)
+    if kernel is not None:
+        return kernel
+
+    path = conversion_path(src, dst, quantize=quantize)
+    edges = _QUANTIZED if quantize else _UNROUNDED
+    steps = []
+    i = 0
+    while i < len(path) - 1:
+        for models, function in () if quantize else _FUSED:
+            if tuple(path[i : i + len(models)]) == models:
+                steps.append(function)
+                i += len(models) - 1
+                break
+        else:
+            steps.append(edges[path[i], path[i + 1]])
+            i += 1
+
+    if not steps:
+        # src == dst: run the first step out of the source model for its validation only
+        check = next(function for (start, _), function in edges.items() if start == src)
+
+        def kernel(value):
+            check(value)
+            return value
+
+    elif len(steps) == 1:
+        kernel = steps[0]
+    elif len(steps) == 2:
+        first, second = steps
+
+        def kernel(value):
+            return second(first(value))
+
+    else:
+
+        def kernel(value):
+            for step in steps:
+                value = step(value)
+            return value
+
+    _kernels[key] = kernel
+    return kernel
+
+
+def convert(value, src, dst, *, quantize=False):
+    """
+    Convert a color between two color models.
+
+    Args:
+        value: The color in the source model, a tuple or a hex code string.
+        src (str): Source color model: rgb, hex, hsl, hsv, cmyk, xyz or lab.
+        dst (str): Target color model.
+        quantize (bool): If False (default), convert with unrounded floats and return floats. If True, round to 8-bit
+            rgb on the way and return exactly what the color_utils functions return.
+
+    Returns:
+        The color in the target model, a tuple or a hex code string.
+
+    Raises:
+        ValueError: If a color model is not supported or the value is out of range for the source model.
+    """
+    return get_converter(src, dst, quantize=quantize)(value)
@@ -0,0 +1,235 @@
+"""
+Palette extraction from whole images.
+
+Pixels are read straight from an interleaved rgb or rgba buffer of unsigned bytes
+(bytes, bytearray, memoryview, array.array("B"), uint8 numpy arrays or anything else
+supporting the buffer protocol), subsampled with a jittered stride and counted in a
+histogram of 32 levels per channel. Every run of samples starts at a random offset, so
+periodic patterns such as stripes or dithering whose period divides the stride are not
+sampled at the same phase every time. The mean colors of the occupied bins are converted
+with rgb_to_lab and clustered in LAB, so the extracted colors follow perceptual rather
+than rgb distances.
+"""
+
+import random
+from collections import Counter
+
+from colortools.color_utils import lab_to_xyz, rgb_to_lab, xyz_to_rgb
+
+METHODS = ("median-cut", "kmeans")
+# samples taken at a fixed stride before the next random offset
+_RUN = 64
+
+
+def _histogram(pixels, channels, max_samples):
+    """
+    Count the sampled pixels per histogram bin of 32 levels per channel.
+
+    Returns:
+        dict: Number of sampled pixels per bin, keyed by the mean rgb tuple of the pixels in the bin.
+    """
+    try:
+        view = memoryview(pixels)
+    except TypeError:
+        # an iterable of rgb(a) tuples
+        view = memoryview(bytes(value for rgb in pixels for value in rgb[:3]))
+        channels = 3
+    if view.format != "B":
+        msg = f"pixels must hold unsigned bytes (format 'B'), got format {view.format!r}"
+        raise ValueError(msg)
+    if not view.c_contiguous:
+        # e.g. a strided numpy view, copied in C order
+        view = memoryview(view.tobytes())
+    view = view.cast("B")
+
+    if channels not in (3, 4):
+        msg = "channels must be 3 (rgb) or 4 (rgba)"
+        raise ValueError(msg)
+    count = len(view) // channels
+    if count == 0:
+        msg = "pixels must contain at least one pixel"
+        raise ValueError(msg)
+
+    stride = max(1, count // max_samples) if max_samples else 1
+    step = channels * stride
+    if stride == 1:
+        end = count * channels
+        colors = Counter(zip(view[0:end:step], view[1:end:step], view[2:end:step]))
+    else:
+        # a fixed seed keeps the result reproducible
+        rng = random.Random(0)
+        reds = bytearray()
+        greens = bytearray()
+        blues = bytearray()
+        for start in range(0, count, _RUN * stride):
+            first = (start + rng.randrange(stride)) * channels
+            last = min(start + _RUN * stride, count) * channels
+            reds += view[first:last:step].tobytes()
+            greens += view[first + 1 : last : step].tobytes()
+            blues += view[first + 2 : last : step].tobytes()
+        colors = Counter(zip(reds, greens, blues))
+
+    bins = {}
+    for (r, g, b), n in colors.items():
+        sums = bins.get((r >> 3, g >> 3, b >> 3))
+        if sums is None:
+            bins[(r >> 3, g >> 3, b >> 3)] = [n, r * n, g * n, b * n]
+        else:
+            sums[0] += n
+            sums[1] += r * n
+            sums[2] += g * n
+            sums[3] += b * n
+
+    histogram = {}
+    for n, red, green, blue in bins.values():
+        rgb = (round(red / n), round(green / n), round(blue / n))
+        histogram[rgb] = histogram.get(rgb, 0) + n
+    return histogram
+
+
+def _mean(items):
+    """
+    Weighted mean lab of (lab, weight) items.
+    """
+    total = sum(weight for _, weight in items)
+    return (
+        sum(lab[0] * weight for lab, weight in items) / total,
+        sum(lab[1] * weight for lab, weight in items) / total,
+        sum(lab[2] * weight for lab, weight in items) / total,
+    )
+
+
+def _box(items):
+    """
+    Get a box of (lab, weight) items with its total weight and weighted extent along its longest axis.
+
+    Returns:
+        tuple: (weighted extent, axis, items, total weight). The extent is None for boxes that cannot be split.
+    """
+    total = sum(weight for _, weight in items)
+    if len(items) < 2:
+        return None, 0, items, total
+    best = None
+    axis = 0
+    for i in range(3):
+        values = [lab[i] for lab, _ in items]
+        extent = (max(values) - min(values)) * total
+        if best is None or extent > best:
+            best = extent
+            axis = i
+    return best, axis, items, total
+
+
+def _median_cut(items, n_colors):
+    """
+    Split the items into up to n_colors boxes in lab space.
+
+    The box with the largest weighted extent is split along its longest axis at the weighted median.
+    """
+    boxes = [_box(items)]
+    while len(boxes) < n_colors:
+        best = None
+        for i, (extent, _, _, _) in enumerate(boxes):
+            if extent is not None and (best is None or extent > boxes[best][0]):
+                best = i
+        if best is None or boxes[best][0] == 0:
+            break
+
+        _, axis, box, total = boxes.pop(best)
+        box = sorted(box, key=lambda item, axis=axis: item[0][axis])
+        half = total / 2
+        running = 0
+        split = len(box) - 1
+        for i, (_, weight) in enumerate(box):
+            running += weight
+            if running >= half:
+                split = i
+                break
+        split = min(split, len(box) - 2) + 1
+        boxes.extend((_box(box[:split]), _box(box[split:])))
+    return [_mean(box) for _, _, box, _ in boxes]
+
+
+def _nearest(lab, centers):
+    best = 0
+    best_distance = None
+    for i, center in enumerate(centers):
+        distance = (lab[0] - center[0]) ** 2 + (lab[1] - center[1]) ** 2 + (lab[2] - center[2]) ** 2
+        if best_distance is None or distance < best_distance:
+            best = i
+            best_distance = distance
+    return best
+
+
+def _kmeans(items, n_colors, iterations, batch_size, seed):
+    """
+    Mini-batch k-means in lab space, started from the median cut centers.
+    """
+    centers = [list(center) for center in _median_cut(items, n_colors)]
+    counts = [0] * len(centers)
+    rng = random.Random(seed)
+    labs = [lab for lab, _ in items]
+    weights = [weight for _, weight in items]
+
+    for _ in range(iterations):
+        batch = rng.choices(labs, weights, k=batch_size)
+        assigned = [_nearest(lab, centers) for lab in batch]
+        for lab, i in zip(batch, assigned):
+            counts[i] += 1
+            rate = 1 / counts[i]
+            center = centers[i]
+            center[0] += (lab[0] - center[0]) * rate
+            center[1] += (lab[1] - center[1]) * rate
+            center[2] += (lab[2] - center[2]) * rate
+    return [tuple(center) for center in centers]
+
+
+def extract_palette(
+    pixels, n_colors=5, method="median-cut", channels=3, max_samples=250000, iterations=20, batch_size=1024, seed=None
+) -> list:
+    """
+    Extract the dominant colors of an image.
+
+    Args:
+        pixels: Interleaved rgb or rgba pixel data supporting the buffer protocol, or an iterable of rgb(a) tuples.
+        n_colors (int): Number of colors to extract.
+        method (str): "median-cut" or "kmeans" (mini-batch k-means, started from the median cut result).
+        channels (int): 3 for rgb or 4 for rgba buffers. The alpha channel is ignored.
+        max_samples (int): Subsample the image to about this many pixels, None to use every pixel, which takes
+            seconds for a 4K image.
+        iterations (int): Number of mini-batches for "kmeans".
+        batch_size (int): Number of sampled histogram bins per mini-batch for "kmeans".
+        seed: Seed for the random mini-batches of "kmeans".
+
+    Returns:
+        list: Up to n_colors (rgb, share) tuples, most common first. share is the fraction of the sampled pixels
+            closest to the color.
+
+    Raises:
+        ValueError: If the method or number of channels is not supported, the buffer does not hold unsigned bytes or
+            there are no pixels.
+    """
+    if method not in METHODS:
+        msg = f"method must be one of {', '.join(METHODS)}"
+        raise ValueError(msg)
+    if n_colors < 1:
+        msg = "n_colors must be at least 1"
+        raise ValueError(msg)
+
+    histogram = _histogram(pixels, channels, max_samples)
+    items = [(rgb_to_lab(rgb), count) for rgb, count in histogram.items()]
+
+    if method == "median-cut":
+        centers = _median_cut(items, n_colors)
+    else:
+        centers = _kmeans(items, n_colors, iterations, batch_size, seed)
+
+    # share of the sampled pixels closest to each color
+    shares = [0] * len(centers)
+    for lab, count in items:
+        shares[_nearest(lab, centers)] += count
+    total = sum(shares)
+
+    palette = [(xyz_to_rgb(lab_to_xyz(center)), share / total) for center, share in zip(centers, shares) if share]
+    palette.sort(key=lambda entry: entry[1], reverse=True)
+    return palette
@@ -0,0 +1,271 @@
+"""
+Unvalidated conversions for trusted inner loops.
+
+The functions compute the same values as their counterparts in colortools.color_utils,
+but take the channels as separate arguments, skip every input check and do not build
+intermediate tuples. rgb values must be integers in the range [0, 255] and hex codes
+must have six or eight digits, optionally prefixed with "#". Invalid input gives
+wrong results or arbitrary exceptions instead of a ValueError.
+
+The optional rgb to lab cache of colortools.labcache is not used here.
+"""
+
+import math
+
+from colortools.color_utils import _SRGB_TO_LINEAR
+
+_LINEAR = [_SRGB_TO_LINEAR[i] for i in range(256)]
+_THIRD = 1.0 / 3.0
+
+
+def rgb_to_hex(r, g, b) -> str:
+    """
+    Convert rgb values to a hexadecimal color code.
+    """
+    return "#%02x%02x%02x" % (r, g, b)
+
+
+def hex_to_rgb(hex_code) -> tuple:
+    """
+    Convert a six or eight digit hexadecimal color code to rgb values.
+    """
+    if hex_code[0] == "#":
+        hex_code = hex_code[1:]
+    value = int(hex_code[:6], 16)
+    return value >> 16, (value >> 8) & 255, value & 255
+
+
+def rgb_to_hsl(r, g, b) -> tuple:
+    """
+    Convert rgb values to hsl values.
+    """
+    r, g, b = r / 255.0, g / 255.0, b / 255.0
+    max_val = max(r, g, b)
+    min_val = min(r, g, b)
+    diff = max_val - min_val
+    l = ((max_val + min_val) / 2) * 100
+
+    if diff == 0:
+        return 0, 0, round(l)
+
+    if max_val == r:
+        h = (60 * ((g - b) / diff) + 360) % 360
+    elif max_val == g:
+        h = (60 * ((b - r) / diff) + 120) % 360
+    else:
+        h = (60 * ((r - g) / diff) + 240) % 360
+    s = (diff / (1 - abs(2 * l / 100 - 1))) * 100
+
+    return round(h), round(s), round(l)
+
+
+def hsl_to_rgb(h, s, l) -> tuple:
+    """
+    Convert hsl values to rgb values.
+    """
+    s /= 100.0
+    l /= 100.0
+    h = h / 360.0
+    c = (1 - abs(2 * l - 1)) * s
+    x = c * (1 - abs((h * 6) % 2 - 1))
+    m = l - c / 2
+
+    if h < 1 / 6:
+        return int((c + m) * 255), int((x + m) * 255), int((0 + m) * 255)
+    if h < 2 / 6:
+        return int((x + m) * 255), int((c + m) * 255), int((0 + m) * 255)
+    if h < 3 / 6:
+        return int((0 + m) * 255), int((c + m) * 255), int((x + m) * 255)
+    if h < 4 / 6:
+        return int((0 + m) * 255), int((x + m) * 255), int((c + m) * 255)
+    if h < 5 / 6:
+        return int((x + m) * 255), int((0 + m) * 255), int((c + m) * 255)
+    return int((c + m) * 255), int((0 + m) * 255), int((x + m) * 255)
+
+
+def rgb_to_hsv(r, g, b) -> tuple:
+    """
+    Convert rgb values to hsv values.
+    """
+    r, g, b = r / 255.0, g / 255.0, b / 255.0
+    max_value = max(r, g, b)
+    delta = max_value - min(r, g, b)
+
+    if delta == 0:
+        hue = 0
+    elif max_value == r:
+        hue = ((g - b) / delta) % 6
+    elif max_value == g:
+        hue = ((b - r) / delta) + 2
+    else:
+        hue = ((r - g) / delta) + 4
+    hue *= 60
+    if hue < 0:
+        hue += 360
+
+    saturation = 0 if max_value == 0 else (delta / max_value) * 100
+
+    return round(hue), round(saturation), round(max_value * 100)
+
+
+def hsv_to_rgb(hue, saturation, value) -> tuple:
+    """
+    Convert hsv values to rgb values.
+    """
+    hue /= 360.0
+    saturation /= 100.0
+    value /= 100.0
+
+    if saturation == 0.0:
+        gray = int(value * 255)
+        return gray, gray, gray
+
+    h_i = int(hue * 6)
+    f = hue * 6 - h_i
+    p = value * (1 - saturation)
+    q = value * (1 - f * saturation)
+    t = value * (1 - (1 - f) * saturation)
+
+    if h_i == 0:
+        return int(value * 255), int(t * 255), int(p * 255)
+    if h_i == 1:
+        return int(q * 255), int(value * 255), int(p * 255)
+    if h_i == 2:
+        return int(p * 255), int(value * 255), int(t * 255)
+    if h_i == 3:
+        return int(p * 255), int(q * 255), int(value * 255)
+    if h_i == 4:
+        return int(t * 255), int(p * 255), int(value * 255)
+    return int(value * 255), int(p * 255), int(q * 255)
+
+
+def rgb_to_cmyk(r, g, b) -> tuple:
+    """
+    Convert rgb values to cmyk values.
+    """
+    r /= 255.0
+    g /= 255.0
+    b /= 255.0
+    k = 1 - max(r, g, b)
+    if (1 - k) == 0:
+        return 0, 0, 0, round(k * 100)
+    return (
+        round((1 - r - k) / (1 - k) * 100),
+        round((1 - g - k) / (1 - k) * 100),
+        round((1 - b - k) / (1 - k) * 100),
+        round(k * 100),
+    )
+
+
+def cmyk_to_rgb(c, m, y, k) -> tuple:
+    """
+    Convert cmyk values to rgb values.
+    """
+    k = 1 - k / 100.0
+    return (
+        round((1 - c / 100.0) * k * 255),
+        round((1 - m / 100.0) * k * 255),
+        round((1 - y / 100.0) * k * 255),
+    )
+
+
+def rgb_to_xyz(r, g, b) -> tuple:
+    """
+    Convert rgb values to xyz values.
+    """
+    r = _LINEAR[r]
+    g = _LINEAR[g]
+    b = _LINEAR[b]
+    return (
+        (r * 0.4124564 + g * 0.3575761 + b * 0.1804375) * 100.0,
+        (r * 0.2126729 + g * 0.7151522 + b * 0.0721750) * 100.0,
+        (r * 0.0193339 + g * 0.1191920 + b * 0.9503041) * 100.0,
+    )
+
+
+def xyz_to_lab(x, y, z) -> tuple:
+    """
+    Convert xyz values to lab values.
+    """
+    x /= 95.047
+    y /= 100.000
+    z /= 108.883
+    x = x**_THIRD if x > 0.008856 else (x * 903.3 + 16.0) / 116.0
+    y = y**_THIRD if y > 0.008856 else (y * 903.3 + 16.0) / 116.0
+    z = z**_THIRD if z > 0.008856 else (z * 903.3 + 16.0) / 116.0
+
+    l = 116.0 * y - 16.0
+    if l < 0.0:
+        l = 0.0
+    return l, (x - y) * 500.0, (y - z) * 200.0
+
+
+def rgb_to_lab(r, g, b) -> tuple:
+    """
+    Convert rgb values to lab values.
+    """
+    r = _LINEAR[r]
+    g = _LINEAR[g]
+    b = _LINEAR[b]
+    x = (r * 0.4124564 + g * 0.3575761 + b * 0.1804375) * 100.0 / 95.047
+    y = (r * 0.2126729 + g * 0.7151522 + b * 0.0721750) * 100.0 / 100.000
+    z = (r * 0.0193339 + g * 0.1191920 + b * 0.9503041) * 100.0 / 108.883
+    x = x**_THIRD if x > 0.008856 else (x * 903.3 + 16.0) / 116.0
+    y = y**_THIRD if y > 0.008856 else (y * 903.3 + 16.0) / 116.0
+    z = z**_THIRD if z > 0.008856 else (z * 903.3 + 16.0) / 116.0
+
+    l = 116.0 * y - 16.0
+    if l < 0.0:
+        l = 0.0
+    return l, (x - y) * 500.0, (y - z) * 200.0
+
+
+def ciede2000(l1, a1, b1, l2, a2, b2) -> float:
+    """
+    Calculate the CIEDE2000 color difference between two lab colors.
+    """
+    c1 = math.sqrt(a1**2 + b1**2)
+    c2 = math.sqrt(a2**2 + b2**2)
+    c_mean = (c1 + c2) / 2
+    h1 = math.degrees(math.atan2(b1, a1)) % 360
+    h2 = math.degrees(math.atan2(b2, a2)) % 360
+
+    # Calculate hue difference
+    if abs(h1 - h2) <= 180:
+        delta_h = h2 - h1
+    elif h2 <= h1:
+        delta_h = h2 - h1 + 360
+    else:
+        delta_h = h2 - h1 - 360
+    delta_h = 2 * math.sqrt(c1 * c2) * math.sin(math.radians(delta_h) / 2)
+
+    # Calculate weighting factors
+    cos_h = math.cos(math.radians(delta_h - 30))
+    sh = 1 + 0.015 * c_mean * (1 - 0.17 * cos_h) / (1 - 0.56 * cos_h)
+
+    return math.sqrt((l2 - l1) ** 2 + ((c2 - c1) / (1 + 0.045 * c_mean)) ** 2 + (delta_h / sh) ** 2)
+
+
+def cie76(l1, a1, b1, l2, a2, b2) -> float:
+    """
+    Calculate the CIE76 color difference between two lab colors.
+    """
+    return math.sqrt((l1 - l2) ** 2 + (a1 - a2) ** 2 + (b1 - b2) ** 2)
+
+
+def ciede2000_rgb(r1, g1, b1, r2, g2, b2) -> float:
+    """
+    Calculate the CIEDE2000 color difference between two rgb colors.
+    """
+    l1, a1, lab_b1 = rgb_to_lab(r1, g1, b1)
+    l2, a2, lab_b2 = rgb_to_lab(r2, g2, b2)
+    return ciede2000(l1, a1, lab_b1, l2, a2, lab_b2)
+
+
+def cie76_rgb(r1, g1, b1, r2, g2, b2) -> float:
+    """
+    Calculate the CIE76 color difference between two rgb colors.
+    """
+    l1, a1, lab_b1 = rgb_to_lab(r1, g1, b1)
+    l2, a2, lab_b2 = rgb_to_lab(r2, g2, b2)
+    return cie76(l1, a1, lab_b1, l2, a2, lab_b2)
@@ -0,0 +1,213 @@
+"""
+Opt-in cache for the rgb to lab conversion.
+
+rgb_to_lab is used by every Delta E function taking rgb colors and by the colorname
+lookups. Workloads that convert the same colors again and again can enable one of two
+cache levels:
+
+- "lru": a bounded memo of the most recently converted colors, for sparse access.
+- "dense": a table with one float64 LAB entry for each of the 16.7M 8-bit rgb colors
+  (about 400 MB). It is filled lazily in memory, or memory-mapped from a file written
+  by build_table so that several processes share the same pages.
+
+Both return exactly what the uncached conversion returns. Callers that accept approximate
+results can pass typecode="f" for a float32 table of half the size: its values differ
+from the exact conversion by about 1e-6, which can change the colorname of a query that
+is almost equally close to two palette colors.
+"""
+
+import mmap
+import os
+from array import array
+from functools import lru_cache
+
+from colortools import color_utils
+
+TABLE_ENTRIES = 1 << 24
+
+# channel values shifted into their position of the table index, out of range values are missing
+_RED = {i: i << 16 for i in range(256)}
+_GREEN = {i: i << 8 for i in range(256)}
+_BLUE = {i: i for i in range(256)}
+
+
+def _convert(rgb):
+    return color_utils.xyz_to_lab(color_utils.rgb_to_xyz(rgb))
+
+
+class _LRUCache:
+    mode = "lru"
+
+    def __init__(self, maxsize):
+        self._cached = lru_cache(maxsize=maxsize)(lambda r, g, b: _convert((r, g, b)))
+        self.bypassed = 0
+
+    def lookup(self, rgb):
+        try:
+            return self._cached(rgb[0], rgb[1], rgb[2])
+        except TypeError:
+            # unhashable channel values
+            self.bypassed += 1
+            return _convert(rgb)
+
+    def stats(self):
+        info = self._cached.cache_info()
+        return {
+            "mode": self.mode,
+            "hits": info.hits,
+            "misses": info.misses,
+            "bypassed": self.bypassed,
+            "size": info.currsize,
+            "maxsize": info.maxsize,
+        }
+
+    def clear(self):
+        self._cached.cache_clear()
+        self.bypassed = 0
+
+
+class _DenseCache:
+    mode = "dense"
+
+    def __init__(self, path=None, typecode="d"):
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = 0
+        self._mmap = None
+        self._size = 0
+        if path is not None:
+            # a complete table written by build_table
+            with open(path, "rb") as file:
+                self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._table = memoryview(self._mmap).cast(typecode)
+            if len(self._table) != 3 * TABLE_ENTRIES:
+                self.close()
+                msg = f"{path} is not a complete rgb to lab table of typecode {typecode!r}"
+                raise ValueError(msg)
+            self._filled = None
+        else:
+            # repeating a one element array allocates the table once, without a zeroed bytes copy
+            self._table = array(typecode, [0.0]) * (3 * TABLE_ENTRIES)
+            self._filled = bytearray(TABLE_ENTRIES)
+
+    def lookup(self, rgb):
+        try:
+            index = _RED[rgb[0]] | _GREEN[rgb[1]] | _BLUE[rgb[2]]
+        except (KeyError, TypeError):
+            # not an 8-bit color
+            self.bypassed += 1
+            return _convert(rgb)
+
+        table = self._table
+        offset = 3 * index
+        filled = self._filled
+        if filled is not None and not filled[index]:
+            self.misses += 1
+            lab = _convert(rgb)
+            table[offset], table[offset + 1], table[offset + 2] = lab
+            filled[index] = 1
+            self._size += 1
+            return (table[offset], table[offset + 1], table[offset + 2])
+
+        self.hits += 1
+        return (table[offset], table[offset + 1], table[offset + 2])
+
+    def stats(self):
+        return {
+            "mode": self.mode,
+            "hits": self.hits,
+            "misses": self.misses,
+            "bypassed": self.bypassed,
+            "size": TABLE_ENTRIES if self._filled is None else self._size,
+            "maxsize": TABLE_ENTRIES,
+        }
+
+    def clear(self):
+        self.hits = self.misses = self.bypassed = self._size = 0
+        if self._filled is not None:
+            self._filled = bytearray(TABLE_ENTRIES)
+
+    def close(self):
+        if self._mmap is not None:
+            self._table.release()
+            self._mmap.close()
+            self._mmap = None
+
+
+def enable(mode="lru", maxsize=65536, path=None, typecode="d"):
+    """
+    Enable caching for rgb_to_lab. Replaces a cache that is already enabled.
+
+    Args:
+        mode (str): "lru" or "dense".
+        maxsize (int): Number of colors kept by the "lru" cache.
+        path (str): File written by build_table to memory-map for the "dense" cache. Filled lazily in memory if None.
+        typecode (str): Array typecode of the "dense" cache, "d" (float64, exact) or "f" (float32, approximate).
+
+    Raises:
+        ValueError: If the mode is not supported or the table file does not match.
+    """
+    if mode == "lru":
+        cache = _LRUCache(maxsize)
+    elif mode == "dense":
+        cache = _DenseCache(path, typecode)
+    else:
+        msg = "mode must be 'lru' or 'dense'"
+        raise ValueError(msg)
+
+    disable()
+    color_utils._lab_cache = cache
+
+
+def disable():
+    """
+    Disable caching for rgb_to_lab and release the cache.
+    """
+    cache = color_utils._lab_cache
+    color_utils._lab_cache = None
+    if isinstance(cache, _DenseCache):
+        cache.close()
+
+
+def stats() -> dict:
+    """
+    Get the counters of the enabled cache.
+
+    Returns:
+        dict: mode, hits, misses, bypassed (inputs that are not 8-bit colors), size and maxsize. Empty if no cache is
+            enabled.
+    """
+    cache = color_utils._lab_cache
+    return {} if cache is None else cache.stats()
+
+
+def clear():
+    """
+    Drop all cached values of the enabled cache and reset its counters.
+    """
+    cache = color_utils._lab_cache
+    if cache is not None:
+        cache.clear()
+
+
+def build_table(path, typecode="d"):
+    """
+    Write the complete rgb to lab table to a file, for use with enable("dense", path=...).
+
+    The file holds the L, a, b values of all 16.7M colors in rgb order as native float64
+    (or float32 with typecode "f"), so it is only portable between machines of the same byte order.
+
+    Args:
+        path (str): Destination file. Written to a temporary file first and renamed when complete.
+        typecode (str): "d" (float64) or "f" (float32), the typecode passed to enable.
+    """
+    temporary = f"{path}.tmp"
+    with open(temporary, "wb") as file:
+        for red in range(256):
+            chunk = array(typecode)
+            for green in range(256):
+                for blue in range(256):
+                    chunk.extend(_convert((red, green, blue)))
+            chunk.tofile(file)
+    os.replace(temporary, path)
@@ -0,0 +1,275 @@
+"""
+Precomputed colorname lookup tables for 8-bit rgb colors.
+
+rgb_to_colorname only ever sees 2^24 different inputs per naming standard. build()
+runs the regular search (exact hex code match first, then the closest color by
+CIEDE2000) once for every one of them and stores the resulting palette position as a
+uint16, so a table is 32 MB. enable() memory-maps a table and attaches it to the
+loaded palette; from then on rgb_to_colorname and rgb_to_colorname_many name a color
+with a single array read. Without a table they search as before.
+
+    from colortools import lut
+
+    lut.build("meodai")     # once, on all CPU cores
+    lut.enable("meodai")    # in every process that names colors
+
+The table is built one red value (65536 colors) at a time on a process pool. Every
+finished row is flagged in the header, so an interrupted build continues where it
+stopped when build() is called again with the same path.
+
+The header records a fingerprint of the names and hex codes of the palette. enable()
+refuses tables that were built for a different palette, and changing a palette with
+Palette.add or Palette.remove detaches its table.
+
+File layout (little endian):
+
+    header   magic, entry count, SHA-256 fingerprint, one done flag per red value
+    table    uint16 palette position per rgb color in rgb order, 0xFFFF for no name
+"""
+
+import hashlib
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+from colortools import color_utils, compiled, palettes, parallel
+
+MAGIC = b"CTLUT001"
+SUFFIX = ".ctl"
+TABLE_ENTRIES = 1 << 24
+
+# position stored for colors without a name, i.e. no palette color within the CIEDE2000 cutoff
+NO_NAME = 0xFFFF
+
+_HEADER = struct.Struct("<8sI32s256s")
+_TABLE_OFFSET = 512
+_FLAGS_OFFSET = _HEADER.size - 256
+
+
+def default_path(naming_standard):
+    """
+    Get the default table file of a naming standard, next to the compiled palette files.
+    """
+    return os.path.join(compiled.directory(), naming_standard + SUFFIX)
+
+
+def fingerprint(palette) -> bytes:
+    """
+    Get the SHA-256 digest of the names and hex codes of a palette, including the positions of removed entries.
+    """
+    digest = hashlib.sha256()
+    removed = palette._removed
+    for i, (name, hex_code) in enumerate(zip(palette.names, palette.hexes)):
+        if i in removed:
+            digest.update(b"\x00")
+        else:
+            digest.update(f"{name}\x00{hex_code}\x00".encode())
+    return digest.digest()
+
+
+def _row(palette, red):
+    """
+    Get the palette positions of all colors with the given red value, as little endian uint16 bytes.
+    """
+    hex_positions = palette._hex_index()
+    grid = palette.index
+    rgb_to_lab = color_utils.rgb_to_lab
+    row = array("H", bytes(2 * 65536))
+    column_hint = None
+    offset = 0
+    for green in range(256):
+        # neighbouring colors mostly share their closest color, which makes it a cheap starting point
+        hint = column_hint
+        for blue in range(256):
+            positions = hex_positions.get(f"#{red:02x}{green:02x}{blue:02x}")
+            if positions:
+                position = positions[0]
+            else:
+                position, _ = grid.nearest(rgb_to_lab((red, green, blue)), hint=hint)
+            if position is None:
+                row[offset] = NO_NAME
+            else:
+                row[offset] = hint = position
+                if blue == 0:
+                    column_hint = position
+            offset += 1
+    return compiled._little_endian(row).tobytes()
+
+
+def _rows(naming_standard, path, reds):
+    parallel._use_palette(naming_standard, path)
+    palette = palettes.get_palette(naming_standard)
+    return [_row(palette, red) for red in reds]
+
+
+def read_header(path):
+    """
+    Read the header of a table file.
+
+    Returns:
+        dict: count (palette entries), fingerprint and done (number of finished red values).
+
+    Raises:
+        ValueError: If the file is not a colorname lookup table.
+    """
+    with open(path, "rb") as file:
+        data = file.read(_HEADER.size)
+    if len(data) != _HEADER.size or data[:8] != MAGIC or os.path.getsize(path) != _TABLE_OFFSET + 2 * TABLE_ENTRIES:
+        msg = f"{path} is not a colorname lookup table"
+        raise ValueError(msg)
+    _, count, digest, flags = _HEADER.unpack(data)
+    return {"count": count, "fingerprint": digest, "done": sum(flags)}
+
+
+def build(naming_standard="html", path=None, max_workers=None, report=None) -> str:
+    """
+    Compute the colorname lookup table of a naming standard, or finish an interrupted build.
+
+    Args:
+        naming_standard (str): html, html-ger, x11, color-meanings.com, meodai or a registered custom palette.
+        path (str): Table file. Defaults to default_path(naming_standard).
+        max_workers (int): Number of worker processes. Defaults to the number of CPUs.
+        report (function): Called with the number of finished red values (out of 256) after each one.
+
+    Returns:
+        str: The path of the table file.
+
+    Raises:
+        ValueError: If the naming standard does not exist or has too many entries for uint16 positions.
+    """
+    palette = palettes.get_palette(naming_standard)
+    if len(palette.names) >= NO_NAME:
+        msg = f"{naming_standard} has too many entries for a lookup table"
+        raise ValueError(msg)
+    path = path or default_path(naming_standard)
+    digest = fingerprint(palette)
+
+    flags = bytearray(256)
+    try:
+        header = read_header(path)
+    except (OSError, ValueError):
+        header = None
+    if header is not None and (header["count"], header["fingerprint"]) == (len(palette.names), digest):
+        with open(path, "rb") as file:
+            flags[:] = file.read(_HEADER.size)[_FLAGS_OFFSET:]
+    else:
+        with open(path, "wb") as file:
+            file.write(_HEADER.pack(MAGIC, len(palette.names), digest, bytes(flags)))
+            file.truncate(_TABLE_OFFSET + 2 * TABLE_ENTRIES)
+
+    # workers read the palette from a compiled file, which leaves out removed entries
+    live = list(palette.positions()) if palette._removed else None
+    pending = [red for red in range(256) if not flags[red]]
+    with parallel.BatchExecutor(max_workers, chunk_size=1) as executor, open(path, "r+b") as file:
+        rows = executor.map(_rows, pending, naming_standard, executor._palette_file(naming_standard))
+        for red, row in zip(pending, rows):
+            data = row
+            if live is not None:
+                values = compiled._from_little_endian("H", row)
+                data = compiled._little_endian(
+                    array("H", [NO_NAME if value == NO_NAME else live[value] for value in values])
+                ).tobytes()
+            file.seek(_TABLE_OFFSET + 2 * 65536 * red)
+            file.write(data)
+            file.flush()
+            os.fsync(file.fileno())
+            # flag the row only once its values are on disk
+            flags[red] = 1
+            file.seek(_FLAGS_OFFSET + red)
+            file.write(b"\x01")
+            file.flush()
+            if report is not None:
+                report(sum(flags))
+    return path
+
+
+class LookupTable:
+    """
+    A complete colorname lookup table, memory-mapped read-only.
+
+    Args:
+        path (str): Table file written by build().
+
+    Raises:
+        ValueError: If the file is not a lookup table or its build has not finished.
+    """
+
+    def __init__(self, path):
+        header = read_header(path)
+        if header["done"] != 256:
+            msg = f"{path} is incomplete, finish it with lut.build()"
+            raise ValueError(msg)
+        self.path = path
+        self.count = header["count"]
+        self.fingerprint = header["fingerprint"]
+        with open(path, "rb") as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self._mmap)[_TABLE_OFFSET:]
+        if sys.byteorder == "little":
+            self._table = view.cast("H")
+        else:  # no cov
+            self._table = compiled._from_little_endian("H", view)
+
+    def position(self, rgb):
+        """
+        Get the palette position of the closest color name for a validated 8-bit rgb tuple, or None.
+        """
+        position = self._table[(rgb[0] << 16) | (rgb[1] << 8) | rgb[2]]
+        return None if position == NO_NAME else position
+
+    def close(self):
+        """
+        Release the memory map.
+        """
+        if self._mmap is not None:
+            if isinstance(self._table, memoryview):
+                self._table.release()
+            self._mmap.close()
+            self._mmap = None
+
+
+def enable(naming_standard="html", path=None) -> LookupTable:
+    """
+    Attach a lookup table to a naming standard, replacing a table attached before.
+
+    Args:
+        naming_standard (str): html, html-ger, x11, color-meanings.com, meodai or a registered custom palette.
+        path (str): Table file written by build(). Defaults to default_path(naming_standard).
+
+    Returns:
+        LookupTable: The attached table.
+
+    Raises:
+        ValueError: If the table is incomplete or was built for a different palette.
+    """
+    palette = palettes.get_palette(naming_standard)
+    table = LookupTable(path or default_path(naming_standard))
+    if (table.count, table.fingerprint) != (len(palette.names), fingerprint(palette)):
+        table.close()
+        msg = f"{table.path} was not built for the current {naming_standard} palette"
+        raise ValueError(msg)
+    disable(naming_standard)
+    palette.lookup_table = table
+    return table
+
+
+def disable(naming_standard="html"):
+    """
+    Detach and close the lookup table of a naming standard, if it has one.
+    """
+    if palettes.is_loaded(naming_standard):
+        palette = palettes.get_palette(naming_standard)
+        table = palette.lookup_table
+        palette.lookup_table = None
+        if table is not None:
+            table.close()
+
+
+if __name__ == "__main__":
+    for standard in sys.argv[1:] or palettes.STANDARDS:
+        written_path = build(
+            standard, report=lambda done: print(f"\r{done}/256", end="", file=sys.stderr)  # noqa: T201
+        )
+        print(f"\r{written_path}")  # noqa: T201
@@ -0,0 +1,185 @@
+"""
+Opt-in instrumentation of the colortools hot paths.
+
+enable() replaces the public functions of colortools.color_utils, and a few internals
+worth watching, with timing wrappers; disable() puts the original functions back. While
+instrumentation is disabled nothing is wrapped, so it costs nothing.
+
+Recorded are the call count, errors and cumulative time per function, the time it took
+to load each naming standard, the exact hex code hit ratio of the colorname lookups and
+the counters of the rgb to lab cache (see colortools.labcache). snapshot() returns all
+of it as plain dicts, ready to be exported to a metrics system:
+
+    from colortools import metrics
+
+    metrics.enable()
+    ...
+    metrics.snapshot()["functions"]["color_utils.hex_to_colorname"]
+    # {'calls': 1200, 'errors': 0, 'seconds': 0.41, 'mean_seconds': 0.00034}
+
+Only calls through the module attributes are seen, e.g. color_utils.hex_to_rgb(...) or
+calls inside color_utils. Functions imported with "from colortools.color_utils import
+..." before enable() keep calling the uninstrumented functions. Times are inclusive, so
+hex_to_colorname includes the hex_to_rgb calls it makes.
+"""
+
+import functools
+import threading
+import time
+
+from colortools import color_utils, compiled, labcache, palettes
+
+# internals that are recorded besides the public functions of color_utils
+_INTERNALS = (
+    (color_utils, "color_utils", "_closest_colorname"),
+    (palettes, "palettes", "_read_csv"),
+    (compiled, "compiled", "load_standard"),
+    (palettes, "palettes", "_build_index"),
+    (palettes, "palettes", "_build_name_index"),
+)
+
+_lock = threading.Lock()
+_patched: list = []
+_functions: dict = {}
+_loads: dict = {}
+_hex_lookups = [0, 0]
+
+
+def _timed(key, function):
+    stats = _functions.setdefault(key, [0, 0, 0.0])
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        failed = True
+        try:
+            result = function(*args, **kwargs)
+            failed = False
+            return result
+        finally:
+            elapsed = time.perf_counter() - start
+            with _lock:
+                stats[0] += 1
+                stats[1] += failed
+                stats[2] += elapsed
+
+    return wrapper
+
+
+def _recording_get_palette(function):
+    @functools.wraps(function)
+    def get_palette(naming_standard="html"):
+        if palettes.is_loaded(naming_standard):
+            return function(naming_standard)
+        start = time.perf_counter()
+        palette = function(naming_standard)
+        elapsed = time.perf_counter() - start
+        with _lock:
+            _loads[naming_standard] = {"seconds": elapsed, "entries": len(palette)}
+        return palette
+
+    return get_palette
+
+
+def _recording_find_hex(function):
+    @functools.wraps(function)
+    def find_hex(self, hex_code):
+        position = function(self, hex_code)
+        with _lock:
+            _hex_lookups[position is None] += 1
+        return position
+
+    return find_hex
+
+
+def _patch(owner, attribute, replacement):
+    _patched.append((owner, attribute, getattr(owner, attribute)))
+    setattr(owner, attribute, replacement)
+
+
+def enable():
+    """
+    Start recording. Calling it while enabled does nothing.
+    """
+    with _lock:
+        if _patched:
+            return
+        targets = [
+            (color_utils, "color_utils", name)
+            for name in dir(color_utils)
+            if not name.startswith("_")
+            and callable(getattr(color_utils, name))
+            and getattr(getattr(color_utils, name), "__module__", None) == color_utils.__name__
+        ]
+        for owner, prefix, name in targets + list(_INTERNALS):
+            _patch(owner, name, _timed(f"{prefix}.{name}", getattr(owner, name)))
+        _patch(palettes, "get_palette", _recording_get_palette(palettes.get_palette))
+        _patch(palettes.Palette, "find_hex", _recording_find_hex(palettes.Palette.find_hex))
+
+
+def disable():
+    """
+    Stop recording and restore the original functions. The recorded values are kept until reset().
+    """
+    with _lock:
+        while _patched:
+            owner, attribute, original = _patched.pop()
+            setattr(owner, attribute, original)
+
+
+def is_enabled() -> bool:
+    """
+    Check whether instrumentation is enabled.
+    """
+    return bool(_patched)
+
+
+def reset():
+    """
+    Drop all recorded values.
+    """
+    with _lock:
+        for stats in _functions.values():
+            stats[:] = [0, 0, 0.0]
+        _loads.clear()
+        _hex_lookups[:] = [0, 0]
+
+
+def snapshot() -> dict:
+    """
+    Get the recorded values.
+
+    Returns:
+        dict: with the keys
+            - functions: calls, errors, seconds (cumulative) and mean_seconds by qualified function name, for
+              functions that were called,
+            - palette_loads: seconds and entries by naming standard, for standards loaded while enabled,
+            - caches: hits, misses and hit_ratio of the exact hex code lookups ("hex_lookup") and the rgb to lab
+              cache counters ("lab", empty if no cache is enabled).
+    """
+    with _lock:
+        functions = {
+            key: {"calls": calls, "errors": errors, "seconds": seconds, "mean_seconds": seconds / calls}
+            for key, (calls, errors, seconds) in sorted(_functions.items())
+            if calls
+        }
+        loads = {standard: dict(load) for standard, load in _loads.items()}
+        hits, misses = _hex_lookups
+
+    lab = labcache.stats()
+    if lab:
+        looked_up = lab["hits"] + lab["misses"]
+        lab["hit_ratio"] = lab["hits"] / looked_up if looked_up else 0.0
+    return {
+        "enabled": is_enabled(),
+        "functions": functions,
+        "palette_loads": loads,
+        "caches": {
+            "hex_lookup": {
+                "hits": hits,
+                "misses": misses,
+                "hit_ratio": hits / (hits + misses) if hits + misses else 0.0,
+            },
+            "lab": lab,
+        },
+    }
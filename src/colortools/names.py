@@ -0,0 +1,143 @@
+"""
+Case-insensitive index over the color names of a palette.
+
+Supports exact lookups in constant time, prefix lookups through a sorted key list and
+fuzzy lookups through a trigram index, which is built on the first fuzzy lookup. Names
+are compared in lower case, like colorname_to_hex always did.
+"""
+
+from bisect import bisect_left, insort
+from collections import Counter
+
+
+def _trigrams(key):
+    padded = f"  {key} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+class NameIndex:
+    """
+    Index over color names, identified by their position in the palette.
+
+    Args:
+        names (iterable): The color names in palette order, or a dict of names by position.
+    """
+
+    def __init__(self, names=()):
+        self._exact = {}
+        self._sorted = []
+        self._trigrams = None
+        self._sizes = None
+        self._keys = {}
+        entries = names.items() if isinstance(names, dict) else enumerate(names)
+        for position, name in entries:
+            self._index(position, name)
+        self._sorted.sort()
+
+    def __len__(self):
+        return len(self._keys)
+
+    def _index(self, position, name):
+        """
+        Index a name. Its key is appended to the end of the sorted key list.
+        """
+        key = name.lower()
+        self._keys[position] = key
+        insort(self._exact.setdefault(key, []), position)
+        self._sorted.append((key, position))
+        if self._trigrams is not None:
+            self._add_trigrams(position, key)
+        return key
+
+    def _add_trigrams(self, position, key):
+        trigrams = _trigrams(key)
+        self._sizes[position] = len(trigrams)
+        for trigram in trigrams:
+            self._trigrams.setdefault(trigram, set()).add(position)
+
+    def add(self, position, name):
+        """
+        Add a name at the given palette position.
+        """
+        key = self._index(position, name)
+        # _index appended the key, move it to its sorted place
+        self._sorted.pop()
+        insort(self._sorted, (key, position))
+
+    def remove(self, position):
+        """
+        Remove the name at the given palette position.
+        """
+        key = self._keys.pop(position)
+        positions = self._exact[key]
+        positions.remove(position)
+        if not positions:
+            del self._exact[key]
+        del self._sorted[bisect_left(self._sorted, (key, position))]
+        if self._trigrams is not None:
+            del self._sizes[position]
+            for trigram in _trigrams(key):
+                members = self._trigrams[trigram]
+                members.discard(position)
+                if not members:
+                    del self._trigrams[trigram]
+
+    def find(self, name):
+        """
+        Get the first position whose name matches case-insensitively, or None.
+        """
+        positions = self._exact.get(name.lower())
+        return positions[0] if positions else None
+
+    def prefix(self, prefix, limit=10) -> list:
+        """
+        Get the positions of names starting with prefix, in alphabetical order.
+
+        Args:
+            prefix (str): Start of the name, case-insensitive.
+            limit (int): Maximum number of results, None for all.
+
+        Returns:
+            list: Palette positions.
+        """
+        prefix = prefix.lower()
+        result: list = []
+        for key, position in self._sorted[bisect_left(self._sorted, (prefix, -1)) :]:
+            if not key.startswith(prefix) or (limit is not None and len(result) >= limit):
+                break
+            result.append(position)
+        return result
+
+    def fuzzy(self, query, limit=10, min_score=0.3) -> list:
+        """
+        Get the positions of the names most similar to query.
+
+        Similarity is the Dice coefficient of the trigram sets of both names, case-insensitive.
+
+        Args:
+            query (str): Name to search for.
+            limit (int): Maximum number of results.
+            min_score (float): Minimum similarity in the range [0, 1].
+
+        Returns:
+            list: (position, score) tuples, best match first.
+        """
+        if self._trigrams is None:
+            self._trigrams = {}
+            self._sizes = {}
+            for position, key in self._keys.items():
+                self._add_trigrams(position, key)
+
+        query_trigrams = _trigrams(query.lower())
+        shared: Counter = Counter()
+        for trigram in query_trigrams:
+            shared.update(self._trigrams.get(trigram, ()))
+
+        sizes = self._sizes
+        scored = []
+        for position, count in shared.items():
+            score = 2 * count / (len(query_trigrams) + sizes[position])
+            if score >= min_score:
+                scored.append((-score, position))
+        scored.sort()
+        return [(position, -score) for score, position in scored[:limit]]
@@ -0,0 +1,278 @@
+"""
+Nearest color search over a uniform grid in LAB space.
+
+Candidates are pruned with a lower bound of the CIEDE2000 difference that only needs
+the CIE76 components (delta L and the euclidean distance in the a/b plane). Only the
+colors that survive the bound are compared with the full CIEDE2000 formula, so the
+result is exactly the one a linear scan would return. k_nearest applies the same bound
+to the k best colors, and the exact euclidean bound for CIE76.
+"""
+
+import heapq
+import math
+
+# rough volume of the sRGB gamut in LAB, used to pick a cell size from the palette size
+_GAMUT_VOLUME = 820000.0
+
+# relative slack for the pruning bounds so floating point rounding can never drop a candidate
+_EPSILON = 1e-9
+
+
+def _bound_limit(diff):
+    return diff * (1 + _EPSILON) + _EPSILON
+
+
+class LabGrid:
+    """
+    Uniform grid index over a sequence of LAB colors.
+
+    Args:
+        labs (sequence): LAB tuples, e.g. the labs of a palette.
+        cell_size (float): Edge length of a grid cell. Derived from the number of colors if None.
+        positions (iterable): Indices of the labs to index. Defaults to all of them.
+    """
+
+    def __init__(self, labs, cell_size=None, positions=None):
+        if positions is None:
+            positions = range(len(labs))
+        elif not isinstance(positions, (list, range)):
+            positions = list(positions)
+        if cell_size is None:
+            cell_size = max(2.0, 1.5 * (_GAMUT_VOLUME / max(len(positions), 1)) ** (1.0 / 3.0))
+        self.labs = labs
+        self.cell_size = cell_size
+        self.chromas = [math.sqrt(lab[1] ** 2 + lab[2] ** 2) for lab in labs]
+        self.cells = {}
+        self.size = 0
+        for i in positions:
+            self.cells.setdefault(self._cell(labs[i]), []).append(i)
+            self.size += 1
+
+    @classmethod
+    def from_cells(cls, labs, cell_size, chromas, cells):
+        """
+        Create a grid from a previously built cell assignment, e.g. one stored in a compiled palette file.
+
+        Args:
+            labs (sequence): LAB tuples.
+            cell_size (float): Edge length of a grid cell.
+            chromas (sequence): Chroma of every LAB tuple.
+            cells (dict): Lists of indices keyed by cell coordinates.
+        """
+        grid = cls.__new__(cls)
+        grid.labs = labs
+        grid.cell_size = cell_size
+        grid.chromas = chromas
+        grid.cells = cells
+        grid.size = sum(len(members) for members in cells.values())
+        return grid
+
+    def __len__(self):
+        return self.size
+
+    def add(self, index):
+        """
+        Index the color labs[index], e.g. after it was appended to the labs.
+        """
+        lab = self.labs[index]
+        chroma = math.sqrt(lab[1] ** 2 + lab[2] ** 2)
+        if index < len(self.chromas):
+            self.chromas[index] = chroma
+        else:
+            self.chromas.append(chroma)
+        self.cells.setdefault(self._cell(lab), []).append(index)
+        self.size += 1
+
+    def remove(self, index):
+        """
+        Drop the color labs[index] from the index. Call it before the lab value is changed.
+        """
+        cell = self._cell(self.labs[index])
+        members = self.cells[cell]
+        members.remove(index)
+        if not members:
+            del self.cells[cell]
+        self.size -= 1
+
+    def _cell(self, lab):
+        size = self.cell_size
+        return (math.floor(lab[0] / size), math.floor(lab[1] / size), math.floor(lab[2] / size))
+
+    def _box(self, lab, radius_l, radius_ab):
+        """
+        Yield the indices of all colors in cells intersecting the given box around lab.
+        """
+        size = self.cell_size
+        cells = self.cells
+        l_range = range(math.floor((lab[0] - radius_l) / size), math.floor((lab[0] + radius_l) / size) + 1)
+        a_range = range(math.floor((lab[1] - radius_ab) / size), math.floor((lab[1] + radius_ab) / size) + 1)
+        b_range = range(math.floor((lab[2] - radius_ab) / size), math.floor((lab[2] + radius_ab) / size) + 1)
+
+        if len(l_range) * len(a_range) * len(b_range) >= len(cells):
+            # the box covers more cells than are occupied, walk the occupied ones instead
+            for (cl, ca, cb), members in cells.items():
+                if cl in l_range and ca in a_range and cb in b_range:
+                    yield from members
+            return
+
+        for cl in l_range:
+            for ca in a_range:
+                for cb in b_range:
+                    members = cells.get((cl, ca, cb))
+                    if members is not None:
+                        yield from members
+
+    def nearest(self, lab, max_diff=101, hint=None):
+        """
+        Find the color with the smallest CIEDE2000 difference to lab.
+
+        Ties are resolved in favour of the lowest index, like a linear scan using a strict comparison.
+
+        Args:
+            lab (tuple): LAB tuple to search for.
+            max_diff (float): Only colors with a difference below this value are considered.
+            hint (int): Index of a color that is likely close, e.g. the result for a neighbouring color. It replaces
+                the search of the surrounding cells. The result is the same, only faster if the hint is good.
+
+        Returns:
+            tuple: (index, difference) of the closest color, or (None, max_diff) if no color is close enough.
+        """
+        labs = self.labs
+        chromas = self.chromas
+        l1, a1, b1 = lab
+        c1 = math.sqrt(a1**2 + b1**2)
+
+        best_index = None
+        best_diff = max_diff
+
+        # seed the search with the hint or the surrounding cells
+        size = self.cell_size
+        seeded = set()
+        for i in self._box(lab, size, size) if hint is None else (hint,):
+            seeded.add(i)
+            diff = ciede2000(lab, labs[i])
+            if diff < best_diff or (diff == best_diff and best_index is not None and i < best_index):
+                best_index = i
+                best_diff = diff
+
+        # any color that could beat best_diff lies within this box:
+        # delta E >= |delta L| and delta E >= delta ab / SC with SC = 1 + 0.045 * mean chroma
+        limit = _bound_limit(best_diff)
+        if 0.0225 * limit < 1:
+            radius_ab = limit * (1 + 0.045 * c1) / (1 - 0.0225 * limit)
+            candidates = self._box(lab, limit, radius_ab)
+        else:
+            candidates = (i for members in self.cells.values() for i in members)
+
+        for i in candidates:
+            if i in seeded:
+                continue
+            l2, a2, b2 = labs[i]
+            delta_l = l1 - l2
+            delta_ab_sq = (a1 - a2) ** 2 + (b1 - b2) ** 2
+            sc = 1 + 0.0225 * (c1 + chromas[i])
+            if delta_l * delta_l + delta_ab_sq / (sc * sc) > limit * limit:
+                continue
+            diff = ciede2000(lab, labs[i])
+            if diff < best_diff or (diff == best_diff and best_index is not None and i < best_index):
+                best_index = i
+                best_diff = diff
+                limit = _bound_limit(best_diff)
+
+        return best_index, best_diff
+
+    def _bounds(self, lab, limit, metric):
+        """
+        Get the (L, a/b) radii of the box holding every color within limit, or None if the box is unbounded.
+        """
+        if metric == "cie76":
+            return limit, limit
+        if 0.0225 * limit < 1:
+            c1 = math.sqrt(lab[1] ** 2 + lab[2] ** 2)
+            return limit, limit * (1 + 0.045 * c1) / (1 - 0.0225 * limit)
+        return None
+
+    def k_nearest(self, lab, k, max_diff=None, metric="ciede2000") -> list:
+        """
+        Find the k colors with the smallest difference to lab.
+
+        The search box shrinks as soon as k candidates are known, so small values of k cost about as much as a
+        single nearest lookup. Ties are resolved in favour of the lower index.
+
+        Args:
+            lab (tuple): LAB tuple to search for.
+            k (int): Number of colors.
+            max_diff (float): Only colors with a difference of at most this value are returned. None for no limit.
+            metric (str): "ciede2000", "cie76" or "cie94". cie94 has no usable bound and scans every color.
+
+        Returns:
+            list: Up to k (index, difference) tuples, closest first.
+        """
+        if k < 1 or self.size == 0:
+            return []
+        max_diff = math.inf if max_diff is None else max_diff
+        if metric == "cie94":
+            scored = ((cie94(lab, self.labs[i]), i) for members in self.cells.values() for i in members)
+            return [(i, diff) for diff, i in heapq.nsmallest(k, (item for item in scored if item[0] <= max_diff))]
+
+        difference = cie76 if metric == "cie76" else ciede2000
+        labs = self.labs
+        chromas = self.chromas
+        l1, a1, b1 = lab
+        c1 = math.sqrt(a1**2 + b1**2)
+        # the k best so far as (-difference, -index), the worst one on top
+        best: list = []
+        seen = set()
+        limit = _bound_limit(max_diff)
+
+        def consider(i):
+            nonlocal limit
+            l2, a2, b2 = labs[i]
+            delta_l = l1 - l2
+            delta_ab_sq = (a1 - a2) ** 2 + (b1 - b2) ** 2
+            if metric == "cie76":
+                bound_sq = delta_l * delta_l + delta_ab_sq
+            else:
+                sc = 1 + 0.0225 * (c1 + chromas[i])
+                bound_sq = delta_l * delta_l + delta_ab_sq / (sc * sc)
+            if bound_sq > limit * limit:
+                return
+            diff = difference(lab, labs[i])
+            if diff > max_diff:
+                return
+            if len(best) < k:
+                heapq.heappush(best, (-diff, -i))
+            elif (diff, i) < (-best[0][0], -best[0][1]):
+                heapq.heapreplace(best, (-diff, -i))
+            else:
+                return
+            if len(best) == k:
+                limit = _bound_limit(-best[0][0])
+
+        # seed with growing boxes around lab until k colors are known or the box holds all candidates
+        outer = self._bounds(lab, limit, metric) if limit != math.inf else None
+        radius = self.cell_size
+        while True:
+            for i in self._box(lab, radius, radius):
+                if i not in seen:
+                    seen.add(i)
+                    consider(i)
+            if len(best) == k or len(seen) >= self.size or (outer is not None and radius >= max(outer)):
+                break
+            radius *= 2
+
+        # any color that could beat the kth best lies within this box
+        radii = self._bounds(lab, limit, metric) if limit != math.inf else None
+        if radii is None:
+            candidates = (i for members in self.cells.values() for i in members)
+        else:
+            candidates = self._box(lab, radii[0], radii[1])
+        for i in candidates:
+            if i not in seen:
+                consider(i)
+
+        return [(-index, -diff) for diff, index in sorted(best, reverse=True)]
+
+
+# imported last: color_utils loads the palette registry, which needs LabGrid defined
+from colortools.color_utils import cie76, cie94, ciede2000  # noqa: E402
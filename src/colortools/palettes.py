@@ -0,0 +1,423 @@
+"""
+In-memory registry of the color naming standards shipped in colortools/data and of
+custom palettes registered at runtime.
+
+Every standard is loaded the first time it is requested and kept for the lifetime of
+the process, together with the RGB and LAB values of each entry. An up-to-date compiled
+file (see colortools.compiled) is memory-mapped if there is one, otherwise the CSV file
+is parsed.
+
+Custom palettes are registered with register_palette and can then be used as the
+naming_standard of every colorname function. Entries can be added and removed
+afterwards, which updates the nearest color and name indexes in place. save_palette
+writes a palette together with its nearest color index to a compiled file, which
+register_palette opens again without converting or indexing anything.
+"""
+
+import csv
+import os
+import threading
+from bisect import insort
+from importlib.resources import files
+
+from colortools import compiled
+from colortools.color_utils import hex_to_rgb, rgb_to_xyz, xyz_to_lab
+from colortools.names import NameIndex
+from colortools.nearest import LabGrid
+
+STANDARDS = ("html", "html-ger", "x11", "color-meanings.com", "meodai")
+
+_palettes: dict = {}
+_custom: set = set()
+_lock = threading.RLock()
+
+
+def _lab(rgb):
+    """
+    Convert a palette color to lab without colortools.labcache, whose float32 values would change search results.
+    """
+    return xyz_to_lab(rgb_to_xyz(rgb))
+
+
+class Palette:
+    """
+    A loaded color naming standard.
+
+    Entries keep the order of the CSV file. If a name appears more than once, the
+    first position is kept together with the last hex code, like a dict built from the rows.
+
+    Removed entries stay in the lists as tombstones, so the positions of all other
+    entries never change. Use positions() to iterate over the entries in use. Changes
+    are not synchronized with concurrent lookups from other threads.
+
+    Attributes:
+        name (str): Name of the naming standard.
+        names (list): Color names.
+        hexes (list): Hex codes exactly as written in the source.
+        rgbs (list): RGB tuples.
+        labs (list): LAB tuples.
+        lookup_table (LookupTable): Precomputed rgb colorname table, see colortools.lut. Dropped on changes.
+
+    Args:
+        index (LabGrid): A prebuilt nearest color index over labs, e.g. read from a compiled file.
+    """
+
+    def __init__(self, name, names, hexes, rgbs=None, labs=None, index=None):
+        self.name = name
+        self.names = names
+        self.hexes = hexes
+        self.rgbs = rgbs if rgbs is not None else [hex_to_rgb(hex_code) for hex_code in hexes]
+        self.labs = labs if labs is not None else [_lab(rgb) for rgb in self.rgbs]
+        self._removed = set()
+        self._index = index
+        self._indexed_size = len(index) if index is not None else 0
+        self._name_index = None
+        self._hex_positions = None
+        self._name_positions = None
+        # precomputed rgb to position table, see colortools.lut
+        self.lookup_table = None
+
+    @property
+    def index(self) -> LabGrid:
+        """
+        Nearest color index over the LAB values, built on first use.
+        """
+        if self._index is None:
+            self._index = _build_index(self)
+            self._indexed_size = len(self)
+        return self._index
+
+    @property
+    def name_index(self) -> NameIndex:
+        """
+        Case-insensitive name index, built on first use.
+        """
+        if self._name_index is None:
+            self._name_index = _build_name_index(self)
+        return self._name_index
+
+    def positions(self):
+        """
+        Iterate over the positions of the entries that have not been removed.
+        """
+        removed = self._removed
+        return (i for i in range(len(self.names)) if i not in removed)
+
+    def _hex_index(self):
+        if self._hex_positions is None:
+            positions = {}
+            for i in self.positions():
+                positions.setdefault(self.hexes[i], []).append(i)
+            self._hex_positions = positions
+        return self._hex_positions
+
+    def _name_lookup(self):
+        if self._name_positions is None:
+            positions = {}
+            for i in self.positions():
+                positions.setdefault(self.names[i], i)
+            self._name_positions = positions
+        return self._name_positions
+
+    def find_hex(self, hex_code):
+        """
+        Get the position of the first entry whose hex code is exactly hex_code, or None.
+        """
+        positions = self._hex_index().get(hex_code)
+        return positions[0] if positions else None
+
+    def nearest(self, lab, max_diff=101):
+        """
+        Get (position, CIEDE2000 difference) of the entry closest to lab, see LabGrid.nearest.
+        """
+        return self.index.nearest(lab, max_diff)
+
+    def k_nearest(self, lab, k, max_diff=None, metric="ciede2000"):
+        """
+        Get (position, difference) of the k entries closest to lab, see LabGrid.k_nearest.
+        """
+        return self.index.k_nearest(lab, k, max_diff, metric)
+
+    def _make_mutable(self):
+        """
+        Copy memory-mapped entries and index cells into lists before the first change.
+        """
+        if type(self.names) is not list:
+            self.names = list(self.names)
+            self.hexes = list(self.hexes)
+            self.rgbs = list(self.rgbs)
+            self.labs = list(self.labs)
+            if self._index is not None:
+                self._index.labs = self.labs
+                self._index.chromas = list(self._index.chromas)
+                self._index.cells = {cell: list(members) for cell, members in self._index.cells.items()}
+
+    def add(self, name, hex_code) -> int:
+        """
+        Add a color, or change the hex code of an existing name.
+
+        The nearest color, name and hex code indexes are updated in place.
+
+        Args:
+            name (str): Color name.
+            hex_code (str): Hex code of the color.
+
+        Returns:
+            int: Position of the entry.
+
+        Raises:
+            ValueError: If the hex code is invalid.
+        """
+        rgb = hex_to_rgb(hex_code)
+        lab = _lab(rgb)
+        self._make_mutable()
+        self.lookup_table = None
+        hex_positions = self._hex_index()
+        position = self._name_lookup().get(name)
+
+        if position is None:
+            position = len(self.names)
+            self.names.append(name)
+            self.hexes.append(hex_code)
+            self.rgbs.append(rgb)
+            self.labs.append(lab)
+            self._name_positions[name] = position
+            hex_positions.setdefault(hex_code, []).append(position)
+            if self._name_index is not None:
+                self._name_index.add(position, name)
+        else:
+            if self._index is not None:
+                self._index.remove(position)
+            old = hex_positions[self.hexes[position]]
+            old.remove(position)
+            if not old:
+                del hex_positions[self.hexes[position]]
+            insort(hex_positions.setdefault(hex_code, []), position)
+            self.hexes[position] = hex_code
+            self.rgbs[position] = rgb
+            self.labs[position] = lab
+
+        if self._index is not None:
+            self._index.add(position)
+            # the cell size fits the size the grid was built for, start over once the palette has grown a lot
+            if len(self) > 2 * self._indexed_size + 64:
+                self._index = None
+        return position
+
+    def remove(self, name) -> int:
+        """
+        Remove a color by its exact name. Its position is left as a tombstone.
+
+        Args:
+            name (str): Color name.
+
+        Returns:
+            int: The former position of the entry.
+
+        Raises:
+            ValueError: If the palette has no color with this name.
+        """
+        position = self._name_lookup().get(name)
+        if position is None:
+            msg = f"{name!r} is not in palette {self.name!r}"
+            raise ValueError(msg)
+
+        self._make_mutable()
+        del self._name_positions[name]
+        hex_positions = self._hex_index()[self.hexes[position]]
+        hex_positions.remove(position)
+        if not hex_positions:
+            del self._hex_positions[self.hexes[position]]
+        if self._index is not None:
+            self._index.remove(position)
+        if self._name_index is not None:
+            self._name_index.remove(position)
+        self._removed.add(position)
+        self.lookup_table = None
+        return position
+
+    def __len__(self):
+        return len(self.names) - len(self._removed)
+
+    def __contains__(self, name):
+        return name in self._name_lookup()
+
+    def __repr__(self):
+        return f"Palette({self.name!r}, {len(self)} colors)"
+
+
+def _build_index(palette) -> LabGrid:
+    return LabGrid(palette.labs, positions=palette.positions() if palette._removed else None)
+
+
+def _build_name_index(palette) -> NameIndex:
+    if palette._removed:
+        return NameIndex({i: palette.names[i] for i in palette.positions()})
+    return NameIndex(palette.names)
+
+
+def _validate_standard(naming_standard):
+    if naming_standard not in STANDARDS and naming_standard not in _custom:
+        raise ValueError("naming_standard input is not a valid option")
+
+
+def _read_csv_file(path, name):
+    """
+    Read a palette from a CSV file with name and hex code columns.
+    """
+    color_dict = {}
+    with open(path, mode='r') as file:
+        reader = csv.reader(file)
+        for row in reader:
+            color_dict[row[0]] = row[1]
+    return Palette(name, list(color_dict.keys()), list(color_dict.values()))
+
+
+def _read_csv(naming_standard):
+    """
+    Read a naming standard from its CSV file.
+    """
+    return _read_csv_file(files("colortools") / "data" / f"{naming_standard}.csv", naming_standard)
+
+
+def get_palette(naming_standard="html") -> Palette:
+    """
+    Get a naming standard, loading it on first use.
+
+    Args:
+        naming_standard (str): html, html-ger, x11, color-meanings.com, meodai or a registered custom palette.
+
+    Returns:
+        Palette: The loaded palette.
+
+    Raises:
+        ValueError: If the naming standard does not exist.
+    """
+    palette = _palettes.get(naming_standard)
+    if palette is not None:
+        return palette
+
+    _validate_standard(naming_standard)
+    with _lock:
+        # another thread may have loaded it while we were waiting
+        palette = _palettes.get(naming_standard)
+        if palette is None:
+            palette = compiled.load_standard(naming_standard)
+            if palette is None:
+                palette = _read_csv(naming_standard)
+            _palettes[naming_standard] = palette
+    return palette
+
+
+def preload(*naming_standards) -> list:
+    """
+    Load naming standards ahead of time, e.g. when a worker starts.
+
+    Args:
+        *naming_standards (str): Standards to load. Loads all standards if none are given.
+
+    Returns:
+        list: The loaded palettes.
+    """
+    return [get_palette(standard) for standard in (naming_standards or STANDARDS)]
+
+
+def invalidate(naming_standard=None):
+    """
+    Drop cached naming standards so they are read again on next use.
+
+    Custom palettes have no source to be read from again and are kept, use unregister_palette to drop them.
+
+    Args:
+        naming_standard (str): Standard to drop. Drops all standards if None.
+    """
+    with _lock:
+        if naming_standard is None:
+            for standard in STANDARDS:
+                _palettes.pop(standard, None)
+        else:
+            _validate_standard(naming_standard)
+            if naming_standard in STANDARDS:
+                _palettes.pop(naming_standard, None)
+
+
+def is_loaded(naming_standard) -> bool:
+    """
+    Check whether a naming standard is currently held in memory.
+    """
+    return naming_standard in _palettes
+
+
+def register_palette(name, colors, *, replace=False) -> Palette:
+    """
+    Register a custom palette, usable as naming_standard in every colorname function.
+
+    Args:
+        name (str): Name of the palette. Must not be the name of a shipped standard.
+        colors: The colors, one of:
+            - an iterable of (color name, hex code) pairs or a dict of hex codes by color name,
+            - the path of a CSV file with color name and hex code columns, like the shipped standards,
+            - the path of a compiled file written by save_palette (suffix .ctp), which is memory-mapped,
+            - a Palette.
+        replace (bool): Replace a custom palette registered under the same name.
+
+    Returns:
+        Palette: The registered palette. Use its add and remove methods for incremental changes.
+
+    Raises:
+        ValueError: If the name is taken or a hex code is invalid.
+    """
+    if name in STANDARDS or (name in _custom and not replace):
+        msg = f"a palette named {name!r} is already registered"
+        raise ValueError(msg)
+
+    if isinstance(colors, Palette):
+        palette = colors
+    elif isinstance(colors, (str, os.PathLike)):
+        path = os.fspath(colors)
+        palette = compiled.load(path, name) if path.endswith(compiled.SUFFIX) else _read_csv_file(path, name)
+    else:
+        color_dict = dict(colors.items() if isinstance(colors, dict) else colors)
+        palette = Palette(name, list(color_dict.keys()), list(color_dict.values()))
+    palette.name = name
+
+    with _lock:
+        _custom.add(name)
+        _palettes[name] = palette
+    return palette
+
+
+def unregister_palette(name):
+    """
+    Remove a custom palette from the registry.
+
+    Raises:
+        ValueError: If no custom palette is registered under this name.
+    """
+    with _lock:
+        if name not in _custom:
+            msg = f"no custom palette named {name!r} is registered"
+            raise ValueError(msg)
+        _custom.discard(name)
+        _palettes.pop(name, None)
+
+
+def save_palette(naming_standard, path):
+    """
+    Write a palette with its nearest color index to a compiled file, see colortools.compiled.
+
+    Removed entries are left out, so the positions in the written file can differ. Opening the
+    file with register_palette is much faster than building the palette from colors again.
+
+    Args:
+        naming_standard (str): Shipped standard or registered custom palette.
+        path (str): Destination file, conventionally with the suffix .ctp.
+    """
+    compiled.write(get_palette(naming_standard), os.fspath(path))
+
+
+def custom_palettes() -> list:
+    """
+    Get the names of the registered custom palettes.
+    """
+    return sorted(_custom)
@@ -0,0 +1,255 @@
+"""
+Multi-core batch execution of colorname lookups and Delta E calculations.
+
+The pure Python CIEDE2000 calculation is CPU bound and holds the GIL, so threads do not
+help. BatchExecutor shards its input into chunks and runs them on a process pool.
+Workers do not parse the CSV files: every palette is opened from a compiled file with
+mmap (see colortools.compiled), so all workers share the same pages. If a standard has
+no up-to-date compiled file, the executor writes one into a temporary directory once.
+Custom palettes are always written this way, so changes made after an executor first
+used a custom palette are not seen by its workers.
+
+Results are yielded in input order as soon as the chunks complete, and only a bounded
+number of chunks is in flight, so arbitrarily long inputs are streamed:
+
+    from colortools.parallel import BatchExecutor
+
+    with BatchExecutor(max_workers=32) as executor:
+        for name in executor.hex_to_colorname(hex_codes, "meodai"):
+            ...
+"""
+
+import os
+import shutil
+import tempfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from colortools import color_utils, compiled, palettes
+
+METRICS = ("ciede2000", "cie76", "cie94")
+
+# palettes opened by this worker process, by naming standard
+_worker_files: dict = {}
+
+
+def _use_palette(naming_standard, path):
+    """
+    Make a worker use the compiled palette file for a naming standard.
+    """
+    if _worker_files.get(naming_standard) != path:
+        palette = compiled.load(path, naming_standard)
+        with palettes._lock:
+            palettes._palettes[naming_standard] = palette
+        _worker_files[naming_standard] = path
+
+
+def _hex_to_colorname(naming_standard, path, hex_colors):
+    _use_palette(naming_standard, path)
+    return color_utils.hex_to_colorname_many(hex_colors, naming_standard)
+
+
+def _rgb_to_colorname(naming_standard, path, rgbs):
+    _use_palette(naming_standard, path)
+    return color_utils.rgb_to_colorname_many(rgbs, naming_standard)
+
+
+def _delta_e(metric, pairs):
+    function = getattr(color_utils, metric)
+    return [function(lab1, lab2) for lab1, lab2 in pairs]
+
+
+def _delta_e_rgb(metric, pairs):
+    function = getattr(color_utils, metric)
+    labs = {}
+    differences = []
+    for rgb1, rgb2 in pairs:
+        lab1 = labs.get(rgb1)
+        if lab1 is None:
+            lab1 = labs[rgb1] = color_utils.rgb_to_lab(rgb1)
+        lab2 = labs.get(rgb2)
+        if lab2 is None:
+            lab2 = labs[rgb2] = color_utils.rgb_to_lab(rgb2)
+        differences.append(function(lab1, lab2))
+    return differences
+
+
+def _validate_metric(metric):
+    if metric not in METRICS:
+        msg = f"metric must be one of {', '.join(METRICS)}"
+        raise ValueError(msg)
+
+
+class BatchExecutor:
+    """
+    Process pool for bulk colorname lookups and Delta E calculations.
+
+    Args:
+        max_workers (int): Number of worker processes. Defaults to the number of CPUs.
+        chunk_size (int): Number of items sent to a worker at once.
+        prefetch (int): Number of chunks in flight per worker.
+        mp_context: multiprocessing context for the pool, e.g. multiprocessing.get_context("spawn").
+    """
+
+    def __init__(self, max_workers=None, chunk_size=2048, prefetch=2, mp_context=None):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.prefetch = prefetch
+        self._pool = ProcessPoolExecutor(self.max_workers, mp_context=mp_context)
+        self._files = {}
+        self._directory = None
+
+    def _palette_file(self, naming_standard):
+        """
+        Get a compiled file workers can open for a naming standard, writing one if needed.
+        """
+        path = self._files.get(naming_standard)
+        if path is None:
+            palettes._validate_standard(naming_standard)
+            path = compiled.standard_path(naming_standard) if naming_standard in palettes.STANDARDS else None
+            if path is None:
+                if self._directory is None:
+                    self._directory = tempfile.mkdtemp(prefix="colortools-")
+                path = os.path.join(self._directory, naming_standard + compiled.SUFFIX)
+                compiled.write(palettes.get_palette(naming_standard), path)
+            self._files[naming_standard] = path
+        return path
+
+    def map(self, function, iterable, *args):
+        """
+        Apply function(*args, chunk) to chunks of iterable on the pool.
+
+        function must be a module level function returning a list with one result per item of the chunk.
+
+        Yields:
+            The results in input order, as soon as their chunk is complete.
+        """
+        iterator = iter(iterable)
+        pending = deque()
+        limit = self.max_workers * self.prefetch
+
+        def submit():
+            chunk = list(islice(iterator, self.chunk_size))
+            if chunk:
+                pending.append(self._pool.submit(function, *args, chunk))
+            return bool(chunk)
+
+        while len(pending) < limit and submit():
+            pass
+        while pending:
+            results = pending.popleft().result()
+            submit()
+            yield from results
+
+    def hex_to_colorname(self, hex_colors, naming_standard="html"):
+        """
+        Find the closest matching color names for many hex colors, see color_utils.hex_to_colorname.
+
+        Args:
+            hex_colors (iterable): Hex color codes.
+            naming_standard (str): html, html-ger, x11, color-meanings.com, meodai.
+
+        Yields:
+            str: Closest matching color names in input order.
+
+        Raises:
+            ValueError: If the naming standard does not exist or a hex code is invalid.
+        """
+        return self.map(_hex_to_colorname, hex_colors, naming_standard, self._palette_file(naming_standard))
+
+    def rgb_to_colorname(self, rgbs, naming_standard="html"):
+        """
+        Find the closest matching color names for many rgb colors, see color_utils.rgb_to_colorname.
+
+        Args:
+            rgbs (iterable): rgb(a) tuples.
+            naming_standard (str): html, html-ger, x11, color-meanings.com, meodai.
+
+        Yields:
+            str: Closest matching color names in input order.
+
+        Raises:
+            ValueError: If the naming standard does not exist or an rgb value is invalid.
+        """
+        return self.map(_rgb_to_colorname, rgbs, naming_standard, self._palette_file(naming_standard))
+
+    def delta_e(self, labs_a, labs_b, metric="ciede2000"):
+        """
+        Calculate the color difference between pairs of lab colors.
+
+        Args:
+            labs_a (iterable): First lab color of each pair.
+            labs_b (iterable): Second lab color of each pair.
+            metric (str): ciede2000, cie76 or cie94.
+
+        Yields:
+            float: Delta E of each pair in input order.
+        """
+        _validate_metric(metric)
+        return self.map(_delta_e, zip(labs_a, labs_b), metric)
+
+    def delta_e_rgb(self, rgbs_a, rgbs_b, metric="ciede2000"):
+        """
+        Calculate the color difference between pairs of rgb colors.
+
+        Args:
+            rgbs_a (iterable): First rgb color of each pair.
+            rgbs_b (iterable): Second rgb color of each pair.
+            metric (str): ciede2000, cie76 or cie94.
+
+        Yields:
+            float: Delta E of each pair in input order.
+        """
+        _validate_metric(metric)
+        return self.map(_delta_e_rgb, zip(rgbs_a, rgbs_b), metric)
+
+    def shutdown(self, *, wait=True):
+        """
+        Stop the worker processes and remove temporary palette files.
+        """
+        self._pool.shutdown(wait=wait)
+        if self._directory is not None:
+            shutil.rmtree(self._directory, ignore_errors=True)
+            self._directory = None
+        self._files.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+
+
+def hex_to_colorname_many(hex_colors, naming_standard="html", max_workers=None, chunk_size=2048) -> list:
+    """
+    Find the closest matching color names for many hex colors on all CPU cores.
+
+    Args:
+        hex_colors (iterable): Hex color codes.
+        naming_standard (str): html, html-ger, x11, color-meanings.com, meodai.
+        max_workers (int): Number of worker processes. Defaults to the number of CPUs.
+        chunk_size (int): Number of colors sent to a worker at once.
+
+    Returns:
+        list: Closest matching color names in input order.
+    """
+    with BatchExecutor(max_workers, chunk_size) as executor:
+        return list(executor.hex_to_colorname(hex_colors, naming_standard))
+
+
+def rgb_to_colorname_many(rgbs, naming_standard="html", max_workers=None, chunk_size=2048) -> list:
+    """
+    Find the closest matching color names for many rgb colors on all CPU cores.
+
+    Args:
+        rgbs (iterable): rgb(a) tuples.
+        naming_standard (str): html, html-ger, x11, color-meanings.com, meodai.
+        max_workers (int): Number of worker processes. Defaults to the number of CPUs.
+        chunk_size (int): Number of colors sent to a worker at once.
+
+    Returns:
+        list: Closest matching color names in input order.
+    """
+    with BatchExecutor(max_workers, chunk_size) as executor:
+        return list(executor.rgb_to_colorname(rgbs, naming_standard))
@@ -0,0 +1,350 @@
+"""
+Streaming conversion of large color datasets.
+
+Records are read lazily from CSV or JSON lines files, converted in chunks with any
+conversion function of colortools.color_utils and written out as they come, so memory
+stays constant regardless of the file size. Colorname conversions load the palette once
+and look up every distinct color of a chunk only once.
+
+    from colortools import stream
+
+    records = stream.read_records("colors.csv")
+    converted = stream.convert_records(records, "hex_to_colorname", column="hex", naming_standard="meodai")
+    stream.write_records(converted, "named.jsonl")
+
+The same pipeline is available on the command line:
+
+    colortools convert hex_to_colorname colors.csv named.jsonl --column hex --naming-standard meodai
+"""
+
+import contextlib
+import csv
+import json
+import os
+import sys
+import time
+from functools import partial
+from itertools import islice
+
+from colortools import color_utils
+
+FORMATS = ("csv", "jsonl")
+ERRORS = ("raise", "null", "skip")
+_SKIP = object()
+# number of components the source models of the tuple conversions accept
+_COMPONENTS = {"cmyk": (4,), "hsl": (3,), "hsv": (3,), "lab": (3,), "rgb": (3, 4), "rgba": (4,), "xyz": (3,)}
+CONVERSIONS = tuple(
+    name
+    for name in sorted(dir(color_utils))
+    if "_to_" in name and not name.startswith("_") and not name.endswith("_many")
+)
+
+
+def _validate_conversion(conversion):
+    if conversion not in CONVERSIONS:
+        msg = f"conversion must be one of {', '.join(CONVERSIONS)}"
+        raise ValueError(msg)
+
+
+def _format_for(path, fmt):
+    if fmt is not None:
+        if fmt not in FORMATS:
+            msg = f"format must be one of {', '.join(FORMATS)}"
+            raise ValueError(msg)
+        return fmt
+    if path.endswith(".csv"):
+        return "csv"
+    if path.endswith((".jsonl", ".ndjson")):
+        return "jsonl"
+    msg = f"cannot tell the format of {path}, pass csv or jsonl"
+    raise ValueError(msg)
+
+
+def _open(path, mode):
+    if path == "-":
+        return sys.stdin if mode == "r" else sys.stdout
+    return open(path, mode, encoding="utf-8", newline="")
+
+
+def read_records(path, fmt=None):
+    """
+    Read records from a CSV or JSON lines file one at a time.
+
+    Args:
+        path (str): The file, "-" for stdin.
+        fmt (str): "csv" or "jsonl". Defaults to the file suffix (.csv, .jsonl or .ndjson).
+
+    Yields:
+        dict: One record per row or line. CSV values are strings.
+    """
+    fmt = _format_for(path, fmt)
+    file = _open(path, "r")
+    try:
+        if fmt == "csv":
+            yield from csv.DictReader(file)
+        else:
+            for line in file:
+                if line.strip():
+                    yield json.loads(line)
+    finally:
+        if file is not sys.stdin:
+            file.close()
+
+
+def write_records(records, path, fmt=None) -> int:
+    """
+    Write records to a CSV or JSON lines file as they come.
+
+    A file is written under a temporary name next to it and only renamed to path once
+    all records are written, so a failing conversion leaves an existing file untouched
+    and no partial output behind.
+
+    Args:
+        records (iterable): dicts. CSV columns are taken from the first record, tuples are written as "a,b,c".
+        path (str): The file, "-" for stdout.
+        fmt (str): "csv" or "jsonl". Defaults to the file suffix (.csv, .jsonl or .ndjson).
+
+    Returns:
+        int: Number of written records.
+    """
+    fmt = _format_for(path, fmt)
+    if path == "-":
+        return _write(records, sys.stdout, fmt)
+
+    temporary = f"{path}.{os.getpid()}.tmp"
+    try:
+        with _open(temporary, "w") as file:
+            count = _write(records, file, fmt)
+        os.replace(temporary, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(temporary)
+        raise
+    return count
+
+
+def _write(records, file, fmt):
+    count = 0
+    if fmt == "csv":
+        writer = None
+        for record in records:
+            if writer is None:
+                writer = csv.DictWriter(file, fieldnames=list(record), extrasaction="ignore")
+                writer.writeheader()
+            writer.writerow(
+                {key: ",".join(map(str, value)) if isinstance(value, tuple) else value for key, value in record.items()}
+            )
+            count += 1
+    else:
+        write = file.write
+        for record in records:
+            write(json.dumps(record, ensure_ascii=False))
+            write("\n")
+            count += 1
+    file.flush()
+    return count
+
+
+def _number(text):
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+
+def _parse(value, source_model):
+    """
+    Turn a field value into the argument of a conversion function.
+
+    Raises:
+        ValueError: If the field is missing, or its type or number of components does not fit the source model.
+    """
+    if value is None:
+        msg = f"missing {source_model} value"
+        raise ValueError(msg)
+    if source_model in ("hex", "colorname"):
+        if not isinstance(value, str):
+            msg = f"{value!r} is not a {source_model} value"
+            raise ValueError(msg)
+        return value
+    if isinstance(value, str):
+        try:
+            parsed = tuple(_number(part) for part in value.strip("()[] ").split(","))
+        except ValueError:
+            msg = f"{value!r} is not a {source_model} value"
+            raise ValueError(msg) from None
+    elif isinstance(value, (list, tuple)):
+        parsed = tuple(value)
+    else:
+        msg = f"{value!r} is not a {source_model} value"
+        raise ValueError(msg)
+    if len(parsed) not in _COMPONENTS[source_model]:
+        msg = f"{value!r} is not a {source_model} value"
+        raise ValueError(msg)
+    return parsed
+
+
+def _converter(conversion, naming_standard):
+    """
+    Get a function converting a list of values of one chunk.
+    """
+    if conversion == "hex_to_colorname":
+        return partial(color_utils.hex_to_colorname_many, naming_standard=naming_standard)
+    if conversion == "rgb_to_colorname":
+        return partial(color_utils.rgb_to_colorname_many, naming_standard=naming_standard)
+
+    function = getattr(color_utils, conversion)
+    if "colorname" in conversion:
+        function = partial(function, naming_standard=naming_standard)
+
+    def convert_chunk(values):
+        results = {}
+        converted = []
+        for value in values:
+            if value not in results:
+                results[value] = function(value)
+            converted.append(results[value])
+        return converted
+
+    return convert_chunk
+
+
+def convert_records(
+    records,
+    conversion,
+    column=None,
+    output_column=None,
+    naming_standard="html",
+    chunk_size=10000,
+    errors="raise",
+    report=None,
+):
+    """
+    Convert a column of records lazily, chunk by chunk.
+
+    Args:
+        records (iterable): dicts, e.g. from read_records.
+        conversion (str): Name of a conversion function of colortools.color_utils, e.g. "hex_to_colorname".
+        column (str): Field holding the input color. Defaults to the source model, e.g. "hex".
+        output_column (str): Field to store the result in. Defaults to the target model, e.g. "colorname".
+        naming_standard (str): Naming standard for colorname conversions.
+        chunk_size (int): Number of records converted together.
+        errors (str): What to do with invalid colors: "raise" a ValueError, store "null" or "skip" the record.
+        report (function): Called with (records, seconds) after every chunk, e.g. a Throughput instance.
+
+    Yields:
+        dict: The records with the result added.
+
+    Raises:
+        ValueError: If the conversion is unknown, or for invalid colors with errors="raise".
+    """
+    _validate_conversion(conversion)
+    if errors not in ERRORS:
+        msg = f"errors must be one of {', '.join(ERRORS)}"
+        raise ValueError(msg)
+    source_model, target_model = conversion.split("_to_")
+    column = column or source_model
+    output_column = output_column or target_model
+    convert_chunk = _converter(conversion, naming_standard)
+
+    records = iter(records)
+    count = 0
+    start = time.perf_counter()
+    while True:
+        chunk = list(islice(records, chunk_size))
+        if not chunk:
+            break
+
+        try:
+            results = convert_chunk([_parse(record.get(column), source_model) for record in chunk])
+        except (ValueError, TypeError):
+            if errors == "raise":
+                raise
+            results = []
+            for record in chunk:
+                try:
+                    results.append(convert_chunk([_parse(record.get(column), source_model)])[0])
+                except (ValueError, TypeError):
+                    results.append(_SKIP if errors == "skip" else None)
+
+        for record, result in zip(chunk, results):
+            if result is _SKIP:
+                continue
+            record[output_column] = result
+            yield record
+
+        count += len(chunk)
+        if report is not None:
+            report(count, time.perf_counter() - start)
+
+
+class Throughput:
+    """
+    Progress reporter for convert_records, printing the record rate at most every interval seconds.
+
+    Args:
+        file: Text stream to write to. Defaults to stderr.
+        interval (float): Minimum seconds between two lines.
+    """
+
+    def __init__(self, file=None, interval=1.0):
+        self.file = file
+        self.interval = interval
+        self.records = 0
+        self.seconds = 0.0
+        self._last = None
+
+    def __call__(self, records, seconds):
+        self.records = records
+        self.seconds = seconds
+        if self._last is None or seconds - self._last >= self.interval:
+            self._last = seconds
+            self.print()
+
+    @property
+    def rate(self):
+        """
+        Records per second so far.
+        """
+        return self.records / self.seconds if self.seconds else 0.0
+
+    def finish(self):
+        """
+        Print the final number of records and the rate, unless the last report already did.
+        """
+        if self._last != self.seconds:
+            self.print()
+
+    def print(self):
+        """
+        Print the current number of records and the rate.
+        """
+        print(
+            f"{self.records:,} records in {self.seconds:.1f} s ({self.rate:,.0f} records/s)",
+            file=self.file or sys.stderr,
+        )
+
+
+def convert_file(src, dst, conversion, src_format=None, dst_format=None, **options) -> int:
+    """
+    Convert a column of a CSV or JSON lines file into a new file.
+
+    Args:
+        src (str): Input file, "-" for stdin.
+        dst (str): Output file, "-" for stdout. stdin and stdout default to the format of the other file.
+        conversion (str): Name of a conversion function of colortools.color_utils.
+        src_format (str): "csv" or "jsonl", defaults to the suffix of src.
+        dst_format (str): "csv" or "jsonl", defaults to the suffix of dst.
+        **options: Passed on to convert_records.
+
+    Returns:
+        int: Number of written records.
+    """
+    # stdin and stdout take the format of the other side
+    if src == "-" and src_format is None:
+        src_format = _format_for(dst, dst_format)
+    if dst == "-" and dst_format is None:
+        dst_format = _format_for(src, src_format)
+
+    records = read_records(src, src_format)
+    return write_records(convert_records(records, conversion, **options), dst, dst_format)
@@ -0,0 +1,51 @@
+import csv
+import functools
+from importlib.resources import files
+
+import pytest
+
+from colortools import color_utils
+
+
+@functools.lru_cache(maxsize=None)
+def _csv_colors(naming_standard):
+    with (files("colortools") / "data" / f"{naming_standard}.csv").open(encoding="utf-8") as file:
+        return {row[0]: row[1] for row in csv.reader(file)}
+
+
+def _scan_colorname(hex_color, naming_standard="html"):
+    # the linear scan colortools did before the palette registry and the LAB grid
+    lab = color_utils.rgb_to_lab(color_utils.hex_to_rgb(hex_color))
+    closest = None
+    min_diff = 101
+    for name, hex_code in _csv_colors(naming_standard).items():
+        if hex_color == hex_code:
+            return name
+        diff = color_utils.ciede2000(lab, color_utils.rgb_to_lab(color_utils.hex_to_rgb(hex_code)))
+        if diff < min_diff:
+            min_diff = diff
+            closest = name
+    return closest
+
+
+def _scan_colorname_to_hex(colorname, naming_standard="html"):
+    for name, hex_code in _csv_colors(naming_standard).items():
+        if colorname.lower() == name.lower():
+            return hex_code
+    return None
+
+
+@pytest.fixture
+def scan_colorname():
+    """
+    Reference hex_to_colorname: a linear scan over the CSV file of a naming standard.
+    """
+    return _scan_colorname
+
+
+@pytest.fixture
+def scan_colorname_to_hex():
+    """
+    Reference colorname_to_hex: a linear scan over the CSV file of a naming standard.
+    """
+    return _scan_colorname_to_hex
@@ -0,0 +1,116 @@
+import asyncio
+import random
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from colortools import aio, color_utils
+from colortools.color import Color
+
+random.seed(16)
+
+
+class _CountingExecutor(ThreadPoolExecutor):
+    def __init__(self):
+        super().__init__(2)
+        self.submitted = 0
+
+    def submit(self, *args, **kwargs):
+        self.submitted += 1
+        return super().submit(*args, **kwargs)
+
+
+@pytest.fixture
+def counting():
+    executor = _CountingExecutor()
+    aio.configure(executor=executor)
+    yield executor
+    aio.configure()
+    executor.shutdown()
+
+
+def test_lookups_match_sync():
+    rgbs = [(random.randrange(256), random.randrange(256), random.randrange(256)) for _ in range(30)]
+    hexes = [color_utils.rgb_to_hex(rgb) for rgb in rgbs]
+
+    async def run():
+        return (
+            await asyncio.gather(*(aio.async_hex_to_colorname(hex_code, "x11") for hex_code in hexes)),
+            await asyncio.gather(*(aio.async_rgb_to_colorname(Color(*rgb)) for rgb in rgbs)),
+            await aio.async_hex_to_colorname_many(iter(hexes), "x11"),
+            await aio.async_rgb_to_colorname_many([list(rgb) for rgb in rgbs]),
+            await aio.async_colorname_to_hex("red"),
+            await aio.async_colorname_to_rgb("no such color"),
+        )
+
+    try:
+        names, rgb_names, many, rgb_many, hex_code, rgb = asyncio.run(run())
+    finally:
+        aio.shutdown()
+    assert names == many == [color_utils.hex_to_colorname(hex_code, "x11") for hex_code in hexes]
+    assert rgb_names == rgb_many == [color_utils.rgb_to_colorname(rgb) for rgb in rgbs]
+    assert hex_code == color_utils.colorname_to_hex("red")
+    assert rgb is None
+
+
+def test_identical_calls_are_coalesced(counting):
+    async def run():
+        results = await asyncio.gather(*(aio.async_hex_to_colorname("#123456", "x11") for _ in range(10)))
+        return results, aio.in_flight()
+
+    results, in_flight = asyncio.run(run())
+    assert results == [color_utils.hex_to_colorname("#123456", "x11")] * 10
+    assert counting.submitted == 1
+    assert in_flight == 0
+
+
+def test_distinct_calls_are_not_coalesced(counting):
+    async def run():
+        return await asyncio.gather(aio.async_hex_to_colorname("#123456"), aio.async_hex_to_colorname("#654321"))
+
+    assert asyncio.run(run()) == [color_utils.hex_to_colorname("#123456"), color_utils.hex_to_colorname("#654321")]
+    assert counting.submitted == 2
+
+
+def test_errors_reach_every_caller(counting):
+    async def run():
+        return await asyncio.gather(*(aio.async_hex_to_colorname("#xyz") for _ in range(3)), return_exceptions=True)
+
+    errors = asyncio.run(run())
+    assert all(isinstance(error, ValueError) for error in errors)
+    assert counting.submitted == 1
+    assert aio.in_flight() == 0
+
+
+def test_preload(counting):
+    loaded = asyncio.run(aio.async_preload("html"))
+    assert [palette.name for palette in loaded] == ["html"]
+    assert counting.submitted == 1
+
+
+@pytest.mark.parametrize("rgb", [[1, 2, 3], (1, 2), (256, 0, 0), (1.5, 0, 0), "abc", {1, 2, 3}, None])
+def test_rgb_inputs_rejected_like_sync(counting, rgb):
+    with pytest.raises(ValueError):
+        color_utils.rgb_to_colorname(rgb)
+    with pytest.raises(ValueError):
+        asyncio.run(aio.async_rgb_to_colorname(rgb))
+    assert counting.submitted == 0
+
+
+def test_many_accepts_sequences_like_sync():
+    rgbs = [[1, 2, 3], (4, 5, 6, 7), Color(8, 9, 10)]
+    try:
+        assert asyncio.run(aio.async_rgb_to_colorname_many(rgbs)) == color_utils.rgb_to_colorname_many(rgbs)
+    finally:
+        aio.shutdown()
+
+
+@pytest.mark.parametrize("rgbs", [[(1, 2, 3), 5], [[1.5, 2, 3]], [(1, 2)], [(0, 0, 300)]])
+def test_many_rejected_like_sync(rgbs):
+    with pytest.raises(ValueError):
+        color_utils.rgb_to_colorname_many(rgbs)
+    try:
+        with pytest.raises(ValueError):
+            asyncio.run(aio.async_rgb_to_colorname_many(rgbs))
+    finally:
+        aio.shutdown()
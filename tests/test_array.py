@@ -0,0 +1,99 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from colortools import array, color_utils  # noqa: E402
+
+rng = np.random.default_rng(4)
+
+
+def _tuples(values):
+    return [tuple(int(v) for v in row) for row in values]
+
+
+@pytest.fixture(scope="module")
+def pixels():
+    # random colors plus every gray level
+    gray = np.repeat(np.arange(256, dtype=np.uint8)[:, None], 3, axis=1)
+    return np.concatenate([rng.integers(0, 256, size=(5000, 3), dtype=np.uint8), gray])
+
+
+@pytest.mark.parametrize("name", ["rgb_to_xyz", "rgb_to_lab", "rgb_to_hsl", "rgb_to_hsv", "rgb_to_cmyk"])
+def test_from_rgb_matches_scalar(name, pixels):
+    scalar = getattr(color_utils, name)
+    expected = np.array([scalar(rgb) for rgb in _tuples(pixels)])
+    assert np.array_equal(getattr(array, name)(pixels), expected)
+    # the same values from other dtypes and with an alpha channel
+    assert np.array_equal(getattr(array, name)(pixels.astype(np.int64)), expected)
+    rgba = np.concatenate([pixels, np.full((len(pixels), 1), 7, dtype=np.uint8)], axis=1)
+    assert np.array_equal(getattr(array, name)(rgba), expected)
+
+
+def test_hsl_hsv_to_rgb_match_scalar():
+    values = np.stack([rng.integers(0, 361, 3000), rng.integers(0, 101, 3000), rng.integers(0, 101, 3000)], -1)
+    assert np.array_equal(array.hsl_to_rgb(values), np.array([color_utils.hsl_to_rgb(t) for t in _tuples(values)]))
+    assert np.array_equal(array.hsv_to_rgb(values), np.array([color_utils.hsv_to_rgb(t) for t in _tuples(values)]))
+
+
+def test_cmyk_to_rgb_matches_scalar():
+    values = rng.integers(0, 101, (3000, 4))
+    assert np.array_equal(array.cmyk_to_rgb(values), np.array([color_utils.cmyk_to_rgb(t) for t in _tuples(values)]))
+
+
+def test_image_shapes(pixels):
+    image = pixels[:5000].reshape(50, 100, 3)
+    lab = array.rgb_to_lab(image)
+    assert lab.shape == (50, 100, 3)
+    assert np.array_equal(lab.reshape(-1, 3), array.rgb_to_lab(pixels[:5000]))
+    assert array.rgb_to_hsl(np.zeros((2, 2, 4), dtype=np.uint8)).shape == (2, 2, 3)
+    assert array.rgb_to_lab(np.zeros((0, 3), dtype=np.uint8)).shape == (0, 3)
+
+
+@pytest.mark.parametrize("values", [[[256, 0, 0]], [[-1, 0, 0]], [[1, 2]], 5])
+def test_invalid_rgb(values):
+    with pytest.raises(ValueError):
+        array.rgb_to_lab(values)
+
+
+@pytest.fixture(scope="module")
+def labs():
+    labs = array.rgb_to_lab(rng.integers(0, 256, (120, 3), dtype=np.uint8))
+    # achromatic colors, where the hue terms degenerate
+    labs[0] = [50, 0, 0]
+    labs[1] = [60, 0, 0]
+    return labs
+
+
+@pytest.mark.parametrize("metric", ["ciede2000", "cie76", "cie94"])
+def test_delta_e_matches_scalar(metric, labs):
+    scalar = getattr(color_utils, metric)
+    expected = np.array([[scalar(tuple(a), tuple(b)) for b in labs] for a in labs])
+    matrix = getattr(array, f"{metric}_matrix")(labs, labs)
+    np.testing.assert_allclose(matrix, expected, rtol=1e-12, atol=1e-12)
+    to_all = getattr(array, f"{metric}_to_all")
+    for i in (0, 5):
+        np.testing.assert_allclose(to_all(labs[i], labs), expected[i], rtol=1e-12, atol=1e-12)
+
+
+@pytest.mark.parametrize("metric", ["ciede2000", "cie76", "cie94"])
+@pytest.mark.parametrize("chunk_size", [1, 7, 119, 1000])
+def test_chunk_size_does_not_change_results(metric, chunk_size, labs):
+    matrix = getattr(array, f"{metric}_matrix")
+    to_all = getattr(array, f"{metric}_to_all")
+    assert np.array_equal(matrix(labs, labs[:50], chunk_size=chunk_size), matrix(labs, labs[:50]))
+    assert np.array_equal(to_all(labs[3], labs, chunk_size=chunk_size), to_all(labs[3], labs))
+
+
+def test_matrix_out(labs):
+    out = np.empty((len(labs), 10))
+    assert array.ciede2000_matrix(labs, labs[:10], out=out) is out
+    assert np.array_equal(out, array.ciede2000_matrix(labs, labs[:10]))
+    with pytest.raises(ValueError):
+        array.ciede2000_matrix(labs, labs, out=out)
+
+
+def test_matrix_shapes(labs):
+    assert array.cie76_matrix(labs[:4], labs[:0]).shape == (4, 0)
+    assert array.cie76_to_all(labs[0], labs[:0]).shape == (0,)
+    with pytest.raises(ValueError):
+        array.cie76_matrix([[1, 2]], labs)
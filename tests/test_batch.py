@@ -0,0 +1,60 @@
+import random
+
+import pytest
+
+from colortools import color_utils
+
+random.seed(3)
+
+
+def _rgbs(count):
+    rgbs = [(random.randrange(256), random.randrange(256), random.randrange(256)) for _ in range(count)]
+    return rgbs + rgbs[:10]
+
+
+@pytest.mark.parametrize("standard", ["html", "x11", "color-meanings.com"])
+def test_rgb_to_colorname_many_matches_single(standard):
+    rgbs = _rgbs(60)
+    assert color_utils.rgb_to_colorname_many(rgbs, standard) == [
+        color_utils.rgb_to_colorname(rgb, standard) for rgb in rgbs
+    ]
+
+
+@pytest.mark.parametrize("standard", ["html", "x11", "color-meanings.com"])
+def test_hex_to_colorname_many_matches_single(standard, scan_colorname):
+    hexes = [color_utils.rgb_to_hex(rgb) for rgb in _rgbs(60)] + ["#FF0000", "#ff0000"]
+    names = color_utils.hex_to_colorname_many(hexes, standard)
+    assert names == [color_utils.hex_to_colorname(hex_code, standard) for hex_code in hexes]
+    assert names[:20] == [scan_colorname(hex_code, standard) for hex_code in hexes[:20]]
+
+
+def test_rgb_to_colorname_many_accepts_sequences():
+    rgbs = [(10, 200, 30), [10, 200, 30], (10, 200, 30, 128), range(3)]
+    assert color_utils.rgb_to_colorname_many(iter(rgbs)) == [
+        color_utils.rgb_to_colorname((10, 200, 30)),
+        color_utils.rgb_to_colorname((10, 200, 30)),
+        color_utils.rgb_to_colorname((10, 200, 30)),
+        color_utils.rgb_to_colorname((0, 1, 2)),
+    ]
+
+
+def test_empty_input():
+    assert color_utils.rgb_to_colorname_many([]) == []
+    assert color_utils.hex_to_colorname_many([]) == []
+
+
+@pytest.mark.parametrize("rgb", [(256, 0, 0), (-1, 0, 0), (1, 2), (1.5, 2, 3), ("a", 0, 0)])
+def test_rgb_to_colorname_many_rejects_invalid(rgb):
+    with pytest.raises(ValueError):
+        color_utils.rgb_to_colorname_many([(1, 2, 3), rgb])
+
+
+@pytest.mark.parametrize("hex_code", ["#12345", "#gggggg", ""])
+def test_hex_to_colorname_many_rejects_invalid(hex_code):
+    with pytest.raises(ValueError):
+        color_utils.hex_to_colorname_many(["#123456", hex_code])
+
+
+def test_invalid_standard():
+    with pytest.raises(ValueError):
+        color_utils.rgb_to_colorname_many([(1, 2, 3)], "no-such-standard")
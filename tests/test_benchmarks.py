@@ -0,0 +1,11 @@
+import json
+
+from benchmarks.__main__ import main
+
+
+def test_json_stdout_parses(capsys):
+    assert main(["--json", "-", "--filter", "hsv", "--samples", "5", "--min-time", "0.001"]) == 0
+    results = json.loads(capsys.readouterr().out)
+    names = [result["name"] for result in results["results"]]
+    assert names
+    assert all("hsv" in name for name in names)
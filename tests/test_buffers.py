@@ -0,0 +1,140 @@
+import random
+from array import array
+
+import pytest
+
+from colortools import buffers, color_utils
+
+random.seed(13)
+
+CONVERSIONS = [("rgb_to_hsl", 3), ("rgb_to_hsv", 3), ("rgb_to_cmyk", 4), ("rgb_to_xyz", 3), ("rgb_to_lab", 3)]
+
+
+@pytest.fixture(scope="module")
+def rgbs():
+    colors = [(random.randrange(256), random.randrange(256), random.randrange(256)) for _ in range(3000)]
+    # repeated colors, which are converted once per chunk
+    return colors + colors[:500] + [(0, 0, 0), (255, 255, 255)]
+
+
+def _expected(name, rgbs):
+    scalar = getattr(color_utils, name)
+    return [value for rgb in rgbs for value in scalar(rgb)]
+
+
+@pytest.mark.parametrize(("name", "width"), CONVERSIONS)
+def test_conversions_match_color_utils(name, width, rgbs):
+    pixels = bytes(value for rgb in rgbs for value in rgb)
+    result = getattr(buffers, name)(pixels)
+    assert isinstance(result, array)
+    assert len(result) == width * len(rgbs)
+    assert list(result) == _expected(name, rgbs)
+
+
+@pytest.mark.parametrize("name", [name for name, _ in CONVERSIONS])
+def test_stride_and_chunks(name, rgbs, monkeypatch):
+    rgba = bytearray(value for rgb in rgbs for value in (*rgb, 99))
+    expected = _expected(name, rgbs)
+    assert list(getattr(buffers, name)(rgba, stride=4)) == expected
+    # a trailing partial pixel is ignored
+    assert list(getattr(buffers, name)(memoryview(rgba)[:-1], stride=4)) == expected
+    monkeypatch.setattr(buffers, "CHUNK_SIZE", 7)
+    assert list(getattr(buffers, name)(array("B", rgba), stride=4)) == expected
+
+
+def test_out_buffers(rgbs):
+    pixels = bytes(value for rgb in rgbs for value in rgb)
+    expected = _expected("rgb_to_lab", rgbs)
+
+    out = array("d", bytes(8 * 3 * len(rgbs)))
+    assert buffers.rgb_to_lab(pixels, out=out) is out
+    assert list(out) == expected
+
+    raw = bytearray(8 * 3 * len(rgbs) + 16)
+    buffers.rgb_to_lab(pixels, out=memoryview(raw).cast("d"))
+    assert list(memoryview(raw).cast("d"))[: len(expected)] == expected
+
+    single = buffers.rgb_to_lab(pixels, out=array("f", bytes(4 * 3 * len(rgbs))))
+    assert list(single) == pytest.approx(expected, rel=1e-6, abs=1e-4)
+
+
+def test_pixel_count():
+    assert buffers.pixel_count(b"") == 0
+    assert buffers.pixel_count(b"\x00\x00") == 0
+    assert buffers.pixel_count(bytes(9)) == 3
+    assert buffers.pixel_count(bytes(11), stride=4) == 3
+    assert buffers.pixel_count(array("H", [0, 0, 0])) == 2
+
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError):
+        buffers.rgb_to_lab(bytes(6), stride=2)
+    with pytest.raises(ValueError):
+        buffers.rgb_to_lab(bytes(6), out=array("d", [0.0] * 5))
+    with pytest.raises(ValueError):
+        buffers.rgb_to_lab(bytes(6), out=bytes(48))
+    with pytest.raises(TypeError):
+        buffers.rgb_to_lab([1, 2, 3])
+
+
+def _hex_codes(rgbs):
+    codes = []
+    for rgb in rgbs:
+        code = color_utils.rgb_to_hex(rgb)
+        form = random.randrange(5)
+        if form == 1:
+            code = code.upper()
+        elif form == 2:
+            code = code[1:]
+        elif form == 3:
+            code += "7f"
+        elif form == 4:
+            code = "#" + code[1] + code[3] + code[5]
+        codes.append(code)
+    return codes
+
+
+@pytest.mark.parametrize("chunk_size", [buffers.CHUNK_SIZE, 5])
+def test_hexes_to_rgb_matches_hex_to_rgb(chunk_size, rgbs, monkeypatch):
+    monkeypatch.setattr(buffers, "CHUNK_SIZE", chunk_size)
+    # the "#rrggbb" fast path, and mixed forms
+    for codes in ([color_utils.rgb_to_hex(rgb) for rgb in rgbs], _hex_codes(rgbs)):
+        expected = bytes(value for code in codes for value in color_utils.hex_to_rgb(code))
+        assert buffers.hexes_to_rgb(codes) == expected
+        assert buffers.hexes_to_rgb(iter(codes)) == expected
+    assert buffers.hexes_to_rgb([]) == bytearray()
+
+
+@pytest.mark.parametrize("stride", [3, 4])
+@pytest.mark.parametrize("chunk_size", [buffers.CHUNK_SIZE, 5])
+def test_rgbs_to_hex_matches_rgb_to_hex(stride, chunk_size, rgbs, monkeypatch):
+    monkeypatch.setattr(buffers, "CHUNK_SIZE", chunk_size)
+    padding = (0,) * (stride - 3)
+    pixels = array("B", [value for rgb in rgbs for value in (*rgb, *padding)])
+    assert buffers.rgbs_to_hex(pixels, stride) == [color_utils.rgb_to_hex(rgb) for rgb in rgbs]
+    assert buffers.hexes_to_rgb(buffers.rgbs_to_hex(pixels, stride)) == bytes(v for rgb in rgbs for v in rgb)
+    assert buffers.rgbs_to_hex(b"", stride) == []
+
+
+INVALID_CODES = [
+    "",
+    "#",
+    "#12",
+    "#12345",
+    "#1234567",
+    "#123456789",
+    "##123456",
+    "#gggggg",
+    "#12 456",
+    "123456#",
+    "#12345#",
+]
+
+
+@pytest.mark.parametrize("code", INVALID_CODES)
+def test_invalid_hex_codes(code):
+    with pytest.raises(ValueError):
+        color_utils.hex_to_rgb(code)
+    for codes in ([code], ["#000000", code], ["#000000"] * 3 + [code]):
+        with pytest.raises(ValueError):
+            buffers.hexes_to_rgb(codes)
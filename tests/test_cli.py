@@ -0,0 +1,91 @@
+import csv
+import io
+import json
+
+import pytest
+
+from colortools import color_utils
+from colortools.cli import main
+
+# conversion, input file, its content with a bad record between two good ones, the good values
+BAD_RECORDS = {
+    "missing field": (
+        "hex_to_rgb",
+        "colors.jsonl",
+        '{"hex": "#ff0000"}\n{"name": "red"}\n{"hex": "#00ff00"}\n',
+        ["#ff0000", "#00ff00"],
+    ),
+    "non-string hex": (
+        "hex_to_rgb",
+        "colors.jsonl",
+        '{"hex": "#ff0000"}\n{"hex": 123}\n{"hex": "#00ff00"}\n',
+        ["#ff0000", "#00ff00"],
+    ),
+    "short tuple": ("rgb_to_lab", "colors.csv", 'rgb\n"255,0,0"\n"1,2"\n"0,255,0"\n', [(255, 0, 0), (0, 255, 0)]),
+}
+
+
+@pytest.fixture
+def hsv_file(tmp_path):
+    path = tmp_path / "colors.csv"
+    path.write_text('hsv\n"0,100,100"\n"120,50,50"\n"240,0,100"\n')
+    return path
+
+
+def test_convert_to_stdout(hsv_file, capsys):
+    assert main(["convert", "hsv_to_hex", str(hsv_file), "-", "--interval", "1000"]) == 0
+    out, err = capsys.readouterr()
+    rows = list(csv.DictReader(io.StringIO(out)))
+    assert [row["hex"] for row in rows] == [
+        color_utils.hsv_to_hex((0, 100, 100)),
+        color_utils.hsv_to_hex((120, 50, 50)),
+        color_utils.hsv_to_hex((240, 0, 100)),
+    ]
+    assert out.count("\n") == 4
+    # the throughput line is printed once, by the first and last chunk
+    assert err.count("records/s") == 1
+
+
+def test_quiet(hsv_file, capsys):
+    assert main(["convert", "hsv_to_hex", str(hsv_file), "-", "--quiet"]) == 0
+    assert capsys.readouterr().err == ""
+
+
+def test_failure_keeps_output(tmp_path, capsys):
+    source = tmp_path / "colors.csv"
+    source.write_text("hex\n#ffffff\nnot a color\n")
+    target = tmp_path / "named.jsonl"
+    target.write_text("previous\n")
+    assert main(["convert", "hex_to_colorname", str(source), str(target), "--chunk-size", "1"]) == 1
+    assert "error" in capsys.readouterr().err
+    assert target.read_text() == "previous\n"
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["colors.csv", "named.jsonl"]
+
+
+def test_failure_leaves_no_file(tmp_path):
+    source = tmp_path / "colors.csv"
+    source.write_text("hex\n#ffffff\nnot a color\n")
+    target = tmp_path / "named.csv"
+    assert main(["convert", "hex_to_colorname", str(source), str(target), "--quiet"]) == 1
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["colors.csv"]
+
+
+@pytest.mark.parametrize("errors", ["raise", "skip", "null"])
+@pytest.mark.parametrize("case", list(BAD_RECORDS))
+def test_bad_records(tmp_path, capsys, case, errors):
+    conversion, name, text, good = BAD_RECORDS[case]
+    source = tmp_path / name
+    source.write_text(text)
+    target = tmp_path / "out.jsonl"
+    argv = ["convert", conversion, str(source), str(target), "--errors", errors, "--chunk-size", "2", "--quiet"]
+    if errors == "raise":
+        assert main(argv) == 1
+        assert capsys.readouterr().err.startswith("colortools: error: ")
+        assert not target.exists()
+        return
+
+    assert main(argv) == 0
+    output = conversion.split("_to_")[1]
+    results = [json.loads(line)[output] for line in target.read_text().splitlines()]
+    expected = [list(getattr(color_utils, conversion)(value)) for value in good]
+    assert results == (expected if errors == "skip" else [expected[0], None, expected[1]])
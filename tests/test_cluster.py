@@ -0,0 +1,101 @@
+import random
+
+import pytest
+
+from colortools import color_utils
+from colortools.cluster import Clusterer, deduplicate
+from colortools.color import Color
+
+random.seed(25)
+
+
+def _leader(labs, threshold):
+    # the naive leader loop: join the oldest representative within the threshold
+    representatives = []
+    result = []
+    for lab in labs:
+        for i, representative in enumerate(representatives):
+            if color_utils.ciede2000(lab, representative) <= threshold:
+                result.append((i, False))
+                break
+        else:
+            result.append((len(representatives), True))
+            representatives.append(lab)
+    return result
+
+
+def _rgbs(count):
+    base = [(random.randrange(256), random.randrange(256), random.randrange(256)) for _ in range(count // 4)]
+    rgbs = []
+    for _ in range(count):
+        rgb = random.choice(base)
+        # repeated colors and close neighbours
+        rgbs.append(tuple(min(255, max(0, channel + random.randrange(-4, 5))) for channel in rgb))
+    return rgbs
+
+
+@pytest.mark.parametrize("threshold", [0.0, 1.0, 2.3, 6.0, 20.0, 60.0])
+@pytest.mark.parametrize("cache_size", [65536, 3, 0])
+def test_cluster_matches_leader_loop(threshold, cache_size):
+    rgbs = _rgbs(600)
+    expected = _leader([color_utils.rgb_to_lab(rgb) for rgb in rgbs], threshold)
+    clusterer = Clusterer(threshold, cache_size=cache_size)
+    assert list(clusterer.cluster(rgbs)) == expected
+    assert len(clusterer) == sum(is_new for _, is_new in expected)
+    assert clusterer.representatives == [rgb for rgb, (_, is_new) in zip(rgbs, expected) if is_new]
+    assert clusterer.sizes == [sum(1 for cluster_id, _ in expected if cluster_id == i) for i in range(len(clusterer))]
+
+
+@pytest.mark.parametrize("cell_size", [1.0, 4.0, 100.0])
+def test_cell_size_does_not_change_results(cell_size):
+    rgbs = _rgbs(400)
+    expected = _leader([color_utils.rgb_to_lab(rgb) for rgb in rgbs], 3.0)
+    assert list(Clusterer(3.0, cell_size=cell_size).cluster(rgbs)) == expected
+
+
+def test_input_forms():
+    rgbs = _rgbs(300)
+    expected = _leader([color_utils.rgb_to_lab(rgb) for rgb in rgbs], 2.3)
+    hexes = [color_utils.rgb_to_hex(rgb) for rgb in rgbs]
+    assert list(Clusterer().cluster(hexes)) == expected
+    assert list(Clusterer().cluster((*rgb, 255) for rgb in rgbs)) == expected
+    assert list(Clusterer().cluster(Color(*rgb) for rgb in rgbs)) == expected
+
+
+def test_find():
+    clusterer = Clusterer(5.0)
+    clusterer.add((200, 10, 10))
+    clusterer.add((10, 10, 200))
+    assert clusterer.find(color_utils.rgb_to_lab((201, 11, 10))) == 0
+    assert clusterer.find(color_utils.rgb_to_lab((12, 10, 199))) == 1
+    assert clusterer.find(color_utils.rgb_to_lab((10, 200, 10))) is None
+
+
+def test_colors_at_the_threshold_join():
+    # the difference itself as the threshold, the box around the query must not drop the representative
+    for _ in range(50):
+        first, second = _rgbs(8)[:2]
+        lab = color_utils.rgb_to_lab(second)
+        clusterer = Clusterer(color_utils.ciede2000(lab, color_utils.rgb_to_lab(first)), cell_size=1.0)
+        clusterer.add(first)
+        assert clusterer.find(lab) == 0
+
+
+def test_deduplicate():
+    rgbs = _rgbs(500)
+    expected = _leader([color_utils.rgb_to_lab(rgb) for rgb in rgbs], 4.0)
+    kept = [rgb for rgb, (_, is_new) in zip(rgbs, expected) if is_new]
+    assert list(deduplicate(rgbs, 4.0)) == kept
+    hexes = [color_utils.rgb_to_hex(rgb) for rgb in rgbs]
+    assert list(deduplicate(hexes, 4.0)) == [color_utils.rgb_to_hex(rgb) for rgb in kept]
+    assert list(deduplicate([])) == []
+
+
+def test_invalid_input():
+    with pytest.raises(ValueError):
+        Clusterer(-1)
+    clusterer = Clusterer()
+    for color in [(256, 0, 0), (1, 2), "#12345", [1, 2, 3]]:
+        with pytest.raises(ValueError):
+            clusterer.add(color)
+    assert len(clusterer) == 0
@@ -0,0 +1,113 @@
+import random
+from array import array
+
+import pytest
+
+from colortools import buffers, color_utils
+from colortools.color import Color, ColorArray
+
+random.seed(23)
+RGBS = [tuple(random.randrange(256) for _ in range(3)) for _ in range(500)]
+METRICS = ["ciede2000", "cie76", "cie94"]
+
+
+def test_color_matches_color_utils():
+    for rgb in RGBS[:50]:
+        color = Color.from_rgb(rgb)
+        assert color.rgb == rgb
+        assert tuple(color) == rgb
+        assert color.hex == color_utils.rgb_to_hex(rgb)
+        assert color.xyz == color_utils.rgb_to_xyz(rgb)
+        assert color.lab == color_utils.rgb_to_lab(rgb)
+        assert color.hsl == color_utils.rgb_to_hsl(rgb)
+        assert Color.from_hex(color.hex) == color
+
+
+def test_color_as_rgb_tuple():
+    color = Color(12, 200, 99)
+    assert color_utils.rgb_to_hex(color) == color_utils.rgb_to_hex((12, 200, 99))
+    assert color_utils.rgb_to_lab(color) == color_utils.rgb_to_lab((12, 200, 99))
+    assert color_utils.rgb_to_hsv(color) == color_utils.rgb_to_hsv((12, 200, 99))
+    assert color_utils.rgb_to_colorname(color) == color_utils.rgb_to_colorname((12, 200, 99))
+    assert color_utils.nearest_colornames(color) == color_utils.nearest_colornames((12, 200, 99))
+    assert hash(color) == hash((12, 200, 99))
+
+
+@pytest.mark.parametrize("rgb", [(256, 0, 0), (-1, 0, 0), (1.5, 0, 0)])
+def test_color_validation(rgb):
+    with pytest.raises(ValueError):
+        Color(*rgb)
+
+
+@pytest.mark.parametrize("metric", METRICS)
+def test_color_delta_e(metric):
+    function = getattr(color_utils, metric)
+    first, second = Color(*RGBS[0]), Color(*RGBS[1])
+    assert first.delta_e(second, metric) == function(first.lab, second.lab)
+    assert first.delta_e(second.lab, metric) == function(first.lab, second.lab)
+
+
+@pytest.mark.parametrize("metric", METRICS)
+def test_delta_e_functions_take_colors(metric):
+    function = getattr(color_utils, metric)
+    rgb_function = getattr(color_utils, metric + "_rgb")
+    for rgb1, rgb2 in [((255, 0, 0), (250, 5, 0)), *zip(RGBS, RGBS[1:])]:
+        first, second = Color(*rgb1), Color(*rgb2)
+        expected = rgb_function(rgb1, rgb2)
+        assert function(first, second) == expected
+        assert function(first, second.lab) == expected
+        assert function(first.lab, second) == expected
+        assert rgb_function(first, second) == expected
+
+
+def test_conversions_use_cached_values():
+    color = Color(30, 144, 250)
+    assert color_utils.rgb_to_xyz(color) is color.xyz
+    assert color_utils.rgb_to_lab(color) is color.lab
+    assert color_utils.rgb_to_lab(color) == color_utils.rgb_to_lab((30, 144, 250))
+
+
+def test_color_array():
+    colors = ColorArray(RGBS)
+    assert len(colors) == len(RGBS)
+    assert [color.rgb for color in colors] == RGBS
+    assert colors[3] == Color(*RGBS[3])
+    assert [color.rgb for color in colors[10:20]] == RGBS[10:20]
+    assert colors.pixels() == bytearray(value for rgb in RGBS for value in rgb)
+    assert colors.hexes() == [color_utils.rgb_to_hex(rgb) for rgb in RGBS]
+    assert [color.rgb for color in ColorArray.from_hexes(colors.hexes())] == RGBS
+    assert [color.rgb for color in ColorArray.from_pixels(colors.pixels())] == RGBS
+    assert colors.nbytes == 3 * len(RGBS)
+
+
+def test_color_array_lab_columns():
+    colors = ColorArray(RGBS)
+    columns = colors.lab_columns()
+    assert all(isinstance(column, array) and column.typecode == "f" for column in columns)
+    for lab, expected in zip(zip(*columns), buffers.rgb_to_lab(colors.pixels())[0::3]):
+        assert lab[0] == pytest.approx(expected, abs=1e-4)
+    for lab, rgb in zip(zip(*columns), RGBS):
+        assert lab == pytest.approx(color_utils.rgb_to_lab(rgb), abs=1e-4)
+
+
+@pytest.mark.parametrize("metric", METRICS)
+def test_color_array_delta_e(metric):
+    colors = ColorArray(RGBS)
+    color = Color(40, 90, 200)
+    function = getattr(color_utils, metric)
+    expected = [function(color.lab, lab) for lab in zip(*colors.lab_columns())]
+    result = colors.delta_e(color, metric)
+    assert isinstance(result, array)
+    assert result.typecode == "d"
+    assert list(result) == pytest.approx(expected, rel=1e-12, abs=1e-12)
+    assert list(colors.delta_e(color.lab, metric)) == list(result)
+
+
+def test_color_array_delta_e_invalid_metric():
+    with pytest.raises(ValueError):
+        ColorArray(RGBS).delta_e(Color(0, 0, 0), "cie2000")
+
+
+def test_color_array_rejected_by_scalar_functions():
+    with pytest.raises(ValueError):
+        color_utils.rgb_to_hex(ColorArray(RGBS))
@@ -0,0 +1,160 @@
+import os
+import random
+from importlib.resources import files
+
+import pytest
+
+from colortools import color_utils, compiled, palettes
+
+random.seed(10)
+
+
+@pytest.fixture(scope="module")
+def compiled_dir(tmp_path_factory):
+    target = tmp_path_factory.mktemp("compiled")
+    compiled.compile_standards(str(target))
+    return str(target)
+
+
+@pytest.fixture
+def use_compiled(compiled_dir, monkeypatch):
+    monkeypatch.setenv("COLORTOOLS_PALETTE_DIR", compiled_dir)
+    palettes.invalidate()
+    yield compiled_dir
+    palettes.invalidate()
+
+
+@pytest.mark.parametrize("standard", palettes.STANDARDS)
+def test_compiled_standard_matches_csv(standard, compiled_dir):
+    loaded = compiled.load(os.path.join(compiled_dir, standard + compiled.SUFFIX))
+    source = palettes._read_csv(standard)
+    assert loaded.name == standard
+    assert list(loaded.names) == source.names
+    assert list(loaded.hexes) == source.hexes
+    assert list(loaded.rgbs) == source.rgbs
+    assert list(loaded.labs) == source.labs
+    assert loaded.names[-1] == source.names[-1]
+    assert loaded.labs[3:5] == source.labs[3:5]
+
+
+@pytest.mark.parametrize("standard", ["html", "x11", "meodai"])
+def test_compiled_index_matches_built_index(standard, compiled_dir):
+    loaded = compiled.load(os.path.join(compiled_dir, standard + compiled.SUFFIX))
+    source = palettes._read_csv(standard)
+    assert loaded._index is not None
+    for _ in range(30):
+        lab = color_utils.rgb_to_lab((random.randrange(256), random.randrange(256), random.randrange(256)))
+        assert loaded.nearest(lab) == source.nearest(lab)
+
+
+def test_registry_uses_compiled_files(use_compiled, scan_colorname):
+    for standard in ("html", "x11"):
+        assert compiled.standard_path(standard) == os.path.join(use_compiled, standard + compiled.SUFFIX)
+        palette = palettes.get_palette(standard)
+        assert isinstance(palette.names, compiled._StringView)
+        for _ in range(30):
+            hex_code = f"#{random.randrange(1 << 24):06x}"
+            assert color_utils.hex_to_colorname(hex_code, standard) == scan_colorname(hex_code, standard)
+        assert color_utils.colorname_to_hex(palette.names[4], standard) == palette.hexes[4]
+
+
+def test_outdated_file_is_ignored(tmp_path, monkeypatch):
+    monkeypatch.setenv("COLORTOOLS_PALETTE_DIR", str(tmp_path))
+    compiled.write(palettes._read_csv("html"), str(tmp_path / "html.ctp"), source=(1, 2))
+    assert compiled.standard_path("html") is None
+    assert compiled.load_standard("html") is None
+    assert compiled.standard_path("x11") is None
+
+
+def test_without_index(tmp_path):
+    path = str(tmp_path / "html.ctp")
+    compiled.write(palettes._read_csv("html"), path, index=False)
+    loaded = compiled.load(path)
+    assert loaded._index is None
+    lab = (40.0, 10.0, -20.0)
+    assert loaded.nearest(lab) == palettes._read_csv("html").nearest(lab)
+
+
+def test_removed_entries_are_left_out(tmp_path):
+    palette = palettes._read_csv("html")
+    removed = palette.names[2]
+    palette.remove(removed)
+    path = str(tmp_path / "html.ctp")
+    compiled.write(palette, path)
+    loaded = compiled.load(path)
+    assert removed not in list(loaded.names)
+    assert len(loaded) == len(palette)
+    assert compiled.read_header(path)["count"] == len(palette)
+    lab = palette.labs[2]
+    position, diff = loaded.nearest(lab)
+    assert loaded.names[position] == palette.names[palette.nearest(lab)[0]]
+    assert diff == palette.nearest(lab)[1]
+
+
+def test_loaded_palette_can_change(tmp_path):
+    path = str(tmp_path / "html.ctp")
+    compiled.write(palettes._read_csv("html"), path)
+    loaded = compiled.load(path, "mine")
+    assert loaded.name == "mine"
+    position = loaded.add("Almost Red", "#fe0001")
+    assert loaded.nearest(color_utils.rgb_to_lab((254, 0, 1))) == (position, 0.0)
+    loaded.remove("Almost Red")
+    assert loaded.names[loaded.nearest(color_utils.rgb_to_lab((254, 0, 1)))[0]] == "Red"
+
+
+def test_checksum_only_for_csv_modified_later(tmp_path, monkeypatch):
+    monkeypatch.setenv("COLORTOOLS_PALETTE_DIR", str(tmp_path))
+    source = str(files("colortools") / "data" / "html.csv")
+    size, crc32 = compiled.source_checksum(source)
+    modified = os.stat(source).st_mtime_ns
+    path = str(tmp_path / "html.ctp")
+    checked = []
+
+    def checksum(path):
+        checked.append(path)
+        return size, crc32
+
+    monkeypatch.setattr(compiled, "source_checksum", checksum)
+
+    compiled.write(palettes._read_csv("html"), path, source=(size, crc32))
+    os.utime(path, ns=(modified + 10**9, modified + 10**9))
+    assert compiled.standard_path("html") == path
+    assert checked == []
+
+    os.utime(path, ns=(modified - 10**9, modified - 10**9))
+    assert compiled.standard_path("html") == path
+    assert len(checked) == 1
+
+    compiled.write(palettes._read_csv("html"), path, source=(size, crc32 ^ 1))
+    os.utime(path, ns=(modified - 10**9, modified - 10**9))
+    assert compiled.standard_path("html") is None
+
+
+def test_index_is_mapped(tmp_path):
+    path = str(tmp_path / "html.ctp")
+    compiled.write(palettes._read_csv("html"), path)
+    loaded = compiled.load(path)
+    assert isinstance(loaded._index.chromas, memoryview)
+    assert all(isinstance(members, memoryview) for members in loaded._index.cells.values())
+    # the first change copies the mapped index
+    loaded.remove("Red")
+    assert loaded.names[loaded.nearest(color_utils.rgb_to_lab((255, 0, 0)))[0]] != "Red"
+    assert not any(isinstance(members, memoryview) for members in loaded._index.cells.values())
+
+
+@pytest.mark.parametrize("data", [b"", b"not a palette file", compiled.MAGIC])
+def test_invalid_files(tmp_path, data):
+    path = tmp_path / "bad.ctp"
+    path.write_bytes(data)
+    with pytest.raises(ValueError):
+        compiled.load(str(path))
+
+
+def test_truncated_file(tmp_path):
+    path = tmp_path / "html.ctp"
+    compiled.write(palettes._read_csv("html"), str(path))
+    data = path.read_bytes()
+    for size in (len(data) - 1, 200):
+        path.write_bytes(data[:size])
+        with pytest.raises(ValueError):
+            compiled.load(str(path))
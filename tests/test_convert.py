@@ -0,0 +1,92 @@
+import random
+
+import pytest
+
+from colortools import color_utils
+from colortools import convert as module
+from colortools.convert import MODELS, conversion_path, convert, get_converter
+
+random.seed(9)
+RGBS = [tuple(random.randrange(256) for _ in range(3)) for _ in range(200)] + [(0, 0, 0), (255, 255, 255)]
+SAMPLES = {
+    "rgb": RGBS,
+    "hex": [color_utils.rgb_to_hex(rgb) for rgb in RGBS],
+    "hsl": [(random.randint(0, 360), random.randint(0, 100), random.randint(0, 100)) for _ in range(200)],
+    "hsv": [(random.randint(0, 360), random.randint(0, 100), random.randint(0, 100)) for _ in range(200)],
+    "cmyk": [tuple(random.randint(0, 100) for _ in range(4)) for _ in range(200)],
+    "xyz": [color_utils.rgb_to_xyz(rgb) for rgb in RGBS],
+    "lab": [color_utils.rgb_to_lab(rgb) for rgb in RGBS],
+}
+PAIRS = [(src, dst) for src in MODELS for dst in MODELS if src != dst and hasattr(color_utils, f"{src}_to_{dst}")]
+
+
+@pytest.mark.parametrize(("src", "dst"), PAIRS)
+def test_quantized_matches_color_utils(src, dst):
+    function = getattr(color_utils, f"{src}_to_{dst}")
+    for value in SAMPLES[src]:
+        assert convert(value, src, dst, quantize=True) == function(value)
+
+
+@pytest.mark.parametrize("src", ["rgb", "hex", "hsl", "hsv", "cmyk"])
+@pytest.mark.parametrize("dst", ["xyz", "lab"])
+def test_fused_matches_step_chain(src, dst):
+    # the same chain without the fused srgb steps
+    path = conversion_path(src, dst)
+    steps = [module._UNROUNDED[step] for step in zip(path, path[1:])]
+    kernel = get_converter(src, dst)
+    for value in SAMPLES[src]:
+        expected = value
+        for step in steps:
+            expected = step(expected)
+        assert kernel(value) == pytest.approx(expected, rel=1e-12, abs=1e-12)
+
+
+@pytest.mark.parametrize("src", ["hsl", "hsv", "cmyk", "rgb"])
+def test_unrounded_round_trip(src):
+    for value in SAMPLES[src]:
+        if (src != "rgb" and value[1] == 0) or (src == "cmyk" and value[3] == 100):
+            continue
+        back = convert(convert(value, src, "lab"), "lab", "rgb")
+        assert back == pytest.approx(convert(value, src, "rgb"), abs=1e-6)
+
+
+INVALID = [
+    ((400, 50, 50), "hsl"),
+    ((0, 101, 50), "hsl"),
+    ((0, 50, -1), "hsl"),
+    ((361, 50, 50), "hsv"),
+    ((0, 50, 150), "hsv"),
+    ((0, 0, 0, 101), "cmyk"),
+    ((0, 0, 0), "cmyk"),
+    ((256, 0, 0), "rgb"),
+    ((1, 2), "rgb"),
+    ("#12345", "hex"),
+]
+
+
+@pytest.mark.parametrize(("value", "src"), INVALID)
+@pytest.mark.parametrize("quantize", [False, True])
+def test_invalid_input(value, src, quantize):
+    if quantize and src == "rgb":
+        pytest.skip("color_utils.rgb_to_lab does not validate its input")
+    with pytest.raises(ValueError):
+        convert(value, src, "lab", quantize=quantize)
+
+
+@pytest.mark.parametrize(("value", "src"), INVALID)
+@pytest.mark.parametrize("quantize", [False, True])
+def test_invalid_input_same_model(value, src, quantize):
+    with pytest.raises(ValueError):
+        convert(value, src, src, quantize=quantize)
+
+
+@pytest.mark.parametrize("quantize", [False, True])
+@pytest.mark.parametrize("src", MODELS)
+def test_same_model_returns_value(src, quantize):
+    value = SAMPLES[src][0]
+    assert convert(value, src, src, quantize=quantize) is value
+
+
+def test_invalid_model():
+    with pytest.raises(ValueError):
+        convert((0, 0, 0), "rgb", "yuv")
@@ -0,0 +1,145 @@
+import random
+
+import pytest
+
+from colortools import color_utils, palettes
+from colortools.names import NameIndex
+from colortools.nearest import LabGrid
+
+random.seed(17)
+
+
+def _random_hex():
+    return f"#{random.randrange(1 << 24):06x}"
+
+
+def _scan(palette, hex_color):
+    # linear scan over the entries in use, in position order
+    positions = list(palette.positions())
+    for i in positions:
+        if palette.hexes[i] == hex_color:
+            return palette.names[i]
+    lab = color_utils.rgb_to_lab(color_utils.hex_to_rgb(hex_color))
+    closest = None
+    min_diff = 101
+    for i in positions:
+        diff = color_utils.ciede2000(lab, color_utils.rgb_to_lab(color_utils.hex_to_rgb(palette.hexes[i])))
+        if diff < min_diff:
+            min_diff = diff
+            closest = palette.names[i]
+    return closest
+
+
+def _check(name, palette, queries):
+    for hex_color in queries:
+        assert color_utils.hex_to_colorname(hex_color, name) == _scan(palette, hex_color)
+    for i in palette.positions():
+        assert color_utils.colorname_to_hex(palette.names[i].upper(), name) == palette.hexes[i]
+
+
+@pytest.fixture
+def custom():
+    colors = {f"color {i}": _random_hex() for i in range(40)}
+    palette = palettes.register_palette("custom-test", colors)
+    yield palette
+    palettes.unregister_palette("custom-test")
+
+
+def test_register(custom):
+    assert "custom-test" in palettes.custom_palettes()
+    assert palettes.get_palette("custom-test") is custom
+    assert len(custom) == 40
+    _check("custom-test", custom, [_random_hex() for _ in range(50)] + custom.hexes[:5])
+
+
+def test_incremental_changes_match_scan(custom):
+    # build the indexes first, so every change below updates them in place, and the grid is rebuilt once it grew
+    custom.nearest((50.0, 0.0, 0.0))
+    custom.name_index.fuzzy("color")
+    queries = [_random_hex() for _ in range(30)]
+    for step in range(400):
+        names = [custom.names[i] for i in custom.positions()]
+        action = random.random()
+        if action < 0.5:
+            custom.add(f"added {step}", _random_hex())
+        elif action < 0.75:
+            custom.add(random.choice(names), _random_hex())
+        elif len(names) > 1:
+            custom.remove(random.choice(names))
+        if step % 40 == 0:
+            _check("custom-test", custom, queries + [custom.hexes[i] for i in custom.positions()][-3:])
+    _check("custom-test", custom, queries)
+
+    # the incrementally maintained indexes equal freshly built ones
+    assert len(custom.index) == len(custom)
+    rebuilt = LabGrid(custom.labs, positions=custom.positions())
+    for hex_color in queries:
+        lab = color_utils.rgb_to_lab(color_utils.hex_to_rgb(hex_color))
+        assert custom.nearest(lab) == rebuilt.nearest(lab)
+    rebuilt_names = NameIndex({i: custom.names[i] for i in custom.positions()})
+    assert custom.name_index.prefix("", None) == rebuilt_names.prefix("", None)
+
+
+def test_add_and_remove(custom):
+    position = custom.add("Exact Red", "#ff0000")
+    assert color_utils.hex_to_colorname("#ff0000", "custom-test") == "Exact Red"
+    assert custom.add("Exact Red", "#00ff00") == position
+    assert color_utils.hex_to_colorname("#00ff00", "custom-test") == "Exact Red"
+    assert color_utils.colorname_to_hex("exact red", "custom-test") == "#00ff00"
+    assert color_utils.colornames_starting_with("exact", "custom-test") == ["Exact Red"]
+
+    assert custom.remove("Exact Red") == position
+    assert "Exact Red" not in custom
+    assert color_utils.colorname_to_hex("Exact Red", "custom-test") is None
+    assert color_utils.hex_to_colorname("#00ff00", "custom-test") != "Exact Red"
+    assert color_utils.colornames_starting_with("exact", "custom-test") == []
+    with pytest.raises(ValueError):
+        custom.remove("Exact Red")
+    with pytest.raises(ValueError):
+        custom.add("Bad", "#12345")
+
+
+def test_save_and_reload(custom, tmp_path):
+    custom.remove(custom.names[0])
+    custom.add("Navy-ish", "#000081")
+    path = tmp_path / "custom.ctp"
+    palettes.save_palette("custom-test", path)
+    loaded = palettes.register_palette("custom-loaded", str(path))
+    try:
+        assert [loaded.names[i] for i in loaded.positions()] == [custom.names[i] for i in custom.positions()]
+        queries = [_random_hex() for _ in range(30)]
+        for hex_color in queries:
+            assert color_utils.hex_to_colorname(hex_color, "custom-loaded") == _scan(custom, hex_color)
+        loaded.add("Added Later", "#123456")
+        assert color_utils.hex_to_colorname("#123456", "custom-loaded") == "Added Later"
+    finally:
+        palettes.unregister_palette("custom-loaded")
+
+
+def test_register_from_csv_and_pairs(tmp_path):
+    path = tmp_path / "mine.csv"
+    path.write_text("Black,#000000\nWhite,#ffffff\nBlack,#010101\n")
+    palette = palettes.register_palette("custom-csv", str(path))
+    try:
+        assert palette.names == ["Black", "White"]
+        assert palette.hexes == ["#010101", "#ffffff"]
+        replaced = palettes.register_palette("custom-csv", [("Gray", "#808080")], replace=True)
+        assert palettes.get_palette("custom-csv") is replaced
+        assert color_utils.hex_to_colorname("#000000", "custom-csv") == "Gray"
+    finally:
+        palettes.unregister_palette("custom-csv")
+
+
+def test_registry_errors(custom):
+    with pytest.raises(ValueError):
+        palettes.register_palette("html", {"Black": "#000000"})
+    with pytest.raises(ValueError):
+        palettes.register_palette("custom-test", {"Black": "#000000"})
+    with pytest.raises(ValueError):
+        palettes.unregister_palette("not-registered")
+    with pytest.raises(ValueError):
+        palettes.unregister_palette("html")
+
+    # invalidate keeps custom palettes
+    palettes.invalidate()
+    assert palettes.get_palette("custom-test") is custom
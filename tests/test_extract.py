@@ -0,0 +1,76 @@
+import random
+from array import array
+
+import pytest
+
+from colortools.extract import extract_palette
+
+
+def _image(colors, repeat):
+    return bytearray(value for color in colors for _ in range(repeat) for value in color)
+
+
+@pytest.mark.parametrize("method", ["median-cut", "kmeans"])
+def test_single_color(method):
+    assert extract_palette(_image([(200, 10, 30)], 100), method=method, seed=1) == [((200, 10, 30), 1.0)]
+
+
+@pytest.mark.parametrize("method", ["median-cut", "kmeans"])
+def test_dominant_colors(method):
+    pixels = _image([(255, 0, 0)], 600) + _image([(0, 0, 255)], 300) + _image([(0, 255, 0)], 100)
+    palette = extract_palette(pixels, n_colors=3, method=method, seed=1)
+    assert [rgb for rgb, _ in palette] == [(255, 0, 0), (0, 0, 255), (0, 255, 0)]
+    assert [share for _, share in palette] == pytest.approx([0.6, 0.3, 0.1])
+
+
+def test_input_types_agree():
+    random.seed(4)
+    colors = [tuple(random.randrange(256) for _ in range(3)) for _ in range(5000)]
+    pixels = bytes(value for color in colors for value in color)
+    rgba = bytes(value for color in colors for value in (*color, 7))
+    expected = extract_palette(pixels, n_colors=6)
+    assert extract_palette(bytearray(pixels), n_colors=6) == expected
+    assert extract_palette(memoryview(pixels), n_colors=6) == expected
+    assert extract_palette(array("B", pixels), n_colors=6) == expected
+    assert extract_palette(colors, n_colors=6) == expected
+    assert extract_palette(rgba, n_colors=6, channels=4) == expected
+
+
+def test_periodic_pattern_is_not_aliased():
+    # every fourth pixel is red, a fixed stride of four pixels would only ever sample red
+    pixels = bytes([255, 0, 0] + [0, 0, 255] * 3) * 100000
+    shares = dict(extract_palette(pixels, 2, max_samples=100000))
+    assert shares[(255, 0, 0)] == pytest.approx(0.25, abs=0.03)
+    assert extract_palette(pixels, 2, max_samples=100000) == extract_palette(pixels, 2, max_samples=100000)
+
+
+def test_numpy_views():
+    np = pytest.importorskip("numpy")
+    rng = np.random.default_rng(5)
+    image = rng.integers(0, 256, size=(60, 80, 4), dtype=np.uint8)
+    rgb = image[:, :, :3]
+    assert not rgb.flags.c_contiguous
+    assert extract_palette(rgb, n_colors=4) == extract_palette(np.ascontiguousarray(rgb), n_colors=4)
+    assert extract_palette(image[::2], n_colors=4, channels=4) == extract_palette(
+        image[::2].tobytes(), n_colors=4, channels=4
+    )
+
+
+@pytest.mark.parametrize("pixels", [array("f", [0.5] * 30), array("H", [1] * 30), array("b", [1] * 30)])
+def test_rejects_non_byte_buffers(pixels):
+    with pytest.raises(ValueError, match="unsigned bytes"):
+        extract_palette(pixels)
+
+
+@pytest.mark.parametrize(
+    "arguments",
+    [
+        {"pixels": b""},
+        {"pixels": b"\x00" * 12, "channels": 2},
+        {"pixels": b"\x00" * 12, "method": "octree"},
+        {"pixels": b"\x00" * 12, "n_colors": 0},
+    ],
+)
+def test_invalid_arguments(arguments):
+    with pytest.raises(ValueError):
+        extract_palette(**arguments)
@@ -0,0 +1,64 @@
+import random
+
+import pytest
+
+from colortools import color_utils, fast, labcache
+
+random.seed(8)
+
+
+def _rgbs(count):
+    return [(random.randrange(256), random.randrange(256), random.randrange(256)) for _ in range(count)] + [
+        (0, 0, 0),
+        (255, 255, 255),
+        (128, 128, 128),
+    ]
+
+
+@pytest.mark.parametrize("name", ["rgb_to_hex", "rgb_to_hsl", "rgb_to_hsv", "rgb_to_cmyk", "rgb_to_xyz", "rgb_to_lab"])
+def test_from_rgb_matches_color_utils(name):
+    for rgb in _rgbs(3000):
+        assert getattr(fast, name)(*rgb) == getattr(color_utils, name)(rgb)
+
+
+def test_to_rgb_matches_color_utils():
+    for _ in range(3000):
+        values = (random.randrange(361), random.randrange(101), random.randrange(101))
+        assert fast.hsl_to_rgb(*values) == color_utils.hsl_to_rgb(values)
+        assert fast.hsv_to_rgb(*values) == color_utils.hsv_to_rgb(values)
+        cmyk = tuple(random.randrange(101) for _ in range(4))
+        assert fast.cmyk_to_rgb(*cmyk) == color_utils.cmyk_to_rgb(cmyk)
+
+
+def test_hex_to_rgb_matches_color_utils():
+    for rgb in _rgbs(3000):
+        hex_code = color_utils.rgb_to_hex(rgb)
+        expected = color_utils.hex_to_rgb(hex_code)
+        assert fast.hex_to_rgb(hex_code) == expected
+        assert fast.hex_to_rgb(hex_code[1:]) == expected
+        assert fast.hex_to_rgb(hex_code.upper() + "80") == expected
+
+
+def test_xyz_to_lab_matches_color_utils():
+    for rgb in _rgbs(3000):
+        xyz = color_utils.rgb_to_xyz(rgb)
+        assert fast.xyz_to_lab(*xyz) == color_utils.xyz_to_lab(xyz)
+
+
+def test_delta_e_matches_color_utils():
+    for first, second in zip(_rgbs(3000), _rgbs(3000)):
+        assert fast.ciede2000_rgb(*first, *second) == color_utils.ciede2000_rgb(first, second)
+        assert fast.cie76_rgb(*first, *second) == color_utils.cie76_rgb(first, second)
+        lab1 = color_utils.rgb_to_lab(first)
+        lab2 = color_utils.rgb_to_lab(second)
+        assert fast.ciede2000(*lab1, *lab2) == color_utils.ciede2000(lab1, lab2)
+        assert fast.cie76(*lab1, *lab2) == color_utils.cie76(lab1, lab2)
+
+
+def test_ignores_lab_cache():
+    labcache.enable("lru", maxsize=16)
+    try:
+        assert fast.rgb_to_lab(10, 20, 30) == labcache._convert((10, 20, 30))
+        assert labcache.stats()["misses"] == 0
+    finally:
+        labcache.disable()
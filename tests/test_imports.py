@@ -0,0 +1,42 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+import colortools
+
+MODULES = [
+    "aio",
+    "array",
+    "buffers",
+    "cli",
+    "cluster",
+    "color",
+    "color_utils",
+    "compiled",
+    "convert",
+    "extract",
+    "fast",
+    "labcache",
+    "lut",
+    "metrics",
+    "names",
+    "nearest",
+    "palettes",
+    "parallel",
+    "stream",
+]
+
+
+@pytest.mark.parametrize("module", MODULES)
+def test_import_first(module):
+    if module == "array":
+        pytest.importorskip("numpy")
+    env = dict(os.environ)
+    source = os.path.dirname(os.path.dirname(colortools.__file__))
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [source, env.get("PYTHONPATH")]))
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-c", f"import colortools.{module}"], env=env, capture_output=True, text=True, check=False
+    )
+    assert result.returncode == 0, result.stderr
@@ -0,0 +1,81 @@
+import random
+
+import pytest
+
+from colortools import color_utils, compiled, palettes
+from colortools.color import Color
+from colortools.nearest import LabGrid
+
+random.seed(20)
+
+METRICS = ("ciede2000", "cie76", "cie94")
+
+
+def _scan(labs, lab, k, max_diff, metric, *, positions=None):
+    difference = getattr(color_utils, metric)
+    indices = range(len(labs)) if positions is None else positions
+    scored = sorted((difference(lab, labs[i]), i) for i in indices)
+    return [(i, diff) for diff, i in scored if max_diff is None or diff <= max_diff][:k]
+
+
+def _labs(count):
+    rgbs = [(random.randrange(256), random.randrange(256), random.randrange(256)) for _ in range(count)]
+    return [color_utils.rgb_to_lab(rgb) for rgb in rgbs]
+
+
+@pytest.mark.parametrize("metric", METRICS)
+@pytest.mark.parametrize("standard", ["html", "x11", "meodai"])
+def test_k_nearest_matches_scan(standard, metric):
+    palette = palettes.get_palette(standard)
+    queries = _labs(2) if standard == "meodai" else _labs(15) + palette.labs[:2]
+    for lab in queries:
+        for k, max_diff in [(1, None), (5, None), (10, 8.0), (3, 0.0)]:
+            assert palette.k_nearest(lab, k, max_diff, metric) == _scan(palette.labs, lab, k, max_diff, metric)
+
+
+@pytest.mark.parametrize("metric", METRICS)
+def test_k_nearest_edge_cases(metric):
+    labs = _labs(50)
+    labs += labs[:5]
+    grid = LabGrid(labs, cell_size=5.0)
+    for lab in labs[:5] + _labs(5):
+        assert grid.k_nearest(lab, len(labs) + 3, None, metric) == _scan(labs, lab, len(labs) + 3, None, metric)
+        assert grid.k_nearest(lab, 7, 1000.0, metric) == _scan(labs, lab, 7, 1000.0, metric)
+    assert grid.k_nearest(labs[0], 0, None, metric) == []
+    assert LabGrid([]).k_nearest(labs[0], 3, None, metric) == []
+
+    positions = list(range(0, len(labs), 3))
+    subset = LabGrid(labs, positions=positions)
+    for lab in _labs(5):
+        assert subset.k_nearest(lab, 4, 20.0, metric) == _scan(labs, lab, 4, 20.0, metric, positions=positions)
+
+
+def test_compiled_palette(tmp_path):
+    source = palettes.get_palette("html")
+    path = str(tmp_path / "html.ctp")
+    compiled.write(source, path)
+    loaded = compiled.load(path)
+    for lab in _labs(20):
+        assert loaded.k_nearest(lab, 3) == source.k_nearest(lab, 3)
+
+
+def test_nearest_colornames():
+    palette = palettes.get_palette("x11")
+    lab = color_utils.rgb_to_lab((30, 144, 250))
+    expected = [(palette.names[i], palette.hexes[i], diff) for i, diff in _scan(palette.labs, lab, 4, 15.0, "cie94")]
+    assert color_utils.nearest_colornames((30, 144, 250), 4, 15.0, "cie94", "x11") == expected
+    assert color_utils.nearest_colornames("#1e90fa", 4, 15.0, "cie94", "x11") == expected
+    assert color_utils.nearest_colornames((30, 144, 250, 0), 4, 15.0, "cie94", "x11") == expected
+    assert color_utils.nearest_colornames(Color(30, 144, 250), 4, 15.0, "cie94", "x11") == expected
+
+    best = color_utils.nearest_colornames("#1e90fa", 1, naming_standard="x11")
+    assert best[0][0] == color_utils.hex_to_colorname("#1e90fa", "x11")
+
+
+def test_nearest_colornames_errors():
+    with pytest.raises(ValueError):
+        color_utils.nearest_colornames((1, 2, 3), metric="cie2001")
+    with pytest.raises(ValueError):
+        color_utils.nearest_colornames((1, 2, 300))
+    with pytest.raises(ValueError):
+        color_utils.nearest_colornames("#12345")
@@ -0,0 +1,84 @@
+import random
+
+import pytest
+
+from colortools import color_utils, labcache, palettes
+
+random.seed(7)
+RGBS = [tuple(random.randrange(256) for _ in range(3)) for _ in range(300)]
+
+
+def _exact(rgb):
+    return color_utils.xyz_to_lab(color_utils.rgb_to_xyz(rgb))
+
+
+@pytest.fixture(autouse=True)
+def _disable():
+    yield
+    labcache.disable()
+
+
+def test_disabled():
+    assert labcache.stats() == {}
+    assert [color_utils.rgb_to_lab(rgb) for rgb in RGBS] == [_exact(rgb) for rgb in RGBS]
+
+
+def test_lru():
+    labcache.enable("lru", maxsize=100)
+    for _ in range(2):
+        assert [color_utils.rgb_to_lab(rgb) for rgb in RGBS] == [_exact(rgb) for rgb in RGBS]
+    stats = labcache.stats()
+    assert stats["mode"] == "lru"
+    assert stats["hits"] + stats["misses"] == 2 * len(RGBS)
+    assert stats["size"] == 100
+    labcache.clear()
+    assert labcache.stats()["size"] == 0
+
+
+@pytest.mark.parametrize(("typecode", "tolerance"), [("f", 1e-4), ("d", 0)])
+def test_dense(typecode, tolerance):
+    labcache.enable("dense", typecode=typecode)
+    for _ in range(2):
+        for rgb in RGBS:
+            assert color_utils.rgb_to_lab(rgb) == pytest.approx(_exact(rgb), abs=tolerance)
+    # not an 8-bit color
+    assert color_utils.rgb_to_lab((0.5, 0, 0)) == _exact((0.5, 0, 0))
+
+    stats = labcache.stats()
+    distinct = len(set(RGBS))
+    assert stats["misses"] == stats["size"] == distinct
+    assert stats["hits"] == 2 * len(RGBS) - distinct
+    assert stats["bypassed"] == 1
+    labcache.clear()
+    assert labcache.stats()["size"] == 0
+
+
+@pytest.mark.parametrize("mode", ["lru", "dense"])
+@pytest.mark.parametrize("standard", ["html", "x11"])
+def test_cached_names_match_uncached(mode, standard):
+    expected = [color_utils.rgb_to_colorname(rgb, standard) for rgb in RGBS]
+    labcache.enable(mode)
+    assert [color_utils.rgb_to_colorname(rgb, standard) for rgb in RGBS] == expected
+    assert [color_utils.rgb_to_colorname(rgb, standard) for rgb in RGBS] == expected
+    assert labcache.stats()["hits"] > 0
+
+
+def test_dense_defaults_to_exact_values():
+    labcache.enable("dense")
+    for _ in range(2):
+        assert [color_utils.rgb_to_lab(rgb) for rgb in RGBS] == [_exact(rgb) for rgb in RGBS]
+
+
+def test_palette_labs_are_exact():
+    palettes.invalidate("html")
+    labcache.enable("dense")
+    try:
+        palette = palettes.get_palette("html")
+        assert palette.labs == [_exact(rgb) for rgb in palette.rgbs]
+    finally:
+        palettes.invalidate("html")
+
+
+def test_invalid_mode():
+    with pytest.raises(ValueError):
+        labcache.enable("sparse")
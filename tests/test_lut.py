@@ -0,0 +1,94 @@
+import random
+
+import pytest
+
+from colortools import color_utils, compiled, lut, palettes
+
+random.seed(21)
+
+
+def _row_colors(count):
+    return [(random.randrange(256), random.randrange(256)) for _ in range(count)] + [(0, 0), (255, 255)]
+
+
+def _partial_table(path, palette, pending):
+    # a table whose build stopped with only the pending red values missing, the other rows left empty
+    flags = bytes(0 if red in pending else 1 for red in range(256))
+    with open(path, "wb") as file:
+        file.write(lut._HEADER.pack(lut.MAGIC, len(palette.names), lut.fingerprint(palette), flags))
+        file.truncate(lut._TABLE_OFFSET + 2 * lut.TABLE_ENTRIES)
+
+
+@pytest.mark.parametrize(("standard", "red"), [("html", 137), ("x11", 255)])
+def test_row_matches_rgb_to_colorname(standard, red):
+    palette = palettes.get_palette(standard)
+    row = compiled._from_little_endian("H", lut._row(palette, red))
+    assert len(row) == 65536
+    for green, blue in _row_colors(300):
+        position = row[(green << 8) | blue]
+        name = None if position == lut.NO_NAME else palette.names[position]
+        assert name == color_utils.rgb_to_colorname((red, green, blue), standard)
+
+
+@pytest.fixture
+def custom():
+    colors = {f"color {i}": f"#{random.randrange(1 << 24):06x}" for i in range(30)}
+    palette = palettes.register_palette("lut-test", colors)
+    yield palette
+    lut.disable("lut-test")
+    palettes.unregister_palette("lut-test")
+
+
+def test_build_resumes_and_matches_search(custom, tmp_path):
+    custom.remove("color 3")
+    expected = {
+        (red, green, blue): color_utils.rgb_to_colorname((red, green, blue), "lut-test")
+        for red in (0, 200)
+        for green, blue in _row_colors(300)
+    }
+    path = str(tmp_path / "lut-test.ctl")
+    _partial_table(path, custom, {0, 200})
+    done = []
+    assert lut.build("lut-test", path, max_workers=1, report=done.append) == path
+    assert done == [255, 256]
+    assert lut.read_header(path)["done"] == 256
+
+    table = lut.enable("lut-test", path)
+    assert custom.lookup_table is table
+    rgbs = list(expected)
+    assert [color_utils.rgb_to_colorname(rgb, "lut-test") for rgb in rgbs] == list(expected.values())
+    assert color_utils.rgb_to_colorname_many(rgbs, "lut-test") == list(expected.values())
+    # rows that were flagged as done are not computed again
+    assert table.position((100, 0, 0)) == 0
+
+    custom.add("Added Later", "#102030")
+    assert custom.lookup_table is None
+    assert color_utils.rgb_to_colorname((16, 32, 48), "lut-test") == "Added Later"
+    with pytest.raises(ValueError):
+        lut.enable("lut-test", path)
+
+
+def test_invalid_tables(custom, tmp_path):
+    path = str(tmp_path / "partial.ctl")
+    _partial_table(path, custom, {5})
+    with pytest.raises(ValueError):
+        lut.enable("lut-test", path)
+
+    other = str(tmp_path / "other.ctl")
+    _partial_table(other, palettes.get_palette("html"), set())
+    with pytest.raises(ValueError):
+        lut.enable("lut-test", other)
+
+    short = tmp_path / "short.ctl"
+    short.write_bytes(lut.MAGIC + bytes(100))
+    with pytest.raises(ValueError):
+        lut.read_header(str(short))
+
+
+def test_too_many_entries(tmp_path):
+    palettes.register_palette("lut-large", [(f"gray {i}", "#808080") for i in range(lut.NO_NAME)])
+    try:
+        with pytest.raises(ValueError):
+            lut.build("lut-large", str(tmp_path / "lut-large.ctl"))
+    finally:
+        palettes.unregister_palette("lut-large")
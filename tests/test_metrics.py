@@ -0,0 +1,59 @@
+import pytest
+
+from colortools import color_utils, metrics, palettes
+from colortools.names import NameIndex
+from colortools.nearest import LabGrid
+
+
+@pytest.fixture(autouse=True)
+def _recording():
+    metrics.reset()
+    metrics.enable()
+    yield
+    metrics.disable()
+    metrics.reset()
+
+
+def test_records_calls():
+    for _ in range(3):
+        color_utils.hex_to_rgb("#102030")
+    with pytest.raises(ValueError):
+        color_utils.hex_to_rgb("nope")
+    functions = metrics.snapshot()["functions"]
+    assert functions["color_utils.hex_to_rgb"]["calls"] == 4
+    assert functions["color_utils.hex_to_rgb"]["errors"] == 1
+
+
+def test_records_palette_loads_and_index_builds():
+    palettes.invalidate("x11")
+    assert color_utils.hex_to_colorname("#123457", "x11") is not None
+    palette = palettes.get_palette("x11")
+    assert color_utils.hex_to_colorname(palette.hexes[0], "x11") == palette.names[0]
+    snapshot = metrics.snapshot()
+    assert snapshot["palette_loads"]["x11"]["entries"] == len(palettes.get_palette("x11"))
+    assert snapshot["functions"]["palettes._build_index"]["calls"] == 1
+    assert snapshot["caches"]["hex_lookup"]["hits"] == 1
+    assert snapshot["caches"]["hex_lookup"]["misses"] == 1
+
+
+def test_classes_are_not_wrapped():
+    assert palettes.LabGrid is LabGrid
+    assert palettes.NameIndex is NameIndex
+    palette = palettes.get_palette("html")
+    assert isinstance(palette.index, LabGrid)
+    assert isinstance(palette.name_index, NameIndex)
+
+    class Grid(palettes.LabGrid):
+        pass
+
+    assert isinstance(Grid(palette.labs), LabGrid)
+
+
+def test_disable_restores_functions():
+    assert metrics.is_enabled()
+    metrics.disable()
+    assert not metrics.is_enabled()
+    assert color_utils.hex_to_rgb.__module__ == "colortools.color_utils"
+    assert not hasattr(color_utils.hex_to_rgb, "__wrapped__")
+    assert not hasattr(palettes._build_index, "__wrapped__")
+    assert not hasattr(color_utils._apply_gamma_correction, "__wrapped__")
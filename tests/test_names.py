@@ -0,0 +1,83 @@
+import random
+
+import pytest
+
+from colortools import color_utils, palettes
+from colortools.names import NameIndex, _trigrams
+
+random.seed(11)
+
+NAMES = ["Red", "dark red", "DarkRed", "Rebecca Purple", "red", "Orange Red", "Blue", "Light Blue", "Redwood"]
+
+
+def _scan_prefix(names, prefix, limit):
+    matches = sorted((name.lower(), i) for i, name in names.items() if name.lower().startswith(prefix.lower()))
+    return [i for _, i in matches][:limit]
+
+
+def _scan_fuzzy(names, query, limit, min_score):
+    query_trigrams = _trigrams(query.lower())
+    scored = []
+    for i, name in names.items():
+        trigrams = _trigrams(name.lower())
+        score = 2 * len(query_trigrams & trigrams) / (len(query_trigrams) + len(trigrams))
+        if score >= min_score and query_trigrams & trigrams:
+            scored.append((-score, i))
+    return [(i, -score) for score, i in sorted(scored)[:limit]]
+
+
+def _check(index, names):
+    assert len(index) == len(names)
+    for name in [*names.values(), "RED", "no such color", ""]:
+        expected = min((i for i, other in names.items() if other.lower() == name.lower()), default=None)
+        assert index.find(name) == expected
+    for prefix in ["", "r", "Re", "red", "DARK", "x"]:
+        for limit in (None, 2):
+            assert index.prefix(prefix, limit) == _scan_prefix(names, prefix, limit)
+    for query in ["red", "darkred", "blu", "purple rebecca", "zzz"]:
+        assert index.fuzzy(query, 5, 0.2) == _scan_fuzzy(names, query, 5, 0.2)
+
+
+def test_lookups_match_scan():
+    names = dict(enumerate(NAMES))
+    _check(NameIndex(NAMES), names)
+    _check(NameIndex(names), names)
+
+
+def test_add_and_remove_match_rebuilt_index():
+    names = dict(enumerate(NAMES))
+    index = NameIndex(NAMES)
+    index.fuzzy("red")
+    index.remove(0)
+    del names[0]
+    index.add(20, "Red Violet")
+    names[20] = "Red Violet"
+    index.add(21, "red")
+    names[21] = "red"
+    index.remove(4)
+    del names[4]
+    _check(index, names)
+    _check(NameIndex(names), names)
+
+
+@pytest.mark.parametrize("standard", ["html", "html-ger", "x11", "color-meanings.com"])
+def test_colorname_to_hex_matches_scan(standard, scan_colorname_to_hex):
+    palette = palettes.get_palette(standard)
+    for name in random.sample(palette.names, min(len(palette.names), 100)):
+        for query in (name, name.upper(), name.swapcase()):
+            assert color_utils.colorname_to_hex(query, standard) == scan_colorname_to_hex(query, standard)
+
+
+def test_colornames_starting_with():
+    names = palettes.get_palette("x11").names
+    result = color_utils.colornames_starting_with("Dark", "x11", limit=None)
+    assert result == sorted((name for name in names if name.lower().startswith("dark")), key=str.lower)
+    assert color_utils.colornames_starting_with("dark", "x11") == result[:10]
+    assert color_utils.colornames_starting_with("no such prefix", "x11") == []
+
+
+def test_similar_colornames():
+    names = color_utils.similar_colornames("cornflowerblu", "html", limit=3)
+    assert names[0].lower() == "cornflowerblue"
+    assert len(names) <= 3
+    assert color_utils.similar_colornames("qqqqqq", "html") == []
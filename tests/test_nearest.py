@@ -0,0 +1,99 @@
+import random
+
+import pytest
+
+from colortools import color_utils, palettes
+from colortools.nearest import LabGrid
+
+random.seed(2)
+
+
+def _scan(labs, lab, max_diff=101):
+    best_index = None
+    best_diff = max_diff
+    for i, entry in enumerate(labs):
+        diff = color_utils.ciede2000(lab, entry)
+        if diff < best_diff:
+            best_index = i
+            best_diff = diff
+    return best_index, best_diff
+
+
+def _queries(palette, count):
+    queries = [(random.randrange(256), random.randrange(256), random.randrange(256)) for _ in range(count)]
+    # colors next to palette entries, where several entries compete
+    for rgb in random.sample(palette.rgbs, min(count, len(palette.rgbs))):
+        queries.append(tuple(min(255, max(0, channel + random.choice((-1, 0, 1)))) for channel in rgb))
+    return [color_utils.rgb_to_lab(rgb) for rgb in queries]
+
+
+@pytest.mark.parametrize("standard", palettes.STANDARDS)
+def test_nearest_matches_scan(standard):
+    palette = palettes.get_palette(standard)
+    for lab in _queries(palette, 10 if standard == "meodai" else 60):
+        assert palette.nearest(lab) == _scan(palette.labs, lab)
+
+
+@pytest.mark.parametrize("cell_size", [2.0, 7.5, 40.0, 500.0])
+def test_cell_size_does_not_change_results(cell_size):
+    palette = palettes.get_palette("x11")
+    grid = LabGrid(palette.labs, cell_size=cell_size)
+    for lab in _queries(palette, 30):
+        assert grid.nearest(lab) == _scan(palette.labs, lab)
+
+
+def test_hint_does_not_change_results():
+    palette = palettes.get_palette("html")
+    grid = LabGrid(palette.labs)
+    for lab in _queries(palette, 30):
+        expected = _scan(palette.labs, lab)
+        assert grid.nearest(lab, hint=0) == expected
+        assert grid.nearest(lab, hint=len(palette.labs) - 1) == expected
+
+
+def test_ties_prefer_lowest_index():
+    labs = [(50.0, 10.0, 10.0), (20.0, 0.0, 0.0), (50.0, 10.0, 10.0), (50.0, 10.0, 10.0)]
+    grid = LabGrid(labs)
+    assert grid.nearest((50.0, 10.0, 10.0)) == (0, 0.0)
+    assert LabGrid(labs, positions=[3, 2, 1]).nearest((50.0, 10.0, 10.0)) == (2, 0.0)
+
+
+def test_max_diff():
+    labs = [(10.0, 0.0, 0.0), (90.0, 0.0, 0.0)]
+    grid = LabGrid(labs)
+    lab = (40.0, 0.0, 0.0)
+    index, diff = grid.nearest(lab)
+    assert index == 0
+    assert diff == color_utils.ciede2000(lab, labs[0])
+    assert grid.nearest(lab, max_diff=diff) == (None, diff)
+    assert grid.nearest(lab, max_diff=1.0) == (None, 1.0)
+    assert LabGrid([]).nearest(lab) == (None, 101)
+
+
+def test_positions_and_updates():
+    palette = palettes.get_palette("html")
+    labs = list(palette.labs)
+    positions = list(range(0, len(labs), 2))
+    grid = LabGrid(labs, positions=positions)
+    assert len(grid) == len(positions)
+    subset = [labs[i] if i in positions else (1e6, 0.0, 0.0) for i in range(len(labs))]
+    queries = _queries(palette, 30)
+    for lab in queries:
+        assert grid.nearest(lab) == _scan(subset, lab)
+
+    grid.remove(0)
+    labs.append((55.0, -20.0, 30.0))
+    grid.add(len(labs) - 1)
+    subset[0] = (1e6, 0.0, 0.0)
+    subset.append(labs[-1])
+    assert len(grid) == len(positions)
+    for lab in [*queries, (55.0, -20.0, 30.0)]:
+        assert grid.nearest(lab) == _scan(subset, lab)
+
+
+def test_hex_to_colorname_matches_scan(scan_colorname):
+    palette = palettes.get_palette("x11")
+    for rgb in random.sample(palette.rgbs, 40):
+        near = tuple(min(255, max(0, channel + random.choice((-2, 2)))) for channel in rgb)
+        hex_code = color_utils.rgb_to_hex(near)
+        assert color_utils.hex_to_colorname(hex_code, "x11") == scan_colorname(hex_code, "x11")
@@ -0,0 +1,60 @@
+import random
+
+import pytest
+
+from colortools import color_utils, palettes
+
+random.seed(1)
+
+
+@pytest.mark.parametrize("standard", palettes.STANDARDS)
+def test_colorname_matches_scan(standard, scan_colorname):
+    palette = palettes.get_palette(standard)
+    count = 10 if standard == "meodai" else 100
+    queries = [f"#{random.randrange(1 << 24):06x}" for _ in range(count)] + palette.hexes[:5]
+    for hex_code in queries:
+        assert color_utils.hex_to_colorname(hex_code, standard) == scan_colorname(hex_code, standard)
+
+
+@pytest.mark.parametrize("standard", palettes.STANDARDS)
+def test_colorname_to_hex_matches_scan(standard, scan_colorname_to_hex):
+    palette = palettes.get_palette(standard)
+    for name in [*palette.names[:20], *(name.upper() for name in palette.names[:5]), "no such color"]:
+        assert color_utils.colorname_to_hex(name, standard) == scan_colorname_to_hex(name, standard)
+
+
+def test_loaded_once():
+    palettes.invalidate("html")
+    assert not palettes.is_loaded("html")
+    palette = palettes.get_palette("html")
+    assert palettes.is_loaded("html")
+    assert palettes.get_palette("html") is palette
+    color_utils.hex_to_colorname("#123456")
+    assert palettes.get_palette("html") is palette
+
+    palettes.invalidate("html")
+    assert palettes.get_palette("html") is not palette
+
+
+def test_palette_contents():
+    palette = palettes.get_palette("html")
+    assert len(palette) == len(palette.names) == len(palette.hexes) == len(palette.rgbs) == len(palette.labs)
+    for hex_code, rgb, lab in zip(palette.hexes, palette.rgbs, palette.labs):
+        assert rgb == color_utils.hex_to_rgb(hex_code)
+        assert lab == color_utils.rgb_to_lab(rgb)
+
+
+def test_preload():
+    palettes.invalidate()
+    loaded = palettes.preload("html", "x11")
+    assert [palette.name for palette in loaded] == ["html", "x11"]
+    assert palettes.is_loaded("html")
+    assert palettes.is_loaded("x11")
+    assert not palettes.is_loaded("meodai")
+
+
+def test_invalid_standard():
+    with pytest.raises(ValueError):
+        palettes.get_palette("pantone")
+    with pytest.raises(ValueError):
+        color_utils.hex_to_colorname("#ffffff", "pantone")
@@ -0,0 +1,78 @@
+import os
+import random
+
+import pytest
+
+from colortools import color_utils, palettes, parallel
+
+random.seed(15)
+
+
+def _rgbs(count):
+    return [(random.randrange(256), random.randrange(256), random.randrange(256)) for _ in range(count)]
+
+
+@pytest.fixture(scope="module")
+def executor():
+    with parallel.BatchExecutor(max_workers=2, chunk_size=16, prefetch=1) as executor:
+        yield executor
+
+
+@pytest.mark.parametrize("standard", ["html", "x11"])
+def test_colornames_match_serial(executor, standard):
+    rgbs = _rgbs(150)
+    hexes = [color_utils.rgb_to_hex(rgb) for rgb in rgbs]
+    expected = color_utils.rgb_to_colorname_many(rgbs, standard)
+    assert list(executor.rgb_to_colorname(iter(rgbs), standard)) == expected
+    assert list(executor.hex_to_colorname(hexes, standard)) == color_utils.hex_to_colorname_many(hexes, standard)
+
+
+@pytest.mark.parametrize("metric", parallel.METRICS)
+def test_delta_e_matches_serial(executor, metric):
+    first = _rgbs(100)
+    second = _rgbs(100)
+    function = getattr(color_utils, metric)
+    labs_a = [color_utils.rgb_to_lab(rgb) for rgb in first]
+    labs_b = [color_utils.rgb_to_lab(rgb) for rgb in second]
+    expected = [function(lab1, lab2) for lab1, lab2 in zip(labs_a, labs_b)]
+    assert list(executor.delta_e(labs_a, labs_b, metric)) == expected
+    assert list(executor.delta_e_rgb(first, second, metric)) == expected
+
+
+def test_custom_palette(executor):
+    palettes.register_palette("parallel-test", {"Black": "#000000", "White": "#ffffff", "Tomato": "#ff6347"})
+    try:
+        rgbs = _rgbs(40)
+        expected = color_utils.rgb_to_colorname_many(rgbs, "parallel-test")
+        assert list(executor.rgb_to_colorname(rgbs, "parallel-test")) == expected
+    finally:
+        palettes.unregister_palette("parallel-test")
+
+
+def test_errors(executor):
+    with pytest.raises(ValueError):
+        list(executor.hex_to_colorname(["#000000", "not a color"]))
+    with pytest.raises(ValueError):
+        executor.hex_to_colorname(["#000000"], "no-such-standard")
+    with pytest.raises(ValueError):
+        executor.delta_e([], [], "cie2001")
+    assert list(executor.rgb_to_colorname([])) == []
+
+
+def test_module_functions_and_cleanup():
+    rgbs = _rgbs(50)
+    assert parallel.rgb_to_colorname_many(rgbs, "html", max_workers=2, chunk_size=8) == (
+        color_utils.rgb_to_colorname_many(rgbs)
+    )
+    hexes = [color_utils.rgb_to_hex(rgb) for rgb in rgbs]
+    assert parallel.hex_to_colorname_many(hexes, max_workers=1) == color_utils.hex_to_colorname_many(hexes)
+
+    executor = parallel.BatchExecutor(max_workers=1)
+    palettes.register_palette("parallel-cleanup", {"Black": "#000000"})
+    try:
+        path = executor._palette_file("parallel-cleanup")
+        assert os.path.exists(path)
+    finally:
+        executor.shutdown()
+        palettes.unregister_palette("parallel-cleanup")
+    assert not os.path.exists(path)
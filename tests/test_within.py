@@ -0,0 +1,58 @@
+import math
+import random
+
+import pytest
+
+from colortools import color_utils
+
+random.seed(24)
+
+
+def _labs(count):
+    rgbs = [(random.randrange(256), random.randrange(256), random.randrange(256)) for _ in range(count)]
+    # achromatic colors, where the hue terms degenerate
+    rgbs += [(i, i, i) for i in range(0, 256, 15)]
+    return [color_utils.rgb_to_lab(rgb) for rgb in rgbs]
+
+
+def _near(lab):
+    return (lab[0] + random.uniform(-3, 3), lab[1] + random.uniform(-3, 3), lab[2] + random.uniform(-3, 3))
+
+
+@pytest.fixture(scope="module")
+def pairs():
+    labs = _labs(400)
+    pairs = [(random.choice(labs), random.choice(labs)) for _ in range(2000)]
+    pairs += [(lab, _near(lab)) for lab in labs]
+    return pairs + [(lab, lab) for lab in labs[:20]]
+
+
+@pytest.mark.parametrize("threshold", [0.0, 0.5, 1.0, 2.3, 5.0, 10.0, 25.0, 50.0, 100.0, math.inf])
+def test_within_matches_ciede2000(pairs, threshold):
+    for lab1, lab2 in pairs:
+        assert color_utils.ciede2000_within(lab1, lab2, threshold) is (color_utils.ciede2000(lab1, lab2) <= threshold)
+
+
+def test_within_at_the_exact_difference(pairs):
+    for lab1, lab2 in pairs:
+        diff = color_utils.ciede2000(lab1, lab2)
+        for threshold in (diff, diff * (1 - 1e-12), diff * (1 + 1e-12), diff - 1e-9, diff + 1e-9):
+            assert color_utils.ciede2000_within(lab1, lab2, threshold) is (diff <= threshold)
+
+
+def test_negative_threshold(pairs):
+    lab1, lab2 = pairs[0]
+    assert color_utils.ciede2000_within(lab1, lab1, -1e-9) is False
+    assert color_utils.ciede2000_within(lab1, lab2, -math.inf) is False
+    assert color_utils.ciede2000_within_many(lab1, [lab1, lab2], -1) == [False, False]
+
+
+@pytest.mark.parametrize("threshold", [0.0, 2.3, 10.0, 60.0])
+def test_within_many_matches_ciede2000(threshold):
+    labs = _labs(300)
+    for lab in labs[:10]:
+        others = labs + [_near(lab) for _ in range(50)]
+        expected = [color_utils.ciede2000(lab, other) <= threshold for other in others]
+        assert color_utils.ciede2000_within_many(lab, others, threshold) == expected
+        assert color_utils.ciede2000_within_many(lab, iter(others), threshold) == expected
+    assert color_utils.ciede2000_within_many(labs[0], [], threshold) == []
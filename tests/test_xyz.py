@@ -0,0 +1,46 @@
+import random
+
+import pytest
+
+from colortools import color_utils
+
+random.seed(6)
+
+
+def _gamma(value):
+    return value / 12.92 if value <= 0.04045 else ((value + 0.055) / 1.055) ** 2.4
+
+
+def _reference_rgb_to_xyz(rgb):
+    # the formula rgb_to_xyz evaluated for every call before the linearization table
+    r, g, b = (_gamma(channel / 255.0) for channel in rgb)
+    x = r * 0.4124564 + g * 0.3575761 + b * 0.1804375
+    y = r * 0.2126729 + g * 0.7151522 + b * 0.0721750
+    z = r * 0.0193339 + g * 0.1191920 + b * 0.9503041
+    return x * 100.0, y * 100.0, z * 100.0
+
+
+def _colors():
+    colors = [(random.randrange(256), random.randrange(256), random.randrange(256)) for _ in range(20000)]
+    return colors + [(i, i, i) for i in range(256)] + [(i, 0, 255 - i) for i in range(256)]
+
+
+def test_rgb_to_xyz_matches_formula():
+    for rgb in _colors():
+        assert color_utils.rgb_to_xyz(rgb) == _reference_rgb_to_xyz(rgb)
+
+
+@pytest.mark.parametrize("rgb", [(1.5, 2, 3), (-1, 3, 4), (True, 0, 0), (3.0, 4, 5), (300, 0, 0)])
+def test_rgb_to_xyz_outside_the_table(rgb):
+    assert color_utils.rgb_to_xyz(rgb) == _reference_rgb_to_xyz(rgb)
+
+
+def test_xyz_to_rgb_round_trip():
+    for rgb in _colors():
+        assert color_utils.xyz_to_rgb(color_utils.rgb_to_xyz(rgb)) == rgb
+
+
+def test_xyz_to_rgb_clips_out_of_gamut():
+    assert color_utils.xyz_to_rgb((200.0, 200.0, 200.0)) == (255, 255, 255)
+    assert color_utils.xyz_to_rgb((-5.0, -5.0, -5.0)) == (0, 0, 0)
+    assert color_utils.xyz_to_rgb((95.047, 100.0, 108.883)) == (255, 255, 255)